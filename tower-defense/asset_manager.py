@@ -1,19 +1,59 @@
 # asset_manager.py
 import pygame
 import os
+from collections import OrderedDict
 import config
+from atlas import TextureAtlas
+
+class SoundHandle:
+    """A sound resolved once by filename, with its playback limits and counters."""
+    def __init__(self, filename, sound, max_voices, min_interval_ms, priority):
+        self.filename = filename
+        self.sound = sound
+        self.max_voices = max_voices # Copies allowed to play at once
+        self.min_interval_ms = min_interval_ms # Minimum gap between two plays
+        self.priority = priority # Higher priorities may steal voices from lower ones
+        self.last_play_ms = None
+        self.plays = 0
+        self.dropped = 0
+
 
 class AssetManager:
-    def __init__(self):
+    # Flags for get_scaled_image (part of the cache key)
+    SCALE_SMOOTH = 0 # pygame.transform.smoothscale
+    SCALE_FAST = 1 # pygame.transform.scale (nearest neighbour)
+
+    def __init__(self, enable_sound=True, scaled_cache_budget=config.SCALED_IMAGE_CACHE_BYTES,
+                 atlas_manifest=config.ATLAS_MANIFEST):
         self.image_cache = {}
+        # Pre-scaled images packed by atlas.py, if it has been run (None otherwise)
+        self.atlas = TextureAtlas.load(atlas_manifest) if atlas_manifest else None
         self.sound_cache = {}
-        self._initialize_mixer() # Initialize mixer on creation
+        # (filename, size, flags) -> transformed surface, least recently used first
+        self.scaled_cache = OrderedDict()
+        self.scaled_cache_budget = scaled_cache_budget
+        self.scaled_cache_bytes = 0
+        self.scaled_stats = {"hits": 0, "misses": 0, "evictions": 0}
+        # Voice pool: filename -> SoundHandle, plus who is playing on each channel
+        self.sound_handles = {}
+        self.voices = []
+        self.voice_handles = []
+        self.voice_started = []
+        self.voice_stats = {"played": 0, "stolen": 0, "dropped_rate": 0, "dropped_cap": 0, "dropped_no_voice": 0}
+        if enable_sound:
+            self._initialize_mixer() # Initialize mixer on creation
+        else:
+            self.sound_enabled = False # Headless runs never touch the mixer
 
     def _initialize_mixer(self):
         """Initializes the pygame mixer, catching errors."""
         try:
             pygame.mixer.pre_init(44100, -16, 2, 512)
             pygame.mixer.init()
+            pygame.mixer.set_num_channels(config.SOUND_CHANNELS)
+            self.voices = [pygame.mixer.Channel(i) for i in range(config.SOUND_CHANNELS)]
+            self.voice_handles = [None] * config.SOUND_CHANNELS
+            self.voice_started = [0] * config.SOUND_CHANNELS
             self.sound_enabled = True
             print("Mixer initialized successfully by AssetManager.")
         except pygame.error as e:
@@ -71,11 +111,88 @@ class AssetManager:
             self.sound_cache[filename] = None
             return None
 
+    def get_sound_handle(self, filename, priority=config.SOUND_PRIORITY_LOW):
+        """Resolves filename to a SoundHandle once; entities keep the handle and play it.
+
+        Limits come from config.SOUND_LIMITS (falling back to the defaults);
+        priority is fixed by the first caller. Returns None when sound is
+        disabled or the file can't be loaded.
+        """
+        if not filename:
+            return None
+        if filename in self.sound_handles:
+            return self.sound_handles[filename]
+        sound = self.load_sound(filename)
+        handle = None
+        if sound:
+            max_voices, min_interval_ms = config.SOUND_LIMITS.get(
+                filename, (config.SOUND_MAX_VOICES, config.SOUND_MIN_INTERVAL_MS))
+            handle = SoundHandle(filename, sound, max_voices, min_interval_ms, priority)
+        self.sound_handles[filename] = handle
+        return handle
+
     def play_sound(self, sound_object):
-        """Plays a loaded sound object if sound is enabled."""
-        if self.sound_enabled and sound_object:
+        """Plays a SoundHandle through the voice pool (or a raw Sound directly) if sound is enabled."""
+        if not self.sound_enabled or not sound_object:
+            return
+        if isinstance(sound_object, SoundHandle):
+            self._play_pooled(sound_object)
+        else:
             sound_object.play()
 
+    def _play_pooled(self, handle):
+        """Plays handle on a pooled channel unless rate-limited, capped or out of voices."""
+        now = pygame.time.get_ticks() # Real time: audio limits are about what's audible
+        if handle.last_play_ms is not None and now - handle.last_play_ms < handle.min_interval_ms:
+            self._drop(handle, "dropped_rate")
+            return
+
+        free_voice = None
+        playing = 0
+        for i, channel in enumerate(self.voices):
+            if not channel.get_busy():
+                self.voice_handles[i] = None
+                if free_voice is None:
+                    free_voice = i
+            elif self.voice_handles[i] is handle:
+                playing += 1
+        if playing >= handle.max_voices:
+            self._drop(handle, "dropped_cap")
+            return
+
+        if free_voice is None:
+            # Steal the oldest voice among the lowest-priority sounds below ours
+            victim = None
+            for i, owner in enumerate(self.voice_handles):
+                if owner is not None and owner.priority < handle.priority:
+                    if victim is None or (owner.priority, self.voice_started[i]) < (self.voice_handles[victim].priority, self.voice_started[victim]):
+                        victim = i
+            if victim is None:
+                self._drop(handle, "dropped_no_voice")
+                return
+            self.voices[victim].stop()
+            self.voice_stats["stolen"] += 1
+            free_voice = victim
+
+        self.voices[free_voice].play(handle.sound)
+        self.voice_handles[free_voice] = handle
+        self.voice_started[free_voice] = now
+        handle.last_play_ms = now
+        handle.plays += 1
+        self.voice_stats["played"] += 1
+
+    def _drop(self, handle, reason):
+        handle.dropped += 1
+        self.voice_stats[reason] += 1
+
+    def sound_stats(self):
+        """Voice pool counters, plus plays/drops per sound file."""
+        return {
+            **self.voice_stats,
+            "per_sound": {filename: {"plays": handle.plays, "dropped": handle.dropped}
+                          for filename, handle in self.sound_handles.items() if handle},
+        }
+
     def preload_assets(self):
         """Preload common sounds and potentially images."""
         print("AssetManager preloading assets...")
@@ -86,10 +203,89 @@ class AssetManager:
         # Could add preloading for other assets (e.g., tile images) here if desired
         print("AssetManager preloading complete.")
 
-    # Optional: Add methods to get scaled images directly to simplify entity code?
-    # def get_scaled_image(self, filename, size):
-    #     img = self.load_image(filename)
-    #     if img:
-    #         # Add caching for scaled versions?
-    #         return pygame.transform.smoothscale(img, size)
-    #     return None 
\ No newline at end of file
+    # --- Scaled Image Cache ---
+    def get_scaled_image(self, filename, size, flags=SCALE_SMOOTH):
+        """Returns filename scaled to size, built once and kept in an LRU cache.
+
+        The surface is shared with every other caller asking for the same
+        (filename, size, flags), so copy it before drawing onto it.
+        Smooth-scaled images in the texture atlas are returned as subsurfaces
+        of its sheets, without loading or scaling anything.
+        Returns None if the image can't be loaded.
+        """
+        key = (filename, tuple(size), flags)
+        if self.atlas is not None and flags == self.SCALE_SMOOTH:
+            surface = self.atlas.get(filename, key[1])
+            if surface is not None:
+                return surface
+        surface = self._get_cached_scaled(key)
+        if surface is not None:
+            return surface
+        image, _ = self.load_image(filename)
+        if image is None:
+            return None
+        surface = self._scale(image, key[1], flags, filename)
+        self._store_scaled(key, surface)
+        return surface
+
+    def get_fallback_image(self, color, fallback_size, size, flags=SCALE_SMOOTH):
+        """A square of color, fallback_size wide, scaled to size (cached like get_scaled_image)."""
+        key = (("fallback", tuple(color), fallback_size), tuple(size), flags)
+        surface = self._get_cached_scaled(key)
+        if surface is not None:
+            return surface
+        square = pygame.Surface([fallback_size, fallback_size])
+        square.fill(color)
+        surface = self._scale(square, key[1], flags, f"fallback {color}")
+        self._store_scaled(key, surface)
+        return surface
+
+    def _get_cached_scaled(self, key):
+        surface = self.scaled_cache.get(key)
+        if surface is None:
+            self.scaled_stats["misses"] += 1
+            return None
+        self.scaled_cache.move_to_end(key)
+        self.scaled_stats["hits"] += 1
+        return surface
+
+    def _scale(self, image, size, flags, name):
+        scale = pygame.transform.scale if flags & self.SCALE_FAST else pygame.transform.smoothscale
+        try:
+            return scale(image, size)
+        except ValueError as e:
+            print(f"Error scaling image {name} to {size}: {e}")
+            return image # Use unscaled
+
+    def _store_scaled(self, key, surface):
+        self.scaled_cache[key] = surface
+        self.scaled_cache_bytes += surface.get_pitch() * surface.get_height()
+        # Evict least recently used entries, always keeping the newest
+        while self.scaled_cache_bytes > self.scaled_cache_budget and len(self.scaled_cache) > 1:
+            _, evicted = self.scaled_cache.popitem(last=False)
+            self.scaled_cache_bytes -= evicted.get_pitch() * evicted.get_height()
+            self.scaled_stats["evictions"] += 1
+
+    def discard_scaled_images(self, images):
+        """Drops the cached scaled surfaces of (filename, size) pairs, e.g. sizes no data file asks for any more."""
+        for filename, size in images:
+            surface = self.scaled_cache.pop((filename, tuple(size), self.SCALE_SMOOTH), None)
+            if surface is not None:
+                self.scaled_cache_bytes -= surface.get_pitch() * surface.get_height()
+
+    def scaled_cache_stats(self):
+        """Hit/miss/eviction counts plus current size of the scaled image cache."""
+        lookups = self.scaled_stats["hits"] + self.scaled_stats["misses"]
+        return {
+            **self.scaled_stats,
+            "atlas_hits": self.atlas.hits if self.atlas else 0,
+            "hit_rate": self.scaled_stats["hits"] / lookups if lookups else 0.0,
+            "entries": len(self.scaled_cache),
+            "bytes": self.scaled_cache_bytes,
+            "budget": self.scaled_cache_budget,
+        }
+
+    def warm_scaled_cache(self, data_manager):
+        """Builds the scaled images entities will ask for by resolving every data record up front."""
+        data_manager.resolve_assets(self)
+        print(f"AssetManager warmed scaled image cache: {len(self.scaled_cache)} surfaces, {self.scaled_cache_bytes // 1024} KB")
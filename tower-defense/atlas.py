@@ -0,0 +1,285 @@
+# atlas.py
+"""Texture atlas: every image the game draws, pre-scaled and packed into a few sheets.
+
+Built offline from the data files, so each image is stored at the exact
+size the game asks for (towers, enemies and projectiles from their
+scale_ratio, splash images from splash_radius, tiles and UI icons):
+
+    python atlas.py                 # writes assets/atlas/atlas_N.png + atlas.json
+    python atlas.py --verify        # lists sources whose contents changed since
+
+At startup the AssetManager reads the manifest and, on the first lookup,
+decodes the sheets once; get_scaled_image() then returns subsurfaces of
+them. Anything the atlas doesn't hold (a size changed since the build, a
+source image whose size or mtime changed since) is loaded and scaled from
+its own file as before, so a stale atlas costs speed, never correctness.
+Startup only stats the sources; the CRC-32 of each one is recorded at build
+time for --verify.
+"""
+import argparse
+import json
+import os
+import sys
+import zlib
+import pygame
+import config
+
+MANIFEST_VERSION = 3
+
+def source_stamp(filename):
+    """[size, mtime in ns] of an asset file, or None if it can't be stat'ed."""
+    try:
+        stat = os.stat(os.path.join(config.ASSET_DIR, filename))
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+def source_checksum(filename):
+    """CRC-32 of an asset file's bytes (read, not decoded), or None if it can't be read."""
+    try:
+        with open(os.path.join(config.ASSET_DIR, filename), "rb") as f:
+            return zlib.crc32(f.read())
+    except OSError:
+        return None
+
+# --- Packing ---
+def pack(sizes, sheet_size=config.ATLAS_SHEET_SIZE, padding=config.ATLAS_PADDING):
+    """Shelf-packs rectangles into as few sheet_size-wide sheets as fit.
+
+    Tallest first, left to right along shelves, a new shelf when a row is
+    full and a new sheet when a sheet is. Each rectangle gets `padding`
+    transparent pixels on every side.
+
+    Args:
+        sizes: {key: (width, height)}.
+
+    Returns:
+        tuple: ({key: (sheet index, x, y)}, [(width, height) per sheet], [keys too big for a sheet]).
+            Sheet dimensions are rounded up to powers of two.
+    """
+    placements = {}
+    sheets = []
+    too_big = []
+    x = y = shelf_height = 0
+    order = sorted(sizes, key=lambda key: (sizes[key][1], sizes[key][0]), reverse=True)
+    for key in order:
+        width, height = sizes[key][0] + padding * 2, sizes[key][1] + padding * 2
+        if width > sheet_size or height > sheet_size:
+            too_big.append(key)
+            continue
+        if not sheets or x + width > sheet_size:
+            x, y, shelf_height = 0, y + shelf_height, 0 # Next shelf
+        if not sheets or y + height > sheet_size:
+            sheets.append([0, 0]) # Next sheet
+            x = y = shelf_height = 0
+        placements[key] = (len(sheets) - 1, x + padding, y + padding)
+        x += width
+        shelf_height = max(shelf_height, height)
+        used = sheets[-1]
+        used[0], used[1] = max(used[0], x), max(used[1], y + shelf_height)
+    return placements, [(_power_of_two(w), _power_of_two(h)) for w, h in sheets], too_big
+
+def _power_of_two(value):
+    size = 1
+    while size < value:
+        size *= 2
+    return size
+
+
+# --- Building ---
+def atlas_images(data_manager):
+    """(filename, size) of every image the game requests at a fixed size."""
+    from ui import Button, UIPanel # Needs pygame; only imported to build
+    images = set()
+    for records in (data_manager.tower_records, data_manager.projectile_records, data_manager.enemy_records):
+        for record in records.values():
+            images.update(record.scaled_images())
+    icon_size = (Button.ICON_SIZE, Button.ICON_SIZE)
+    images.update((record.icon, icon_size) for record in data_manager.tower_records.values() if record.icon)
+    images.update((icon, UIPanel.STATUS_ICON_SIZE) for icon in (config.HEART_ICON, config.COIN_ICON, config.NEXT_WAVE_ICON))
+    tile = (config.TILE_SIZE, config.TILE_SIZE)
+    images.update(((config.GRASS_TILE, tile), (config.DIRT_TILE, tile)))
+    return images
+
+def build_atlas(data_manager, asset_manager, output_dir=config.ATLAS_DIR,
+                sheet_size=config.ATLAS_SHEET_SIZE, padding=config.ATLAS_PADDING):
+    """Scales every atlas image, packs the results and writes the sheets plus atlas.json.
+
+    asset_manager must not itself use an atlas, so images are scaled from
+    their source files exactly as the game would scale them. Returns the
+    manifest dict.
+    """
+    surfaces = {}
+    for filename, size in sorted(atlas_images(data_manager)):
+        surface = asset_manager.get_scaled_image(filename, size)
+        if surface is not None:
+            surfaces[(filename, size)] = surface
+    placements, sheet_sizes, too_big = pack({key: surface.get_size() for key, surface in surfaces.items()},
+                                            sheet_size, padding)
+    for filename, size in too_big:
+        print(f"Warning: {filename} at {size} doesn't fit a {sheet_size}px sheet, leaving it out")
+
+    os.makedirs(output_dir, exist_ok=True)
+    sheets = [pygame.Surface(sheet, pygame.SRCALPHA) for sheet in sheet_sizes]
+    sprites = []
+    sources = {} # A file packed at several sizes is stat'ed and read once
+    for (filename, size), (sheet_index, x, y) in sorted(placements.items()):
+        surface = surfaces[(filename, size)]
+        # RGBA max onto the cleared sheet copies pixels and alpha exactly (a normal blit would blend)
+        sheets[sheet_index].blit(surface, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        if filename not in sources:
+            sources[filename] = (source_stamp(filename), source_checksum(filename))
+        stamp, checksum = sources[filename]
+        sprites.append({
+            "file": filename,
+            "size": list(size),
+            "sheet": sheet_index,
+            "rect": [x, y, *surface.get_size()],
+            "source_stamp": stamp,
+            "source_crc32": checksum,
+        })
+    sheet_entries = []
+    for index, sheet in enumerate(sheets):
+        sheet_file = f"atlas_{index}.png"
+        pygame.image.save(sheet, os.path.join(output_dir, sheet_file))
+        sheet_entries.append({"file": sheet_file, "size": list(sheet.get_size())})
+    manifest = {"version": MANIFEST_VERSION, "padding": padding, "sheets": sheet_entries, "sprites": sprites}
+    with open(os.path.join(output_dir, "atlas.json"), "w") as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+def verify_atlas(manifest):
+    """Source files whose contents no longer match their CRC-32 from the build, sorted.
+
+    Reads every source in full, so it's for checking a build (--verify),
+    not for startup.
+    """
+    checksums = {}
+    for sprite in manifest["sprites"]:
+        filename = sprite["file"]
+        if filename not in checksums:
+            checksums[filename] = source_checksum(filename) == sprite["source_crc32"]
+    return sorted(filename for filename, matches in checksums.items() if not matches)
+
+
+# --- Lookup ---
+def read_manifest(manifest_path=config.ATLAS_MANIFEST):
+    """The parsed manifest, or None (with a warning unless it's simply missing) if it can't be used."""
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Warning: Cannot read texture atlas manifest {manifest_path}: {e}")
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        print(f"Warning: Texture atlas {manifest_path} is version {manifest.get('version')}, "
+              f"expected {MANIFEST_VERSION}; rebuild it with python atlas.py")
+        return None
+    return manifest
+
+class TextureAtlas:
+    """Subsurfaces of the atlas sheets, by (filename, size).
+
+    The manifest is read up front; the sheets are decoded on the first
+    lookup (convert_alpha needs the display mode set by then).
+    """
+    def __init__(self, manifest, directory):
+        self.directory = directory
+        self.sheet_files = [sheet["file"] for sheet in manifest["sheets"]]
+        self.sheets = None
+        self.entries = {} # (filename, size) -> (sheet index, rect)
+        self.surfaces = {} # (filename, size) -> subsurface, built on first lookup
+        self.hits = 0
+        stale = []
+        stamps = {} # A file packed at several sizes is stat'ed once
+        for sprite in manifest["sprites"]:
+            filename = sprite["file"]
+            if filename not in stamps:
+                stamps[filename] = source_stamp(filename)
+            if stamps[filename] != sprite["source_stamp"]:
+                stale.append(filename) # Edited since the build - load it from its own file
+                continue
+            self.entries[(sprite["file"], tuple(sprite["size"]))] = (sprite["sheet"], pygame.Rect(sprite["rect"]))
+        if stale:
+            print(f"Warning: Texture atlas is stale for {', '.join(sorted(set(stale)))}; rebuild it with python atlas.py")
+
+    @classmethod
+    def load(cls, manifest_path=config.ATLAS_MANIFEST):
+        """The atlas described by manifest_path, or None if there is no (usable) atlas."""
+        manifest = read_manifest(manifest_path)
+        if manifest is None:
+            return None
+        return cls(manifest, os.path.dirname(manifest_path))
+
+    def _load_sheets(self):
+        self.sheets = []
+        for sheet_file in self.sheet_files:
+            try:
+                self.sheets.append(pygame.image.load(os.path.join(self.directory, sheet_file)).convert_alpha())
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Warning: Cannot load texture atlas sheet {sheet_file}: {e}")
+                self.sheets.append(None)
+        print(f"Loaded texture atlas: {len(self.entries)} images on {len(self.sheets)} sheets")
+
+    def get(self, filename, size):
+        """The atlas subsurface of filename at size, or None if the atlas doesn't have it."""
+        key = (filename, size)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if self.sheets is None:
+            self._load_sheets()
+        sheet_index, rect = entry
+        sheet = self.sheets[sheet_index]
+        if sheet is None:
+            return None
+        surface = sheet.subsurface(rect)
+        self.surfaces[key] = surface
+        self.hits += 1
+        return surface
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the texture atlas from the images data/*.json uses.")
+    parser.add_argument("--output", default=config.ATLAS_DIR, help=f"Output directory (default {config.ATLAS_DIR})")
+    parser.add_argument("--sheet-size", type=int, default=config.ATLAS_SHEET_SIZE,
+                        help=f"Maximum sheet width and height in pixels (default {config.ATLAS_SHEET_SIZE})")
+    parser.add_argument("--padding", type=int, default=config.ATLAS_PADDING,
+                        help=f"Transparent pixels around each image (default {config.ATLAS_PADDING})")
+    parser.add_argument("--verify", action="store_true",
+                        help="Check the built atlas against the source files' checksums instead of building")
+    args = parser.parse_args()
+
+    if args.verify:
+        manifest_path = os.path.join(args.output, "atlas.json")
+        manifest = read_manifest(manifest_path)
+        if manifest is None:
+            print(f"No usable texture atlas at {manifest_path}")
+            return 1
+        changed = verify_atlas(manifest)
+        if changed:
+            print(f"Changed since the atlas was built: {', '.join(changed)}; rebuild it with python atlas.py")
+            return 1
+        print(f"All {len(manifest['sprites'])} atlas images match their source files")
+        return 0
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1)) # Needed for convert_alpha only
+    from asset_manager import AssetManager
+    from game_data_manager import DataManager
+    data_manager = DataManager()
+    asset_manager = AssetManager(enable_sound=False, atlas_manifest=None) # Scale from the source files
+    manifest = build_atlas(data_manager, asset_manager, args.output, args.sheet_size, args.padding)
+    sheets = ", ".join(f"{sheet['file']} {sheet['size'][0]}x{sheet['size'][1]}" for sheet in manifest["sheets"])
+    print(f"Packed {len(manifest['sprites'])} images into {args.output}: {sheets}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
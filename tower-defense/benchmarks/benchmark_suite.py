@@ -0,0 +1,294 @@
+# benchmarks/benchmark_suite.py
+"""Simulation and draw cost per tick under reproducible stress scenarios, with regression checks.
+
+Each scenario builds a real Game (under the SDL dummy drivers) from data/*.json:
+towers of the listed types are placed on the buildable cells nearest the
+path, and enemies of every type are spread along it with their health
+scaled up so the crowd lasts the whole run. Waves are held back, so the
+workload is the scenario alone. Everything is seeded, so two runs of the
+same code do the same work.
+
+Per scenario it reports ms per tick for PlayingState.update and for each
+phase of it (waves, enemies, towers, projectiles, effects, collisions),
+ms per draw of the full frame, and peak memory (Python heap while the
+scenario is built and warmed up, and the process's peak RSS). Every
+scenario runs in its own process so memory and caches don't carry over.
+
+The 16x12 map has about 150 buildable cells; past that, towers share cells.
+
+Run from the tower-defense directory:
+    python benchmarks/benchmark_suite.py --output baseline.json
+    python benchmarks/benchmark_suite.py --compare baseline.json          # run, then flag regressions
+    python benchmarks/benchmark_suite.py --compare baseline.json --against new.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Headless pygame - the dummy video driver still draws into a real surface
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+os.chdir(GAME_DIR) # Asset and data paths are relative to the game directory
+
+try:
+    import resource # Peak RSS; Unix only
+except ImportError:
+    resource = None
+
+SPLASH_TOWERS = ["Ice", "Cannon"]
+SCENARIOS = {
+    # name: enemies, towers, tower types (None = every type in towers.json)
+    "enemies_50": {"enemies": 50, "towers": 20, "tower_types": None},
+    "enemies_500": {"enemies": 500, "towers": 20, "tower_types": None},
+    "enemies_5000": {"enemies": 5000, "towers": 20, "tower_types": None},
+    "towers_200": {"enemies": 500, "towers": 200, "tower_types": None},
+    "splash_500": {"enemies": 500, "towers": 60, "tower_types": SPLASH_TOWERS},
+}
+PHASES = ["waves", "enemies", "towers", "projectiles", "effects", "collisions"]
+HEALTH_SCALE = 25 # Enemy health multiplier, so the crowd isn't killed off mid-run
+END_MARGIN = 600 # Pixels of path kept clear at the end, so few enemies leak mid-run
+SEED = 1234
+
+# --- Measuring one scenario (child process) ---
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def timing_stats(samples_ms):
+    return {
+        "mean": sum(samples_ms) / len(samples_ms),
+        "p50": percentile(samples_ms, 0.50),
+        "p95": percentile(samples_ms, 0.95),
+        "max": max(samples_ms),
+    }
+
+def timed(phase_ms, name, method):
+    """Wraps a bound method so each call's duration is added to phase_ms[name]."""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = method(*args, **kwargs)
+        phase_ms[name] += (time.perf_counter() - start) * 1000.0
+        return result
+    return wrapper
+
+def build_scenario(spec, seed):
+    """A Game with the scenario's towers and enemies in place and waves held back."""
+    from main import Game
+    game = Game(seed=seed)
+    rng = random.Random(seed)
+    state = game.get_current_state()
+    game_map = game.game_map
+    data_manager = game.data_manager
+
+    # Towers on the buildable cells nearest the path, cycling through the types
+    tower_types = spec["tower_types"] or list(data_manager.towers)
+    path_cells = game_map.path_coords
+    cells = [(x, y) for x in range(game_map.grid_width) for y in range(game_map.grid_height)
+             if game_map.is_buildable(x, y)]
+    cells.sort(key=lambda cell: (min(abs(cell[0] - px) + abs(cell[1] - py) for px, py in path_cells), cell))
+    for i in range(spec["towers"]):
+        grid_x, grid_y = cells[i % len(cells)]
+        if i < len(cells):
+            game_map.place_tower(grid_x, grid_y)
+        tower_key = tower_types[i % len(tower_types)]
+        TowerClass = data_manager.get_tower_class(tower_key)
+        game.towers.add(TowerClass(grid_x, grid_y, asset_manager=game.asset_manager, data_manager=data_manager))
+
+    # Enemies of every type spread along the path
+    geometry = game_map.path_geometry
+    enemy_types = list(data_manager.enemies)
+    span = max(geometry.length - END_MARGIN, geometry.length * 0.25)
+    for i in range(spec["enemies"]):
+        type_key = enemy_types[i % len(enemy_types)]
+        EnemyClass = data_manager.get_enemy_class(type_key)
+        enemy = EnemyClass(geometry, type_key=type_key, asset_manager=game.asset_manager,
+                           data_manager=data_manager, prototype=game.enemy_prototypes.get(type_key))
+        enemy.max_health = enemy.health = enemy.health * HEALTH_SCALE
+        enemy.distance = rng.uniform(0.0, span)
+        game.enemies.add(enemy)
+
+    # No waves, no game over: only the scenario's own work
+    game.wave_manager.waiting_for_next_wave = True
+    game.wave_manager.between_waves_timer = float("inf")
+    game.player_health = 10 ** 9
+    return game, state
+
+def run_scenario(name, ticks, warmup, seed):
+    """Builds and measures one scenario. Returns its results dict."""
+    spec = SCENARIOS[name]
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()): # The game logs every hit and sale
+        game, state = build_scenario(spec, seed)
+        clock = game.sim_clock
+        for _ in range(warmup):
+            state.update(clock.step())
+            state.draw(game.screen)
+    py_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop() # Tracing slows everything down - keep it out of the timings
+
+    phase_ms = dict.fromkeys(PHASES, 0.0)
+    game.wave_manager.update = timed(phase_ms, "waves", game.wave_manager.update)
+    game.enemies.update = timed(phase_ms, "enemies", game.enemies.update)
+    game.towers.update = timed(phase_ms, "towers", game.towers.update)
+    game.projectiles.update = timed(phase_ms, "projectiles", game.projectiles.update)
+    game.effects.update = timed(phase_ms, "effects", game.effects.update)
+    state._handle_collisions = timed(phase_ms, "collisions", state._handle_collisions)
+
+    update_ms, draw_ms, projectile_counts = [], [], []
+    enemies_start = len(game.enemies)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(ticks):
+            dt = clock.step()
+            start = time.perf_counter()
+            state.update(dt)
+            update_ms.append((time.perf_counter() - start) * 1000.0)
+            start = time.perf_counter()
+            state.draw(game.screen)
+            draw_ms.append((time.perf_counter() - start) * 1000.0)
+            projectile_counts.append(len(game.projectiles))
+
+    peak_rss_kb = None
+    if resource is not None:
+        peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            peak_rss_kb //= 1024 # Bytes on macOS, KB elsewhere
+    phases = {phase: total / ticks for phase, total in phase_ms.items()}
+    update = timing_stats(update_ms)
+    phases["other"] = max(0.0, update["mean"] - sum(phases.values()))
+    return {
+        "spec": spec,
+        "ticks": ticks,
+        "update_ms": update,
+        "phase_ms": phases,
+        "draw_ms": timing_stats(draw_ms),
+        "memory": {"py_peak_kb": py_peak / 1024, "peak_rss_kb": peak_rss_kb},
+        "counts": {"towers": len(game.towers), "enemies_start": enemies_start, "enemies_end": len(game.enemies),
+                   "projectiles_mean": sum(projectile_counts) / ticks},
+    }
+
+# --- Running the suite ---
+def run_in_subprocess(name, ticks, warmup, seed):
+    command = [sys.executable, os.path.abspath(__file__), "--child", name,
+               "--ticks", str(ticks), "--warmup", str(warmup), "--seed", str(seed)]
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(names, ticks, warmup, seed):
+    import numpy
+    import pygame
+    results = {
+        "meta": {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": numpy.__version__,
+            "platform": platform.platform(),
+            "ticks": ticks,
+            "warmup": warmup,
+            "seed": seed,
+        },
+        "scenarios": {},
+    }
+    for name in names:
+        result = run_in_subprocess(name, ticks, warmup, seed)
+        results["scenarios"][name] = result
+        print(f"{name:<14} update {result['update_ms']['mean']:7.3f} ms (p95 {result['update_ms']['p95']:7.3f})  "
+              f"draw {result['draw_ms']['mean']:7.3f} ms  py peak {result['memory']['py_peak_kb']:9.1f} KB  "
+              f"enemies {result['counts']['enemies_start']}->{result['counts']['enemies_end']}")
+        print("               " + "  ".join(f"{phase} {ms:.3f}" for phase, ms in result["phase_ms"].items()))
+    return results
+
+# --- Comparing against a baseline ---
+def compared_metrics(result):
+    """(metric name, value, is_time) pairs checked for regressions."""
+    metrics = [("update_ms.mean", result["update_ms"]["mean"], True),
+               ("update_ms.p95", result["update_ms"]["p95"], True),
+               ("draw_ms.mean", result["draw_ms"]["mean"], True)]
+    metrics += [(f"phase_ms.{phase}", ms, True) for phase, ms in result["phase_ms"].items()]
+    metrics.append(("memory.py_peak_kb", result["memory"]["py_peak_kb"], False))
+    return metrics
+
+def compare(baseline, current, threshold, min_delta_ms):
+    """Prints every metric's change; returns the regressions.
+
+    A time regresses when it is more than `threshold` (relative) and
+    `min_delta_ms` (absolute, to ignore noise on tiny phases) slower;
+    memory only needs the relative threshold.
+    """
+    regressions = []
+    print(f"{'scenario':<14} {'metric':<22} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in current["scenarios"].items():
+        base_result = baseline["scenarios"].get(name)
+        if base_result is None:
+            print(f"{name:<14} (not in baseline)")
+            continue
+        base_metrics = {metric: value for metric, value, _ in compared_metrics(base_result)}
+        for metric, value, is_time in compared_metrics(result):
+            base = base_metrics.get(metric)
+            if base is None:
+                continue
+            change = (value - base) / base if base else 0.0
+            regressed = change > threshold and (not is_time or value - base > min_delta_ms)
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{name:<14} {metric:<22} {base:>10.3f} {value:>10.3f} {change:>+7.1%}{flag}")
+            if regressed:
+                regressions.append((name, metric, base, value))
+    return regressions
+
+def load_results(filepath):
+    with open(filepath) as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="Scenario to run (repeatable; default all)")
+    parser.add_argument("--ticks", type=int, default=300, help="Measured ticks per scenario (default 300)")
+    parser.add_argument("--warmup", type=int, default=60, help="Unmeasured ticks first (default 60)")
+    parser.add_argument("--seed", type=int, default=SEED, help=f"Seed for map and placements (default {SEED})")
+    parser.add_argument("--output", metavar="PATH", help="Write the results as JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="Flag regressions against a results JSON")
+    parser.add_argument("--against", metavar="RESULTS", help="With --compare: check this results JSON instead of running")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown that counts as a regression (default 0.10)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="Ignore time changes smaller than this (default 0.05)")
+    parser.add_argument("--child", metavar="SCENARIO", help=argparse.SUPPRESS) # Internal: measure one scenario
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_scenario(args.child, args.ticks, args.warmup, args.seed)))
+        return 0
+
+    if args.against:
+        current = load_results(args.against)
+    else:
+        current = run_suite(args.scenario or list(SCENARIOS), args.ticks, args.warmup, args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Results written to {args.output}")
+    if args.compare:
+        regressions = compare(load_results(args.compare), current, args.threshold, args.min_delta_ms)
+        print(f"{len(regressions)} regression(s)" if regressions else "No regressions")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
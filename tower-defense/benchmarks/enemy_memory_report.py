@@ -0,0 +1,98 @@
+# benchmarks/enemy_memory_report.py
+"""Memory footprint and spawn cost of 1,000 live enemies, with and without shared prototypes.
+
+Modes:
+    per-instance, uncached  Every enemy reads its data and scales its own frames
+                            (how Enemy.__init__ worked before the scaled-image cache).
+    per-instance, cached    Every enemy builds its own EnemyRecord; surfaces come from
+                            the AssetManager scaled-image cache.
+    shared prototypes       Enemies reference one EnemyRecord per type (what the
+                            WaveManager spawns).
+
+Python heap is measured with tracemalloc; surface pixels are counted once per
+distinct Surface, since SDL pixel buffers live outside the Python heap.
+
+Run from the tower-defense directory:
+    python benchmarks/enemy_memory_report.py [--enemies N]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import contextlib
+import io
+
+# Headless pygame - no window or audio needed to build sprites
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+os.chdir(GAME_DIR) # Asset and data paths are relative to the game directory
+
+import pygame
+import config
+from asset_manager import AssetManager
+from game_data_manager import DataManager
+from map import GameMap
+from enemy_store import EnemyGroup
+from enemy_prototypes import EnemyPrototypes
+from data_records import EnemyRecord
+
+ENEMY_TYPES = ["Goblin", "Goblin", "Goblin", "Ogre", "Runner"] # Roughly a late-wave mix
+
+def surface_bytes(enemies):
+    """Pixel bytes of every distinct surface the enemies reference."""
+    surfaces = {}
+    for enemy in enemies:
+        for surface in (enemy.image, *enemy.animation_frames):
+            surfaces[id(surface)] = surface
+    return len(surfaces), sum(s.get_pitch() * s.get_height() for s in surfaces.values())
+
+def measure(mode, enemy_count, data_manager, path):
+    with contextlib.redirect_stdout(io.StringIO()): # Asset loading is chatty
+        # A zero budget keeps only the newest scaled surface, so nothing is shared
+        budget = 0 if mode == "per-instance, uncached" else config.SCALED_IMAGE_CACHE_BYTES
+        asset_manager = AssetManager(enable_sound=False, scaled_cache_budget=budget, atlas_manifest=None)
+        prototypes = EnemyPrototypes(asset_manager, data_manager) if mode == "shared prototypes" else None
+        group = EnemyGroup(capacity=enemy_count)
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        for i in range(enemy_count):
+            type_key = ENEMY_TYPES[i % len(ENEMY_TYPES)]
+            EnemyClass = data_manager.get_enemy_class(type_key)
+            if prototypes:
+                prototype = prototypes.get(type_key)
+            else:
+                prototype = EnemyRecord(type_key, data_manager.get_enemy_data(type_key)).resolve(asset_manager)
+            group.add(EnemyClass(path, type_key=type_key, asset_manager=asset_manager,
+                                 data_manager=data_manager, prototype=prototype))
+        spawn_ms = (time.perf_counter() - start) * 1000.0
+        heap = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+    surface_count, pixel_bytes = surface_bytes(group.sprites())
+    return {"mode": mode, "heap": heap, "surfaces": surface_count, "pixels": pixel_bytes, "spawn_ms": spawn_ms}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--enemies", type=int, default=1000, help="Live enemies to build (default 1000)")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    with contextlib.redirect_stdout(io.StringIO()):
+        data_manager = DataManager()
+        path = GameMap(config.GRID_WIDTH, config.GRID_HEIGHT, AssetManager(enable_sound=False)).path_geometry
+
+    print(f"Footprint of {args.enemies} live enemies ({', '.join(sorted(set(ENEMY_TYPES)))})")
+    print(f"{'mode':<24} {'py heap KB':>11} {'surfaces':>9} {'pixels KB':>10} {'total KB':>9} {'spawn ms':>9}")
+    for mode in ("per-instance, uncached", "per-instance, cached", "shared prototypes"):
+        r = measure(mode, args.enemies, data_manager, path)
+        total = r["heap"] + r["pixels"]
+        print(f"{r['mode']:<24} {r['heap'] / 1024:>11.1f} {r['surfaces']:>9} {r['pixels'] / 1024:>10.1f} "
+              f"{total / 1024:>9.1f} {r['spawn_ms']:>9.1f}")
+    pygame.quit()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/targeting_benchmark.py
+"""Per-frame tower targeting cost, linear scan vs SpatialHash, as enemy count grows.
+
+Run from the tower-defense directory:
+    python benchmarks/targeting_benchmark.py
+"""
+import os
+import sys
+import random
+import time
+import contextlib
+import io
+
+# Headless pygame - no window or audio needed to build sprites
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+os.chdir(GAME_DIR) # Asset and data paths are relative to the game directory
+
+import pygame
+import config
+from asset_manager import AssetManager
+from game_data_manager import DataManager
+from map import GameMap
+from spatial_hash import SpatialHashGroup
+
+ENEMY_COUNTS = [50, 200, 1000, 5000]
+TOWER_COUNT = 20
+FRAMES = 30
+
+def build_world(asset_manager, data_manager, enemy_count, rng):
+    game_map = GameMap(config.GRID_WIDTH, config.GRID_HEIGHT, asset_manager)
+    path = game_map.get_path()
+    plain_group = pygame.sprite.Group()
+    hashed_group = SpatialHashGroup()
+    EnemyClass = data_manager.get_enemy_class("Goblin")
+    for _ in range(enemy_count):
+        enemy = EnemyClass(path, type_key="Goblin", asset_manager=asset_manager, data_manager=data_manager)
+        enemy.x = rng.uniform(0, config.GAME_AREA_WIDTH)
+        enemy.y = rng.uniform(0, config.SCREEN_HEIGHT)
+        enemy.rect.center = (enemy.x, enemy.y)
+        plain_group.add(enemy)
+        hashed_group.add(enemy)
+
+    towers = []
+    tower_keys = ["Basic", "Cannon", "Ice", "BountyHunter"]
+    for i in range(TOWER_COUNT):
+        TowerClass = data_manager.get_tower_class(tower_keys[i % len(tower_keys)])
+        towers.append(TowerClass(rng.randrange(config.GRID_WIDTH), rng.randrange(config.GRID_HEIGHT),
+                                 asset_manager=asset_manager, data_manager=data_manager))
+    return plain_group, hashed_group, towers
+
+def time_targeting(towers, enemies, enemy_list, rng, rehash):
+    """Mean ms per frame: nudge every enemy a couple of pixels (like Enemy.move at 60 FPS),
+    then run the same keep-or-retarget check as BaseTower.update for every tower."""
+    spatial_hash = getattr(enemies, 'spatial_hash', None)
+    for tower in towers:
+        tower.target = None
+    total = 0.0
+    for _ in range(FRAMES):
+        for enemy in enemy_list:
+            x = min(max(enemy.rect.centerx + rng.randint(-2, 2), 0), config.GAME_AREA_WIDTH - 1)
+            y = min(max(enemy.rect.centery + rng.randint(-2, 2), 0), config.SCREEN_HEIGHT - 1)
+            enemy.rect.center = (x, y)
+        start = time.perf_counter()
+        if rehash and spatial_hash is not None:
+            for enemy in enemy_list:
+                spatial_hash.move(enemy, enemy.rect.centerx, enemy.rect.centery)
+        for tower in towers:
+            tower.target = None # Force a full search so we measure find_target, not the cached hit
+            if not tower.target_in_range():
+                tower.find_target(enemies)
+        total += time.perf_counter() - start
+    return total / FRAMES * 1000.0
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    rng = random.Random(1234)
+    with contextlib.redirect_stdout(io.StringIO()): # Asset loading is chatty
+        asset_manager = AssetManager()
+        data_manager = DataManager()
+
+    print(f"Targeting cost per frame ({TOWER_COUNT} towers, mean of {FRAMES} frames)")
+    print(f"{'enemies':>8} {'linear ms':>10} {'hashed ms':>10} {'speedup':>8}")
+    for enemy_count in ENEMY_COUNTS:
+        with contextlib.redirect_stdout(io.StringIO()):
+            plain_group, hashed_group, towers = build_world(asset_manager, data_manager, enemy_count, rng)
+        enemy_list = plain_group.sprites()
+        linear_ms = time_targeting(towers, plain_group, enemy_list, rng, rehash=False)
+        # Hashed timing includes keeping the buckets up to date, as Enemy.move does in game
+        hashed_ms = time_targeting(towers, hashed_group, enemy_list, rng, rehash=True)
+        print(f"{enemy_count:>8} {linear_ms:>10.3f} {hashed_ms:>10.3f} {linear_ms / hashed_ms:>7.1f}x")
+    pygame.quit()
+
+if __name__ == '__main__':
+    main()
@@ -12,6 +12,42 @@ SCREEN_HEIGHT = GRID_HEIGHT * TILE_SIZE # 12*40 = 480
 # Frame rate
 FPS = 60
 
+# Simulation timing
+SIM_TICK_RATE = 60 # Fixed simulation steps per second of game time
+GAME_SPEEDS = [1, 2, 4, None] # Selectable speed multipliers (None = as fast as possible)
+MAX_FRAME_TIME = 0.25 # Max real seconds simulated per frame, so a hitch can't snowball
+MAX_SPEED_FRAME_BUDGET = 0.75 / FPS # Real seconds per frame spent simulating at "MAX" speed
+
+# Asset caches
+SCALED_IMAGE_CACHE_BYTES = 32 * 1024 * 1024 # LRU budget for AssetManager.get_scaled_image
+WARM_SCALED_IMAGE_CACHE = True # Pre-scale every image named in data/*.json at startup
+TINT_CACHE_MAX_ENTRIES = 256 # Tinted sprite variants kept for modifier visuals
+TEXT_CACHE_MAX_ENTRIES = 256 # Rendered UI text surfaces kept by ui.text_cache
+ATLAS_DIR = "assets/atlas" # Where atlas.py writes the texture atlas sheets and manifest
+ATLAS_MANIFEST = "assets/atlas/atlas.json" # Used by the AssetManager when present (see atlas.py)
+ATLAS_SHEET_SIZE = 1024 # Maximum atlas sheet width and height in pixels
+ATLAS_PADDING = 1 # Transparent pixels around each packed image
+
+# Data hot reload
+DATA_HOT_RELOAD = False # Re-read data/*.json while the game runs when a file is saved (or main.py --hot-reload)
+DATA_RELOAD_POLL_MS = 500 # How often the data files' modification times are checked
+
+# Rendering
+DIRTY_RECT_RENDERING = False # Push only changed screen areas instead of flipping the whole frame
+DIRTY_RECT_FULL_REDRAW_RATIO = 0.5 # Fall back to a full redraw past this fraction of the screen
+
+# Frame profiler (F3 overlay, F4 export)
+PROFILER_WINDOW_FRAMES = 600 # Frames kept for the overlay stats and exports (10 s at 60 FPS)
+PROFILER_OVERLAY_REFRESH_MS = 250 # How often the overlay text is re-rendered
+PROFILER_EXPORT_DIR = "profiles" # Where F4 writes frame_profile_*.csv/json
+
+# Per-wave profiling (main.py --profile-waves)
+WAVE_PROFILE_DIR = "profiles/waves" # wave_NN.collapsed files go here
+WAVE_PROFILE_INTERVAL_MS = 1 # Stack sampling interval in CPU time (the OS may round it up to its timer tick)
+
+# Object pools
+PROJECTILE_POOL_PREWARM = 16 # Spare projectiles built per type at startup
+
 # Colors (RGB)
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -66,6 +102,18 @@ TOWER_PLACE_SOUND = "place_tower.mp3"
 ERROR_SOUND = "error.mp3"
 SELL_SOUND = "sell.wav" # Sound for selling a tower
 
+# Audio voice pool
+SOUND_CHANNELS = 16 # Mixer channels shared by every pooled sound
+SOUND_MAX_VOICES = 3 # Default cap on copies of one sound playing at once
+SOUND_MIN_INTERVAL_MS = 60 # Default minimum gap between two plays of one sound
+SOUND_PRIORITY_LOW = 1 # Shots and hits
+SOUND_PRIORITY_HIGH = 5 # UI feedback and leaks; may steal voices from low priority sounds
+SOUND_LIMITS = { # Per-file (max_voices, min_interval_ms) overrides
+    TOWER_PLACE_SOUND: (2, 0),
+    SELL_SOUND: (2, 0),
+    ERROR_SOUND: (1, 100),
+}
+
 # Player stats
 STARTING_MONEY = 700
 STARTING_HEALTH = 20
@@ -79,4 +127,5 @@ ENEMY_SPAWN_RATE = 0.75 # Seconds between spawns
 INTER_WAVE_DELAY = 5.0 # Seconds between end of wave and start of next
 
 # Debugging
-DEBUG_STARTING_WAVE = 8 # Set to higher number to start on a later wave
\ No newline at end of file
+DEBUG_STARTING_WAVE = 8 # Set to higher number to start on a later wave
+RNG_SEED = None # Master seed for the game's random streams (see rng.py); None = a new one each game
\ No newline at end of file
@@ -0,0 +1,299 @@
+# data_records.py
+"""Typed records compiled once from data/*.json by the DataManager.
+
+Every field is checked and defaulted here, and values the game would
+otherwise recompute per shot or per hit are derived up front: squared
+ranges, pixel sizes from TILE_SIZE, color tuples, splash diameters and
+the spawn timeline of each wave. resolve(asset_manager) then attaches the
+scaled surfaces and sound handles, once per record. Entities keep a
+reference to their record instead of looking up dicts by string, so a hot
+reload updates records in place (update_from) rather than replacing them.
+"""
+import config
+
+# --- Validation ---
+def _number(source, type_key, data, key, default, minimum=0):
+    value = data.get(key, default)
+    if value is None:
+        value = default
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{source}: {type_key}.{key} must be a number, got {value!r}")
+    if minimum is not None and value < minimum:
+        raise ValueError(f"{source}: {type_key}.{key} must be at least {minimum}, got {value!r}")
+    return value
+
+def _string(source, type_key, data, key, default=None):
+    value = data.get(key, default)
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f"{source}: {type_key}.{key} must be a string, got {value!r}")
+    return value
+
+def _flag(source, type_key, data, key, default=False):
+    value = data.get(key, default)
+    if not isinstance(value, bool):
+        raise ValueError(f"{source}: {type_key}.{key} must be true or false, got {value!r}")
+    return value
+
+def _color(source, type_key, data, key, default):
+    name = _string(source, type_key, data, key, default)
+    if name not in config.COLOR_MAP:
+        raise ValueError(f"{source}: {type_key}.{key} is not a known color: {name!r}")
+    return config.COLOR_MAP[name]
+
+def _frames(source, type_key, data, key):
+    """(frame filenames, speed in ms) of an animation block, or ((), default speed)."""
+    animation = data.get(key)
+    if not animation:
+        return (), 150
+    if not isinstance(animation, dict):
+        raise ValueError(f"{source}: {type_key}.{key} must be an object with a frames list, got {animation!r}")
+    frames = animation.get("frames")
+    if not isinstance(frames, list) or not all(isinstance(frame, str) for frame in frames):
+        raise ValueError(f"{source}: {type_key}.{key}.frames must be a list of filenames")
+    return tuple(frames), _number(source, type_key, animation, "speed", 150)
+
+def _tile_size(ratio):
+    side = int(config.TILE_SIZE * ratio)
+    return (side, side)
+
+def _scaled_or_fallback(asset_manager, image_path, size, fallback_color, fallback_size):
+    image = asset_manager.get_scaled_image(image_path, size) if image_path else None
+    if image is None:
+        print(f"Using fallback for {image_path}")
+        image = asset_manager.get_fallback_image(fallback_color, fallback_size, size)
+    return image
+
+def _scaled_frames(asset_manager, frame_paths, size):
+    frames = (asset_manager.get_scaled_image(path, size) for path in frame_paths)
+    return tuple(frame for frame in frames if frame)
+
+
+# --- Records ---
+class AssetRecord:
+    """Base of the records that resolve images and sounds.
+
+    ASSET_FIELDS are the data fields the resolved assets are built from;
+    RESOLVED_FIELDS hold the assets themselves.
+    """
+    __slots__ = ()
+    ASSET_FIELDS = ()
+    RESOLVED_FIELDS = ()
+
+    def asset_key(self):
+        return tuple(getattr(self, name) for name in self.ASSET_FIELDS)
+
+    def update_from(self, other):
+        """Takes other's data in place, so entities holding this record see it.
+
+        Assets are kept when other was built from the same files and sizes;
+        otherwise the record is left unresolved for the next resolve().
+        Returns True if the assets need resolving again.
+        """
+        assets_changed = self.asset_key() != other.asset_key()
+        skip = ("resolved",) + (() if assets_changed else self.RESOLVED_FIELDS)
+        for name in self.__slots__:
+            if name not in skip:
+                setattr(self, name, getattr(other, name))
+        if assets_changed:
+            self.resolved = False
+        return assets_changed
+
+    def scaled_images(self):
+        """(filename, size) of every scaled surface resolve() asks the AssetManager for."""
+        return []
+
+
+class TowerRecord(AssetRecord):
+    """One entry of towers.json."""
+    __slots__ = ("type_key", "name", "icon", "cost", "range", "range_sq", "fire_rate", "can_shoot",
+                 "projectile_type", "click_gold", "image_path", "size", "fallback_size",
+                 "fallback_color_name", "fallback_color", "click_frame_paths", "click_animation_speed",
+                 "shoot_sound_file", "image", "click_frames", "shoot_sound", "resolved")
+    ASSET_FIELDS = ("image_path", "size", "fallback_size", "fallback_color", "click_frame_paths", "shoot_sound_file")
+    RESOLVED_FIELDS = ("image", "click_frames", "shoot_sound")
+
+    def __init__(self, type_key, data):
+        source = "towers.json"
+        self.type_key = type_key
+        self.name = _string(source, type_key, data, "name", "Unknown Tower")
+        self.icon = _string(source, type_key, data, "icon", "default_icon.png")
+        self.cost = _number(source, type_key, data, "cost", 9999)
+        self.range = _number(source, type_key, data, "range", 0)
+        self.range_sq = self.range * self.range
+        self.fire_rate = _number(source, type_key, data, "fire_rate", 0) # Seconds between shots
+        self.can_shoot = self.range > 0 and self.fire_rate > 0
+        self.projectile_type = _string(source, type_key, data, "projectile_type", "Basic")
+        self.click_gold = _number(source, type_key, data, "click_gold", 0)
+        self.image_path = _string(source, type_key, data, "image", "default_tower.png")
+        self.size = _tile_size(_number(source, type_key, data, "scale_ratio", 0.9))
+        self.fallback_size = int(config.TILE_SIZE * _number(source, type_key, data, "fallback_size_ratio", 0.8))
+        self.fallback_color_name = _string(source, type_key, data, "fallback_color", "GREY")
+        self.fallback_color = _color(source, type_key, data, "fallback_color", "GREY")
+        self.click_frame_paths, self.click_animation_speed = _frames(source, type_key, data, "click_animation")
+        self.shoot_sound_file = _string(source, type_key, data, "shoot_sound")
+        self.image = None
+        self.click_frames = ()
+        self.shoot_sound = None
+        self.resolved = False
+
+    def resolve(self, asset_manager):
+        """Loads the scaled image, click frames and shoot sound (first call only). Returns self."""
+        if not self.resolved:
+            self.image = _scaled_or_fallback(asset_manager, self.image_path, self.size,
+                                             self.fallback_color, self.fallback_size)
+            self.click_frames = _scaled_frames(asset_manager, self.click_frame_paths, self.size)
+            if self.click_frame_paths and not self.click_frames:
+                print(f"Warning: Failed loading click anim frames for {self.type_key}")
+            self.shoot_sound = asset_manager.get_sound_handle(self.shoot_sound_file)
+            self.resolved = True
+        return self
+
+    def scaled_images(self):
+        return [(path, self.size) for path in (self.image_path, *self.click_frame_paths) if path]
+
+
+class ProjectileRecord(AssetRecord):
+    """One entry of projectiles.json."""
+    __slots__ = ("type_key", "speed", "damage", "homing", "splash_radius", "splash_diameter", "splash_image_path",
+                 "slow_factor", "slow_duration", "awards_bounty", "image_path", "size", "fallback_size",
+                 "fallback_color", "hit_sound_file", "image", "splash_image", "hit_sound", "resolved")
+    ASSET_FIELDS = ("image_path", "size", "fallback_size", "fallback_color", "splash_image_path", "splash_diameter",
+                    "hit_sound_file")
+    RESOLVED_FIELDS = ("image", "splash_image", "hit_sound")
+
+    def __init__(self, type_key, data):
+        source = "projectiles.json"
+        self.type_key = type_key
+        self.speed = _number(source, type_key, data, "speed", 200, minimum=1)
+        self.damage = _number(source, type_key, data, "damage", 10)
+        # Homing shots chase their target; others fly at where it was and land on a schedule
+        self.homing = _flag(source, type_key, data, "homing", True)
+        self.splash_radius = _number(source, type_key, data, "splash_radius", 0)
+        self.splash_diameter = int(self.splash_radius * 2)
+        self.splash_image_path = _string(source, type_key, data, "splash_image")
+        self.slow_factor = _number(source, type_key, data, "slow_factor", 1.0)
+        self.slow_duration = _number(source, type_key, data, "slow_duration", 0)
+        self.awards_bounty = _flag(source, type_key, data, "awards_bounty_on_kill", False)
+        self.image_path = _string(source, type_key, data, "image", "default_projectile.png")
+        self.size = _tile_size(_number(source, type_key, data, "scale_ratio", 0.3))
+        self.fallback_size = int(config.TILE_SIZE * _number(source, type_key, data, "fallback_size_ratio", 0.2))
+        self.fallback_color = _color(source, type_key, data, "fallback_color", "YELLOW")
+        self.hit_sound_file = _string(source, type_key, data, "hit_sound")
+        self.image = None
+        self.splash_image = None
+        self.hit_sound = None
+        self.resolved = False
+
+    def resolve(self, asset_manager):
+        """Loads the scaled image, splash effect image and hit sound (first call only). Returns self."""
+        if not self.resolved:
+            self.image = _scaled_or_fallback(asset_manager, self.image_path, self.size,
+                                             self.fallback_color, self.fallback_size)
+            if self.splash_image_path and self.splash_diameter > 0:
+                diameter = self.splash_diameter
+                self.splash_image = asset_manager.get_scaled_image(self.splash_image_path, (diameter, diameter))
+            self.hit_sound = asset_manager.get_sound_handle(self.hit_sound_file)
+            self.resolved = True
+        return self
+
+    def scaled_images(self):
+        images = [(self.image_path, self.size)] if self.image_path else []
+        if self.splash_image_path and self.splash_diameter > 0:
+            images.append((self.splash_image_path, (self.splash_diameter, self.splash_diameter)))
+        return images
+
+
+class EnemyRecord(AssetRecord):
+    """One entry of enemies.json: everything the enemies of one type share.
+
+    Each Enemy keeps a reference to its type's record (see EnemyPrototypes)
+    and only holds its own per-instance state.
+    """
+    __slots__ = ("type_key", "name", "speed", "health", "reward", "is_flying", "can_dig", "frame_paths",
+                 "animation_speed", "image_path", "size", "fallback_size", "fallback_color", "reach_end_sound_file",
+                 "image", "animation_frames", "reach_end_sound", "resolved")
+    ASSET_FIELDS = ("frame_paths", "image_path", "size", "fallback_size", "fallback_color", "reach_end_sound_file")
+    RESOLVED_FIELDS = ("image", "animation_frames", "reach_end_sound")
+
+    def __init__(self, type_key, data):
+        source = "enemies.json"
+        self.type_key = type_key
+        self.name = _string(source, type_key, data, "name", type_key)
+        self.speed = _number(source, type_key, data, "speed", 50)
+        self.health = _number(source, type_key, data, "health", 50) # Starting (and max) health
+        self.reward = _number(source, type_key, data, "reward", 5)
+        self.is_flying = _flag(source, type_key, data, "is_flying")
+        self.can_dig = _flag(source, type_key, data, "can_dig")
+        self.frame_paths, self.animation_speed = _frames(source, type_key, data, "animation")
+        self.image_path = _string(source, type_key, data, "image")
+        self.size = _tile_size(_number(source, type_key, data, "scale_ratio", 0.6))
+        self.fallback_size = int(config.TILE_SIZE * _number(source, type_key, data, "fallback_size_ratio", 0.6))
+        self.fallback_color = _color(source, type_key, data, "fallback_color", "RED")
+        self.reach_end_sound_file = _string(source, type_key, data, "reach_end_sound")
+        self.image = None
+        self.animation_frames = ()
+        self.reach_end_sound = None
+        self.resolved = False
+
+    def resolve(self, asset_manager):
+        """Loads the scaled frames (or static image) and leak sound (first call only). Returns self."""
+        if not self.resolved:
+            image = None
+            if self.frame_paths:
+                self.animation_frames = _scaled_frames(asset_manager, self.frame_paths, self.size)
+                image = self.animation_frames[0] if self.animation_frames else None
+            elif self.image_path:
+                image = asset_manager.get_scaled_image(self.image_path, self.size)
+            else:
+                print(f"Warning: No image or animation defined for {self.type_key}. Using fallback.")
+            if image is None:
+                # Fallback colored square, scaled to the size the real image would have had
+                image = asset_manager.get_fallback_image(self.fallback_color, self.fallback_size, self.size)
+            self.image = image
+            # A leak is important feedback - it may take a voice from shots/hits
+            self.reach_end_sound = asset_manager.get_sound_handle(self.reach_end_sound_file,
+                                                                  priority=config.SOUND_PRIORITY_HIGH)
+            self.resolved = True
+        return self
+
+    def scaled_images(self):
+        paths = self.frame_paths or ((self.image_path,) if self.image_path else ())
+        return [(path, self.size) for path in paths]
+
+
+class WaveRecord:
+    """One entry of waves.json, with its spawns flattened into a timeline."""
+    __slots__ = ("number", "reward", "groups", "timeline", "total_enemies")
+
+    def __init__(self, data, enemy_types):
+        source = "waves.json"
+        self.number = _number(source, "wave", data, "wave", 0)
+        label = f"wave {self.number}"
+        self.reward = _number(source, label, data, "reward", 0)
+        groups = []
+        for group in data.get("enemies", []):
+            enemy_type = _string(source, label, group, "type")
+            groups.append((enemy_type, int(_number(source, label, group, "count", 0)),
+                           _number(source, label, group, "spawn_delay", 1.0, minimum=None)))
+        self.groups = tuple(groups) # (enemy type, count, spawn delay)
+        self.timeline = self._compile_timeline(enemy_types)
+        self.total_enemies = len(self.timeline)
+
+    def _compile_timeline(self, enemy_types):
+        """(seconds from wave start, enemy type) per spawn, sorted.
+
+        Every enemy spawns its group's spawn_delay after the previous one,
+        carried over from group to group. Unknown enemy types are dropped here
+        with a warning instead of stalling the wave at spawn time.
+        """
+        timeline = []
+        time = 0.0
+        for enemy_type, count, spawn_delay in self.groups:
+            if enemy_type not in enemy_types:
+                print(f"Error: Class not found for enemy type '{enemy_type}' in wave {self.number}, skipping {count} spawns")
+                continue
+            for _ in range(count):
+                time += spawn_delay
+                timeline.append((time, enemy_type))
+        timeline.sort(key=lambda event: event[0]) # Already ordered unless a delay is negative
+        return tuple(timeline)
@@ -0,0 +1,99 @@
+# dirty_rects.py
+import pygame
+import config
+
+class DirtyRectRenderer:
+    """Redraws only the parts of the screen that changed since the last frame.
+
+    Each frame the caller passes its draw list in painter's order as
+    (key, rects, draw_fn, args) items. The key identifies what the item
+    looks like (sprite, position, image, ...), so an item whose key is new
+    or gone marks its rects dirty. Anything overlapping a dirty rect is
+    redrawn whole, which in turn dirties its own rects, until nothing new
+    is touched. The background is restored under every dirty rect and the
+    affected items are drawn again in order, so the screen ends up exactly
+    as a full redraw would leave it.
+
+    When the dirty area passes full_redraw_ratio of the screen, the frame is
+    simply redrawn in full.
+    """
+    def __init__(self, screen_rect, full_redraw_ratio=config.DIRTY_RECT_FULL_REDRAW_RATIO):
+        self.screen_rect = pygame.Rect(screen_rect)
+        self.full_redraw_area = self.screen_rect.width * self.screen_rect.height * full_redraw_ratio
+        self.previous = {} # key -> rects drawn for it last frame
+        self.needs_full_redraw = True
+        self.stats = {"frames": 0, "full_redraws": 0, "dirty_rects": 0, "dirty_pixels": 0}
+
+    def invalidate(self):
+        """Forces the next frame to be redrawn in full (window exposed, map rebuilt, ...)."""
+        self.needs_full_redraw = True
+
+    def render(self, screen, items, restore_background):
+        """Draws one frame.
+
+        Args:
+            screen: The display surface.
+            items: Painter-ordered list of (key, rects, draw_fn, args).
+            restore_background: Called as restore_background(screen, rect) to
+                repaint the background under rect, or with rect=None for all of it.
+
+        Returns:
+            list[pygame.Rect] | None: Rects for pygame.display.update(), or
+            None when the whole screen was redrawn (use pygame.display.flip()).
+        """
+        self.stats["frames"] += 1
+        current = {key: rects for key, rects, _, _ in items}
+        if self.needs_full_redraw:
+            return self._full_redraw(screen, items, restore_background, current)
+
+        dirty = []
+        for key, rects in self.previous.items():
+            if key not in current:
+                dirty.extend(rects)
+        for key, rects in current.items():
+            if key not in self.previous:
+                dirty.extend(rects)
+        if not dirty:
+            return []
+
+        # Everything overlapping the dirty area is redrawn whole, so its own
+        # rects join the dirty area too - repeat until nothing new is touched
+        dirty_area = sum(rect.width * rect.height for rect in dirty)
+        redraw = [False] * len(items)
+        grew = True
+        while grew:
+            grew = False
+            for i, (_, rects, _, _) in enumerate(items):
+                if redraw[i]:
+                    continue
+                for rect in rects:
+                    if rect.collidelist(dirty) != -1:
+                        redraw[i] = True
+                        dirty.extend(rects)
+                        dirty_area += sum(r.width * r.height for r in rects)
+                        grew = True
+                        break
+            if dirty_area > self.full_redraw_area:
+                return self._full_redraw(screen, items, restore_background, current)
+
+        dirty = [rect.clip(self.screen_rect) for rect in dirty]
+        dirty = [rect for rect in dirty if rect.width and rect.height]
+        for rect in dirty:
+            restore_background(screen, rect)
+        for i, (_, _, draw_fn, args) in enumerate(items):
+            if redraw[i]:
+                draw_fn(*args)
+
+        self.previous = current
+        self.stats["dirty_rects"] += len(dirty)
+        self.stats["dirty_pixels"] += sum(rect.width * rect.height for rect in dirty)
+        return dirty
+
+    def _full_redraw(self, screen, items, restore_background, current):
+        restore_background(screen, None)
+        for _, _, draw_fn, args in items:
+            draw_fn(*args)
+        self.previous = current
+        self.needs_full_redraw = False
+        self.stats["full_redraws"] += 1
+        return None
@@ -0,0 +1,40 @@
+# enemy_prototypes.py
+from data_records import EnemyRecord
+
+class EnemyPrototypes:
+    """The resolved EnemyRecord of each type_key, shared by every enemy of that type."""
+    def __init__(self, asset_manager, data_manager):
+        self.asset_manager = asset_manager
+        self.data_manager = data_manager
+        self.prototypes = {}
+        for type_key in data_manager.enemies:
+            self.get(type_key)
+
+    def get(self, type_key):
+        prototype = self.prototypes.get(type_key)
+        if prototype is None:
+            prototype = self.data_manager.get_enemy_record(type_key)
+            if prototype is None:
+                print(f"Error: No data found for enemy type '{type_key}'")
+                prototype = EnemyRecord(type_key, {}) # Defaults throughout
+            self.prototypes[type_key] = prototype.resolve(self.asset_manager)
+        return prototype
+
+
+class PrototypeField:
+    """Enemy attribute read from its type's EnemyRecord.
+
+    Setting it on an enemy stores an override for that enemy alone; the
+    record (and every other enemy of the type) is left untouched.
+    """
+    def __init__(self, source=None):
+        self.source = source
+
+    def __set_name__(self, owner, name):
+        if self.source is None:
+            self.source = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return getattr(obj.prototype, self.source)
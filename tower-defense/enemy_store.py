@@ -0,0 +1,280 @@
+# enemy_store.py
+import numpy as np
+import sim_clock
+from modifiers import status_effects
+from spatial_hash import SpatialHashGroup
+
+class StoreField:
+    """Enemy attribute backed by a column of an EnemyStore.
+
+    While the enemy is attached the value lives in the store's NumPy column,
+    so vectorized code and per-enemy code see the same number. Detached
+    enemies (not added yet, or already killed) keep it in their own __dict__.
+    """
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        store = obj._store
+        if store is None:
+            return obj.__dict__[self.name]
+        return store.columns[self.name][obj._slot].item()
+
+    def __set__(self, obj, value):
+        store = obj._store
+        if store is None:
+            obj.__dict__[self.name] = value
+        else:
+            store.columns[self.name][obj._slot] = value
+
+
+class EnemyStore:
+    """Structure-of-arrays table of enemy simulation state.
+
+    Each attached enemy owns one slot (row). Freed slots are reused, and the
+    table compacts back to zero whenever it empties (e.g. between waves).
+    """
+    # Column name -> dtype. Names match the StoreField attributes on Enemy.
+    FIELDS = {
+        "x": np.float64,
+        "y": np.float64,
+        "speed": np.float64,
+        "base_speed": np.float64,
+        "health": np.float64, # Fractional after a hot reload rescales it, so enemy.health is a float
+        "path_index": np.int64,
+        "distance": np.float64,
+        "current_frame_index": np.int64,
+        "last_frame_update": np.float64,
+        "animation_speed": np.float64,
+    }
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in self.FIELDS.items()}
+        self.active = np.zeros(capacity, dtype=bool)
+        self.path_ids = np.zeros(capacity, dtype=np.int64)
+        self.frame_counts = np.zeros(capacity, dtype=np.int64)
+        self.prev_x = np.zeros(capacity, dtype=np.float64) # Position before the last step (for interpolation)
+        self.prev_y = np.zeros(capacity, dtype=np.float64)
+        self.sprites = [None] * capacity
+        self.size = 0 # High-water mark: slots >= size have never been used
+        self.count = 0 # Number of attached enemies
+        self.free_slots = []
+        self._reset_paths()
+
+    def _reset_paths(self):
+        self.path_table = [] # Index -> PathGeometry (also keeps it alive so its id stays unique)
+        self.path_index_of = {} # id(geometry) -> index into path_table
+        self.path_lengths = np.zeros(0, dtype=np.float64) # Index -> total path length
+
+    def _path_id(self, geometry):
+        path_id = self.path_index_of.get(id(geometry))
+        if path_id is None:
+            path_id = len(self.path_table)
+            self.path_table.append(geometry)
+            self.path_index_of[id(geometry)] = path_id
+            self.path_lengths = np.append(self.path_lengths, geometry.length)
+        return path_id
+
+    def _grow(self):
+        new_capacity = self.capacity * 2
+        for name, column in self.columns.items():
+            grown = np.zeros(new_capacity, dtype=column.dtype)
+            grown[:self.capacity] = column
+            self.columns[name] = grown
+        for attr in ("active", "path_ids", "frame_counts", "prev_x", "prev_y"):
+            column = getattr(self, attr)
+            grown = np.zeros(new_capacity, dtype=column.dtype)
+            grown[:self.capacity] = column
+            setattr(self, attr, grown)
+        self.sprites.extend([None] * (new_capacity - self.capacity))
+        self.capacity = new_capacity
+
+    def attach(self, sprite, slot=None):
+        """Moves a sprite's StoreField values into a free slot, or into `slot`
+        when given (restoring a snapshot; the caller sets free_slots after)."""
+        if slot is not None:
+            while slot >= self.capacity:
+                self._grow()
+            self.size = max(self.size, slot + 1)
+        elif self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            if self.size >= self.capacity:
+                self._grow()
+            slot = self.size
+            self.size += 1
+        values = sprite.__dict__
+        for name, column in self.columns.items():
+            column[slot] = values.pop(name, 0)
+        self.prev_x[slot] = self.columns["x"][slot]
+        self.prev_y[slot] = self.columns["y"][slot]
+        self.path_ids[slot] = self._path_id(sprite.path_geometry)
+        self.frame_counts[slot] = len(sprite.animation_frames)
+        self.active[slot] = True
+        self.sprites[slot] = sprite
+        self.count += 1
+        sprite._store = self
+        sprite._slot = slot
+
+    def detach(self, sprite):
+        """Copies a sprite's values back onto it and frees its slot."""
+        slot = sprite._slot
+        values = sprite.__dict__
+        for name, column in self.columns.items():
+            values[name] = column[slot].item()
+        sprite._store = None
+        sprite._slot = None
+        self.active[slot] = False
+        self.sprites[slot] = None
+        self.count -= 1
+        if self.count == 0:
+            # Empty: compact back to nothing and forget old paths
+            self.size = 0
+            self.free_slots = []
+            self._reset_paths()
+        else:
+            self.free_slots.append(slot)
+
+    def step(self, dt, now_ms):
+        """Advances every attached enemy along its path and its animation.
+
+        Each enemy's distance along its path grows by speed * dt and its
+        position is looked up from the path's arc-length table, so turning
+        a corner costs nothing extra.
+
+        Returns:
+            tuple: (slots that reached the end of their path,
+                    slots whose animation frame changed)
+        """
+        n = self.size
+        if n == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        cols = self.columns
+        active = self.active[:n]
+        x, y = cols["x"][:n], cols["y"][:n]
+        speed = cols["speed"][:n]
+        distance = cols["distance"][:n]
+        path_index = cols["path_index"][:n]
+        path_ids = self.path_ids[:n]
+
+        # --- Movement ---
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        moving = np.flatnonzero(active)
+        # A step that passes a waypoint carries on round the corner; the old per-waypoint
+        # movement snapped to the waypoint and dropped the rest of the step
+        distance[moving] += speed[moving] * dt
+        if len(self.path_table) == 1:
+            groups = ((self.path_table[0], moving),)
+        else:
+            groups = ((self.path_table[path_id], moving[path_ids[moving] == path_id])
+                      for path_id in np.unique(path_ids[moving]))
+        for geometry, rows in groups:
+            x[rows], y[rows], path_index[rows] = geometry.positions_at(distance[rows])
+        reached_end = moving[distance[moving] >= self.path_lengths[path_ids[moving]]]
+
+        # --- Animation ---
+        frame_index = cols["current_frame_index"][:n]
+        last_update = cols["last_frame_update"][:n]
+        frame_counts = self.frame_counts[:n]
+        animating = np.flatnonzero(active & (frame_counts > 0) & (now_ms - last_update > cols["animation_speed"][:n]))
+        last_update[animating] = now_ms
+        frame_index[animating] = (frame_index[animating] + 1) % frame_counts[animating]
+
+        return reached_end, animating
+
+    def interpolated_positions(self, alpha):
+        """Positions blended between the previous and current step (alpha 0-1)."""
+        n = self.size
+        x, y = self.columns["x"][:n], self.columns["y"][:n]
+        prev_x, prev_y = self.prev_x[:n], self.prev_y[:n]
+        return prev_x + (x - prev_x) * alpha, prev_y + (y - prev_y) * alpha
+
+
+class EnemyGroup(SpatialHashGroup):
+    """Sprite group whose enemies keep their simulation state in an EnemyStore.
+
+    update() runs modifiers, then one vectorized EnemyStore.step for all
+    enemies, then pushes the new positions/frames onto the sprites, which
+    are only used for drawing and collision rects.
+    """
+    def __init__(self, *sprites, capacity=256):
+        self.store = EnemyStore(capacity)
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        self.store.attach(sprite)
+        super().add_internal(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.store.detach(sprite)
+
+    def add_at(self, sprite, slot):
+        """Adds sprite into a specific store slot (see EnemyStore.attach)."""
+        self.store.attach(sprite, slot)
+        super().add_internal(sprite)
+        sprite.add_internal(self)
+
+    def update(self, dt):
+        """Advances all enemies by dt. Returns the enemies that reached the end of the path."""
+        store = self.store
+        if store.count == 0:
+            return []
+
+        # Modifiers first - an expiring slow restores speed before this frame's move
+        status_effects.update(sim_clock.get_ticks())
+
+        reached_slots, animated_slots = store.step(dt, sim_clock.get_ticks())
+        sprites = store.sprites
+        reached = [sprites[slot] for slot in reached_slots.tolist()]
+
+        # Swap animation frames, keeping the center (rect size can differ per frame)
+        frame_index = store.columns["current_frame_index"]
+        for slot in animated_slots.tolist():
+            enemy = sprites[slot]
+            center = enemy.rect.center
+            enemy.image = enemy.animation_frames[frame_index[slot]]
+            enemy.rect = enemy.image.get_rect()
+            enemy.rect.center = center
+
+        # Sync rects (and spatial hash buckets) for everything still on the path
+        n = store.size
+        active = store.active[:n].copy()
+        active[reached_slots] = False
+        xs = store.columns["x"][:n].tolist()
+        ys = store.columns["y"][:n].tolist()
+        hash_move = self.spatial_hash.move
+        for slot in np.flatnonzero(active).tolist():
+            enemy = sprites[slot]
+            rect = enemy.rect
+            rect.center = (xs[slot], ys[slot])
+            hash_move(enemy, rect.centerx, rect.centery)
+        return reached
+
+    def interpolated_centers(self, alpha=1.0):
+        """Yields (enemy, center) with center blended alpha of the way from the
+        previous to the current position (None when alpha is 1: use the rect).
+
+        Always in group order, so overlapping enemies keep their draw order
+        whatever the alpha.
+        """
+        store = self.store
+        if alpha >= 1.0 or store.count == 0:
+            for enemy in self.sprites():
+                yield enemy, None
+            return
+        render_x, render_y = store.interpolated_positions(alpha)
+        render_x, render_y = render_x.tolist(), render_y.tolist()
+        for enemy in self.sprites():
+            slot = enemy._slot
+            yield enemy, (render_x[slot], render_y[slot])
+
+    def draw_interpolated(self, surface, alpha=1.0):
+        """Draws every enemy, blended alpha of the way from its previous to its current position."""
+        for enemy, center in self.interpolated_centers(alpha):
+            enemy.draw(surface, center)
@@ -3,8 +3,14 @@ import config
 import math
 import os
 import game_data_manager
-from modifiers import Modifier, SlowModifier # Import modifiers
+import sim_clock
+from modifiers import Modifier, SlowModifier, apply_modifier_visuals, status_effects # Import modifiers
 from game_data_manager import DataManager
+from splash import SplashBatch
+from enemy_store import StoreField
+from map import PathGeometry
+from enemy_prototypes import PrototypeField
+from data_records import EnemyRecord
 
 def load_image(filename, colorkey=None):
     """Loads an image, prepares it for play.
@@ -42,70 +48,70 @@ class BaseTower(pygame.sprite.Sprite):
         self.target = None
         self.type_key = type_key # Store the type key (e.g., "Basic", "Cannon")
 
-        # === Load Data and Set Attributes FIRST ===
-        data = self.data_manager.get_tower_data(type_key)
-        if not data:
+        # Everything shared by the type comes from its compiled record
+        record = self.data_manager.get_tower_record(type_key)
+        if not record:
             print(f"Error: No data found for tower type '{type_key}'")
             return
-
-        self.cost = data.get("cost", 9999)
-        self.range = data.get("range", 0)
-        self.fire_rate = data.get("fire_rate", 0)
-        self.projectile_type = data.get("projectile_type", "Basic")
-        self.click_gold = data.get("click_gold", 0)
-        # Load paths and ratios needed later
-        image_path = data.get("image", "default_tower.png")
-        scale_ratio = data.get("scale_ratio", 0.9)
-        fallback_size_ratio = data.get("fallback_size_ratio", 0.8)
-        fallback_color_name = data.get("fallback_color", "GREY")
-        # === End Data Loading ===
-
-        # --- Click Animation (Now scale_ratio is available) ---
-        self.click_animation_frames = []
-        self.click_animation_speed = 150
+        self.record = record.resolve(asset_manager)
         self.is_animating = False
         self.current_animation_frame_index = 0
         self.last_animation_update = 0
-
-        anim_data = data.get("click_animation")
-        if anim_data and isinstance(anim_data.get("frames"), list):
-            self.click_animation_speed = anim_data.get("speed", 150)
-            # Calculate target size using the loaded scale_ratio
-            target_size = (int(config.TILE_SIZE * scale_ratio), int(config.TILE_SIZE * scale_ratio))
-            for frame_filename in anim_data["frames"]:
-                frame_surface, _ = asset_manager.load_image(frame_filename)
-                if frame_surface:
-                    try:
-                        scaled_frame = pygame.transform.smoothscale(frame_surface.copy(), target_size)
-                        self.click_animation_frames.append(scaled_frame)
-                    except ValueError as e:
-                        print(f"Error scaling click anim frame {frame_filename}: {e}")
-            if not self.click_animation_frames:
-                 print(f"Warning: Failed loading click anim frames for {type_key}")
-
-        # --- Load Idle Image and Position --- 
-        fallback_size = int(config.TILE_SIZE * fallback_size_ratio)
-        fallback_color = config.COLOR_MAP.get(fallback_color_name, config.GREY)
-        # Pass asset_manager, paths, and fallback info to loading helper
-        self.load_and_position_image(asset_manager, image_path, fallback_size, fallback_color)
-        # Store the base image AFTER loading/scaling
-        self.idle_image = self.image
+        self.rect = None
+        self.apply_record()
 
         # Movement Cooldown
         # Initialize so tower is movable immediately after placement
-        self.last_move_time = pygame.time.get_ticks() - (config.TOWER_MOVE_COOLDOWN * 1000)
+        self.last_move_time = sim_clock.get_ticks() - (config.TOWER_MOVE_COOLDOWN * 1000)
+
+    def apply_record(self):
+        """Copies the type's stats and images from self.record - on creation, and after a data hot reload."""
+        record = self.record
+        self.cost = record.cost
+        self.range = record.range
+        self.range_sq = record.range_sq
+        self.fire_rate = record.fire_rate
+        self.can_shoot = record.can_shoot # Only shoot if range/rate are valid
+        self.projectile_type = record.projectile_type
+        self.click_gold = record.click_gold
+        self.shoot_sound = record.shoot_sound # Resolved once, played per shot
+        self.click_animation_frames = record.click_frames
+        self.click_animation_speed = record.click_animation_speed
+
+        # Scaled surfaces are shared by every tower of this type
+        self.idle_image = record.image
+        if not self.is_animating:
+            self.image = record.image
+        center = self.rect.center if self.rect else (self.x, self.y) # Keep a dragged tower where it is
+        self.rect = self.image.get_rect(center=center)
 
     def find_target(self, enemies):
+        # Only look at the buckets our range overlaps when the group is spatially indexed
+        spatial_hash = getattr(enemies, 'spatial_hash', None)
+        if spatial_hash is not None:
+            self.target = spatial_hash.nearest(self.x, self.y, self.range)
+            return
+
         self.target = None
-        min_dist = self.range # Assumes self.range is set by subclass
+        min_dist_sq = self.range_sq
         for enemy in enemies:
-            dist = math.hypot(self.x - enemy.rect.centerx, self.y - enemy.rect.centery)
-            if dist <= min_dist:
-                 min_dist = dist
+            dx = self.x - enemy.rect.centerx
+            dy = self.y - enemy.rect.centery
+            dist_sq = dx * dx + dy * dy
+            if dist_sq <= min_dist_sq:
+                 min_dist_sq = dist_sq
                  self.target = enemy
 
+    def target_in_range(self):
+        """Checks the current target is still alive and within range (squared distance)."""
+        if not self.target or not self.target.alive():
+            return False
+        dx = self.x - self.target.rect.centerx
+        dy = self.y - self.target.rect.centery
+        return dx * dx + dy * dy <= self.range_sq
+
     def update(self, dt, enemies, projectiles):
-        current_time_ms = pygame.time.get_ticks()
+        current_time_ms = sim_clock.get_ticks()
 
         # Handle Click Animation
         if self.is_animating:
@@ -121,77 +127,54 @@ class BaseTower(pygame.sprite.Sprite):
                     self.image = self.click_animation_frames[self.current_animation_frame_index]
         
         # Original update logic (Shooting)
-        if self.range > 0 and self.fire_rate > 0: # Only shoot if range/rate are valid
+        if self.can_shoot:
             current_time_sec = current_time_ms / 1000.0
             # Find target
-            if not self.target or not self.target.alive() or math.hypot(self.x - self.target.rect.centerx, self.y - self.target.rect.centery) > self.range:
+            if not self.target_in_range():
                 self.find_target(enemies)
             # Shoot
             if self.target and (current_time_sec - self.last_shot_time >= self.fire_rate):
                 self.shoot(projectiles)
                 self.last_shot_time = current_time_sec
 
-    # Abstract method - subclasses must implement
     def shoot(self, projectiles):
-        if self.target:
-            # Use self.data_manager
-            projectile_data = self.data_manager.get_projectile_data(self.projectile_type)
-            if projectile_data:
-                # Need a way to map projectile_type key to Projectile class
-                # We'll handle instantiation in specific Tower classes for now
-                # This shoot method in BaseTower might need rethinking or removal if
-                # subclasses handle it entirely.
-                 pass # Subclasses will implement actual projectile creation
-            else:
-                print(f"Error: No projectile data found for type '{self.projectile_type}'")
-
-    def load_and_position_image(self, asset_manager, image_path, fallback_size, fallback_color):
-        self.image, self.rect = asset_manager.load_image(image_path)
-        data = self.data_manager.get_tower_data(self.type_key)
-        scale_ratio = data.get("scale_ratio", 0.9) if data else 0.9
-        target_size = (int(config.TILE_SIZE * scale_ratio), int(config.TILE_SIZE * scale_ratio))
-
-        if self.image is None:
-            print(f"Using fallback for {image_path}")
-            self.image = pygame.Surface([fallback_size, fallback_size])
-            self.image.fill(fallback_color)
-            # Scale fallback image too, just in case fallback_size differs from target
-            self.image = pygame.transform.smoothscale(self.image, target_size)
-            self.rect = self.image.get_rect()
-        else:
-            # Scale the loaded image
-            loaded_image = self.image # Keep original before scaling
-            try:
-                self.image = pygame.transform.smoothscale(loaded_image.copy(), target_size)
-            except ValueError as e:
-                 print(f"Error scaling tower image {image_path}: {e}")
-                 self.image = loaded_image # Use unscaled
-            self.rect = self.image.get_rect()
+        """Fires at self.target. Implemented by each tower type."""
+        pass
 
-        self.rect.center = (self.x, self.y)
-        # Now self.image holds the final scaled image/fallback
+    def spawn_projectile(self, projectiles, type_key):
+        """Fires a type_key projectile at the current target into projectiles.
+
+        Pooled groups (ProjectileGroup) hand out a recycled instance; plain
+        groups get a freshly built one.
+        """
+        if hasattr(projectiles, 'spawn'):
+            return projectiles.spawn(type_key, self.rect.center, self.target)
+        ProjectileClass = self.data_manager.get_projectile_class(type_key)
+        projectile = ProjectileClass(self.rect.center, self.target, type_key=type_key, asset_manager=self.asset_manager, data_manager=self.data_manager)
+        projectiles.add(projectile)
+        return projectile
 
     def trigger_click_animation(self):
         """Starts the click animation if frames exist."""
         if self.click_animation_frames:
             self.is_animating = True
             self.current_animation_frame_index = 0
-            self.last_animation_update = pygame.time.get_ticks()
+            self.last_animation_update = sim_clock.get_ticks()
             self.image = self.click_animation_frames[0] # Show first frame immediately
 
     def can_move(self):
         """Checks if the move cooldown has expired."""
-        return pygame.time.get_ticks() - self.last_move_time >= config.TOWER_MOVE_COOLDOWN * 1000
+        return sim_clock.get_ticks() - self.last_move_time >= config.TOWER_MOVE_COOLDOWN * 1000
 
     def reset_move_cooldown(self):
         """Resets the move cooldown timer."""
-        self.last_move_time = pygame.time.get_ticks()
+        self.last_move_time = sim_clock.get_ticks()
 
     def draw_cooldown_bar(self, surface):
         """Draws the movement cooldown indicator below the tower."""
         if not self.can_move():
             cooldown_total = config.TOWER_MOVE_COOLDOWN * 1000
-            time_elapsed = pygame.time.get_ticks() - self.last_move_time
+            time_elapsed = sim_clock.get_ticks() - self.last_move_time
             progress_pct = min(1.0, time_elapsed / cooldown_total)
             
             bar_width = self.rect.width * 0.8 # Slightly smaller than tower width
@@ -218,85 +201,114 @@ class BaseTower(pygame.sprite.Sprite):
 
 class BaseProjectile(pygame.sprite.Sprite):
     # Common attributes/methods for all projectiles
-    def __init__(self, start_pos, target_enemy, type_key, asset_manager, data_manager):
+    def __init__(self, start_pos, target_enemy, type_key, asset_manager, data_manager, image=None):
         super().__init__()
         self.asset_manager = asset_manager
         self.data_manager = data_manager # Store data manager
         self.x, self.y = start_pos
+        self.prev_x, self.prev_y = start_pos # Position before the last step (for interpolation)
         self.target = target_enemy
         self.type_key = type_key
 
-        # Load data using passed data_manager
-        data = self.data_manager.get_projectile_data(type_key)
-        if not data:
+        record = self.data_manager.get_projectile_record(type_key)
+        if not record:
             print(f"Error: No data found for projectile type '{type_key}'")
             return
+        self.record = record.resolve(asset_manager)
+        self.apply_record()
+        self._schedule_impact()
+
+        # A prebuilt image (e.g. from the ProjectilePool) wins over the record's
+        self.image = image if image is not None else record.image
+        self.rect = self.image.get_rect(center=(self.x, self.y))
+
+    def apply_record(self):
+        """Copies the type's stats from self.record."""
+        record = self.record
+        self.speed = record.speed
+        self.damage = record.damage
+        self.splash_radius = record.splash_radius # 0 when the projectile doesn't splash
+        self.hit_sound = record.hit_sound
+        # Homing shots chase their target; others fly at where it was and land on a schedule
+        self.homing = record.homing
+
+    def refresh_from_record(self):
+        """Picks up a hot-reloaded record, in flight or waiting in the pool."""
+        self.apply_record()
+        self.image = self.record.image
+        self.rect = self.image.get_rect(center=(self.x, self.y))
+        if self.target is not None:
+            self._schedule_impact() # Re-aimed from here at the new speed
+
+    def reset(self, start_pos, target_enemy):
+        """Re-aims a pooled projectile for a new shot. Data and image are kept."""
+        self.x, self.y = start_pos
+        self.prev_x, self.prev_y = start_pos
+        self.target = target_enemy
+        self.rect.center = (self.x, self.y)
+        self._schedule_impact()
 
-        # Set attributes from data
-        self.speed = data.get("speed", 200)
-        self.damage = data.get("damage", 10)
-        # Specific attributes like splash radius handled by subclasses or checked here
-        self.splash_radius = data.get("splash_radius", 0) # Default 0 if not defined
-
-        # Load image using data
-        image_path = data.get("image", "default_projectile.png")
-        scale_ratio = data.get("scale_ratio", 0.3)
-        fallback_size_ratio = data.get("fallback_size_ratio", 0.2)
-        fallback_color_name = data.get("fallback_color", "YELLOW")
-        fallback_size = int(config.TILE_SIZE * fallback_size_ratio)
-        fallback_color = config.COLOR_MAP.get(fallback_color_name, config.GREY)
-        self.load_and_position_image(asset_manager, image_path, fallback_size, fallback_color)
+    def _schedule_impact(self):
+        """Non-homing shots aim at the target's current position and land after distance / speed."""
+        if self.homing or self.target is None:
+            return
+        self.aim_x, self.aim_y = self.target.rect.center
+        distance = math.hypot(self.aim_x - self.x, self.aim_y - self.y)
+        self.impact_ms = sim_clock.get_ticks() + distance / self.speed * 1000.0
 
     def move(self, dt):
-        if not self.target or not self.target.alive():
-            self.kill()
-            return
+        if self.homing:
+            if not self.target or not self.target.alive():
+                self.kill()
+                return
+            aim_x, aim_y = self.target.rect.center
+        else:
+            aim_x, aim_y = self.aim_x, self.aim_y
 
-        target_x, target_y = self.target.rect.center
-        dx = target_x - self.x
-        dy = target_y - self.y
+        self.prev_x, self.prev_y = self.x, self.y
+        dx = aim_x - self.x
+        dy = aim_y - self.y
         dist = math.hypot(dx, dy)
+        step = self.speed * dt # Assumes self.speed set by subclass
 
-        if dist < self.speed * dt: # Assumes self.speed set by subclass
-             pass # Let groupcollide handle the hit
-
-        move_x = (dx / dist) * self.speed * dt
-        move_y = (dy / dist) * self.speed * dt
-        self.x += move_x
-        self.y += move_y
+        if dist <= step:
+            # Arrives this step: land on the aim point rather than overshooting it
+            self.x, self.y = aim_x, aim_y
+        else:
+            self.x += (dx / dist) * step
+            self.y += (dy / dist) * step
         self.rect.center = (self.x, self.y)
 
+    def hits_target(self):
+        """True if the projectile is touching its (living) target."""
+        target = self.target
+        return target is not None and target.alive() and self.rect.colliderect(target.rect)
+
     def update(self, dt, enemies):
         self.move(dt)
 
-    def load_and_position_image(self, asset_manager, image_path, fallback_size, fallback_color):
-        self.image, self.rect = asset_manager.load_image(image_path)
-        # Use self.data_manager
-        data = self.data_manager.get_projectile_data(self.type_key)
-        scale_ratio = data.get("scale_ratio", 0.3) if data else 0.3
-        target_size = (int(config.TILE_SIZE * scale_ratio), int(config.TILE_SIZE * scale_ratio))
-
-        if self.image is None:
-            print(f"Using fallback for {image_path}")
-            self.image = pygame.Surface([fallback_size, fallback_size])
-            self.image.fill(fallback_color)
-            # Scale fallback
-            self.image = pygame.transform.smoothscale(self.image, target_size)
-            self.rect = self.image.get_rect()
-        else:
-            # Scale loaded image
-            self.image = pygame.transform.smoothscale(self.image, target_size)
-            self.rect = self.image.get_rect()
+    def draw_rect(self, alpha=1.0):
+        """The rect the projectile is drawn at, alpha of the way from its previous to its current position."""
+        rect = self.rect
+        if alpha < 1.0:
+            rect = rect.copy()
+            rect.center = (self.prev_x + (self.x - self.prev_x) * alpha,
+                           self.prev_y + (self.y - self.prev_y) * alpha)
+        return rect
 
-        self.rect.center = (self.x, self.y)
+    def draw(self, surface, alpha=1.0):
+        """Draws the projectile alpha of the way from its previous to its current position."""
+        surface.blit(self.image, self.draw_rect(alpha))
 
-    def on_hit(self, target_enemy, enemies_group, effects_group):
+    def on_hit(self, target_enemy, enemies_group, effects_group, splash_batch=None):
         """Handles the projectile hitting a target. Subclasses must implement.
 
         Args:
             target_enemy: The primary enemy hit by the projectile.
             enemies_group: The sprite group containing all active enemies.
             effects_group: The sprite group for visual effects.
+            splash_batch: Optional SplashBatch to queue area effects on. When None,
+                area effects are resolved immediately.
 
         Returns:
             tuple[bool, int]: (True if projectile should be destroyed, Gold reward amount)
@@ -315,30 +327,21 @@ class Tower(BaseTower):
     # Implement the specific shooting action
     def shoot(self, projectiles):
         if self.target:
-            # Pass data_manager when creating projectile
-            projectile = Projectile(self.rect.center, self.target, type_key="Basic", asset_manager=self.asset_manager, data_manager=self.data_manager)
-            projectiles.add(projectile)
-            # Use self.data_manager
-            tower_data = self.data_manager.get_tower_data(self.type_key)
-            if tower_data and tower_data.get("shoot_sound"):
-                 shoot_sound_file = tower_data["shoot_sound"]
-                 sound = self.asset_manager.load_sound(shoot_sound_file)
-                 self.asset_manager.play_sound(sound)
+            # Pooled when the projectile group has a pool
+            self.spawn_projectile(projectiles, "Basic")
+            self.asset_manager.play_sound(self.shoot_sound)
 
 
 # --- Projectile Class (now inherits from BaseProjectile) ---
 class Projectile(BaseProjectile):
 
-    def __init__(self, start_pos, target_enemy, type_key="Basic", asset_manager=None, data_manager=None):
-        super().__init__(start_pos, target_enemy, type_key, asset_manager, data_manager)
+    def __init__(self, start_pos, target_enemy, type_key="Basic", asset_manager=None, data_manager=None, image=None):
+        super().__init__(start_pos, target_enemy, type_key, asset_manager, data_manager, image=image)
         # Base __init__ handles loading data
 
-    def on_hit(self, target_enemy, enemies_group, effects_group):
+    def on_hit(self, target_enemy, enemies_group, effects_group, splash_batch=None):
         # Play hit sound
-        proj_data = self.data_manager.get_projectile_data(self.type_key)
-        if proj_data and proj_data.get("hit_sound"):
-             hit_sound = self.asset_manager.load_sound(proj_data["hit_sound"])
-             self.asset_manager.play_sound(hit_sound)
+        self.asset_manager.play_sound(self.hit_sound)
 
         # Apply direct damage
         if target_enemy.alive(): # Check if target still alive before damaging
@@ -350,227 +353,151 @@ class Projectile(BaseProjectile):
 
 # --- Enemy Class ---
 class Enemy(pygame.sprite.Sprite):
-
-    def __init__(self, path, type_key="Goblin", asset_manager=None, data_manager=None): # Default to Goblin now
+    """Drawable view of one enemy.
+
+    Simulation state lives in the EnemyStore of the EnemyGroup the enemy
+    belongs to, which also moves and animates all enemies in one step.
+    """
+    # Backed by EnemyStore columns while the enemy is in an EnemyGroup
+    x = StoreField()
+    y = StoreField()
+    speed = StoreField()
+    base_speed = StoreField()
+    health = StoreField()
+    path_index = StoreField() # Path segment the enemy is on
+    distance = StoreField() # Pixels travelled along path_geometry
+    current_frame_index = StoreField()
+    last_frame_update = StoreField()
+    animation_speed = StoreField()
+    _store = None
+    _slot = None
+
+    # Shared by every enemy of a type, read from its EnemyRecord
+    max_health = PrototypeField("health")
+    reward = PrototypeField()
+    is_flying = PrototypeField()
+    can_dig = PrototypeField()
+    reach_end_sound = PrototypeField()
+    animation_frames = PrototypeField()
+
+    def __init__(self, path, type_key="Goblin", asset_manager=None, data_manager=None, prototype=None): # Default to Goblin now
         super().__init__()
         self.asset_manager = asset_manager
         self.data_manager = data_manager # Store data manager
-        self.path = path
+        # Walked by distance travelled; a plain waypoint list is parametrized here
+        self.path_geometry = path if isinstance(path, PathGeometry) else PathGeometry(path)
+        self.path = self.path_geometry.points
         self.path_index = 0
+        self.distance = 0.0
         self.x, self.y = self.path[0]
         self.type_key = type_key
 
-        # Load data for this enemy type using passed data_manager
-        data = self.data_manager.get_enemy_data(type_key) if self.data_manager else None
-        if not data:
-            print(f"Error: No data found for enemy type '{type_key}'")
-            # Set defaults or raise error
-            self.speed = 50
-            self.health = 50
-            self.max_health = 50
-            self.reward = 5
-            image_path = None # Indicate no static image
-            animation_data = None
-            scale_ratio = 0.6
-            fallback_color_name = "RED"
-            self.is_flying = False # Load flying flag
-            self.can_dig = False # Load can_dig flag
-        else:
-            # Set attributes from data
-            self.speed = data.get("speed", 50)
-            self.base_speed = self.speed
-            self.health = data.get("health", 50)
-            self.max_health = self.health
-            self.reward = data.get("reward", 5)
-            # Load ratios and paths needed for image/anim loading AND fallback
-            image_path = data.get("image")
-            animation_data = data.get("animation")
-            scale_ratio = data.get("scale_ratio", 0.6)
-            fallback_size_ratio = data.get("fallback_size_ratio", 0.6)
-            fallback_color_name = data.get("fallback_color", "RED")
-            self.is_flying = data.get("is_flying", False)
-            self.can_dig = data.get("can_dig", False)
+        # Stats, frames and sounds come from the type's record (see EnemyPrototypes)
+        if prototype is None:
+            # Spawners pass the shared, resolved record; look it up otherwise
+            prototype = self.data_manager.get_enemy_record(type_key) if self.data_manager else None
+            if prototype is None:
+                print(f"Error: No data found for enemy type '{type_key}'")
+                prototype = EnemyRecord(type_key, {}) # Defaults throughout
+            prototype.resolve(asset_manager)
+        self.prototype = prototype
+        self.speed = prototype.speed
+        self.base_speed = prototype.speed
+        self.health = prototype.health
 
         # List to hold active modifiers
         self.modifiers = []
 
-        # --- Animation or Static Image Loading ---
-        self.animation_frames = []
+        # Animation state; the frames themselves are shared
         self.current_frame_index = 0
-        self.last_frame_update = pygame.time.get_ticks()
-        self.animation_speed = 150 # Default, will be overridden by data
-
-        if animation_data and isinstance(animation_data.get("frames"), list):
-            self.animation_speed = animation_data.get("speed", 150)
-            target_size = (int(config.TILE_SIZE * scale_ratio), int(config.TILE_SIZE * scale_ratio))
-            for frame_filename in animation_data["frames"]:
-                # Unpack the tuple here
-                image_surface, _ = self.asset_manager.load_image(frame_filename)
-                if image_surface: # Check the surface, not the tuple
-                    # Scale the actual image surface
-                    scaled_frame = pygame.transform.smoothscale(image_surface, target_size)
-                    self.animation_frames.append(scaled_frame)
-            if not self.animation_frames:
-                 self._create_fallback_image(self.asset_manager, fallback_color_name, fallback_size_ratio, scale_ratio)
-            else:
-                 self.image = self.animation_frames[0]
-                 self.rect = self.image.get_rect()
-
-        elif image_path:
-            # Load static image
-            target_size = (int(config.TILE_SIZE * scale_ratio), int(config.TILE_SIZE * scale_ratio))
-            # Unpack the tuple
-            image_surface, _ = self.asset_manager.load_image(image_path)
-            # Check the surface
-            if image_surface is None:
-                 self._create_fallback_image(self.asset_manager, fallback_color_name, fallback_size_ratio, scale_ratio)
-            else:
-                 # Assign the surface, then scale
-                 self.image = image_surface
-                 self.image = pygame.transform.smoothscale(self.image.copy(), target_size) # Scale the surface
-                 self.rect = self.image.get_rect() # Get new rect after scaling
-
-        else:
-             # No animation and no static image -> Use fallback
-             print(f"Warning: No image or animation defined for {type_key}. Using fallback.")
-             # Need to pass fallback_size_ratio as well
-             self._create_fallback_image(self.asset_manager, fallback_color_name, fallback_size_ratio, scale_ratio)
-
+        self.last_frame_update = sim_clock.get_ticks()
+        self.animation_speed = prototype.animation_speed
+        self.image = prototype.image
+        self.rect = self.image.get_rect()
         self.rect.center = (self.x, self.y)
 
-        # Path target logic remains same
-        if len(self.path) > 1:
-             self.target_x, self.target_y = self.path[1]
-        else:
+        if len(self.path) < 2:
              print(f"Warning: Enemy path for {self.type_key} too short.")
-             self.target_x, self.target_y = self.x, self.y
-
-    def _create_fallback_image(self, asset_manager, fallback_color_name, fallback_size_ratio, scale_ratio):
-        """Helper to create and scale the fallback colored square."""
-        # Calculate target size using the scale_ratio intended for the final image
-        target_size = (int(config.TILE_SIZE * scale_ratio), int(config.TILE_SIZE * scale_ratio))
-
-        # Create initial surface using fallback ratio
-        actual_fallback_size = int(config.TILE_SIZE * fallback_size_ratio)
-        fallback_color = config.COLOR_MAP.get(fallback_color_name, config.GREY)
-        initial_surface = pygame.Surface([actual_fallback_size, actual_fallback_size])
-        initial_surface.fill(fallback_color)
-
-        # Scale fallback image to the target size
-        self.image = pygame.transform.smoothscale(initial_surface, target_size)
-        self.rect = self.image.get_rect()
-
-    def _animate(self):
-        """Handles cycling through animation frames."""
-        if not self.animation_frames: # Don't animate if no frames (static image or fallback)
-            return
-
-        now = pygame.time.get_ticks()
-        if now - self.last_frame_update > self.animation_speed:
-            self.last_frame_update = now
-            self.current_frame_index = (self.current_frame_index + 1) % len(self.animation_frames)
-            # Important: Preserve center when changing image
-            center = self.rect.center
-            self.image = self.animation_frames[self.current_frame_index]
-            self.rect = self.image.get_rect()
-            self.rect.center = center
-
-    def move(self, dt):
-        dx = self.target_x - self.x
-        dy = self.target_y - self.y
-        dist = math.hypot(dx, dy)
 
-        if dist < self.speed * dt: # Reached or passed the target waypoint
-            self.x, self.y = self.target_x, self.target_y # Snap to waypoint
-            self.path_index += 1
-            if self.path_index >= len(self.path):
-                return True # Reached the end
-            self.target_x, self.target_y = self.path[self.path_index]
+    def apply_record(self, previous):
+        """Picks up a hot-reloaded record (changed in place from `previous`).
 
-        else: # Move towards the target
-            move_x = (dx / dist) * self.speed * dt
-            move_y = (dy / dist) * self.speed * dt
-            self.x += move_x
-            self.y += move_y
-
-        self.rect.center = (self.x, self.y)
-        return False # Still moving
+        The enemy keeps its place on the path, the fraction of health it has
+        left and any slow on it.
+        """
+        record = self.prototype
+        if previous.health:
+            self.health = self.health * record.health / previous.health
+        slowed = self.speed / self.base_speed if self.base_speed else 1.0
+        self.base_speed = record.speed
+        self.speed = record.speed * slowed
+        self.animation_speed = record.animation_speed
+        frames = self.animation_frames
+        if self._store is not None:
+            self._store.frame_counts[self._slot] = len(frames)
+        if self.current_frame_index >= len(frames):
+            self.current_frame_index = 0
+        self.image = frames[int(self.current_frame_index)] if frames else record.image
+        self.rect = self.image.get_rect(center=self.rect.center)
 
     def add_modifier(self, new_modifier):
         """Adds a modifier to the enemy, replacing existing of same type."""
-        # Simple replacement logic for now
-        # Check if a modifier of the same type already exists
-        existing_modifier = None
-        for i, mod in enumerate(self.modifiers):
-            if isinstance(mod, type(new_modifier)):
-                # Remove existing modifier effect before replacing
-                mod.remove() # This will also remove it from the list via super().remove()
-                # We might need to break here if remove() modified the list during iteration
-                # Let's re-find it after potential removal
-                found_after_remove = False
-                for j, check_mod in enumerate(self.modifiers):
-                     if isinstance(check_mod, type(new_modifier)):
-                          # Should not happen if remove worked correctly
-                          print("Warning: Old modifier not removed correctly?")
-                          del self.modifiers[j]
-                          found_after_remove = True
-                          break
-                break # Exit outer loop once type is found and handled
-
-        # Add and apply the new modifier
-        self.modifiers.append(new_modifier)
-        new_modifier.apply(self) # Apply effect immediately
+        status_effects.attach(self, new_modifier)
 
     def remove_modifier(self, modifier_to_remove):
         """Removes a specific modifier instance."""
-        if modifier_to_remove in self.modifiers:
-             self.modifiers.remove(modifier_to_remove)
+        status_effects.detach(modifier_to_remove)
 
     def take_damage(self, amount):
         self.health -= amount
         if self.health <= 0:
             self.kill()
 
-    def draw_health_bar(self, surface):
+    def draw_health_bar(self, surface, rect=None):
+         rect = rect or self.rect
          if self.health < self.max_health:
-             bar_width = self.rect.width
+             bar_width = rect.width
              bar_height = 5
              health_pct = max(0, self.health / self.max_health)
              health_bar_width = int(bar_width * health_pct)
 
              # Position below the sprite
-             bar_y = self.rect.bottom + 2 # 2 pixels below the bottom edge
+             bar_y = rect.bottom + 2 # 2 pixels below the bottom edge
 
              # Background of the health bar (e.g., dark red)
-             bg_rect = pygame.Rect(self.rect.left, bar_y, bar_width, bar_height)
+             bg_rect = pygame.Rect(rect.left, bar_y, bar_width, bar_height)
              pygame.draw.rect(surface, config.DARK_RED, bg_rect)
 
              # Actual health bar (e.g., green)
-             health_rect = pygame.Rect(self.rect.left, bar_y, health_bar_width, bar_height)
+             health_rect = pygame.Rect(rect.left, bar_y, health_bar_width, bar_height)
              pygame.draw.rect(surface, config.GREEN, health_rect)
 
-    def draw(self, surface):
+    def draw_bounds(self, center=None):
+        """Screen area draw() can touch: the sprite plus the health bar below it."""
+        rect = self.rect.copy()
+        if center is not None:
+            rect.center = center
+        rect.height += 7 # Health bar: 2px gap + 5px bar
+        return rect
+
+    def draw(self, surface, center=None):
+        """Draws the enemy at its rect, or centered on `center` (an interpolated position)."""
+        rect = self.rect
+        if center is not None:
+            rect = rect.copy()
+            rect.center = center
+
         # Start with the base image (or current animation frame)
         image_to_draw = self.image
 
-        # Apply visual effects from modifiers
-        for mod in self.modifiers:
-            image_to_draw = mod.apply_visuals(image_to_draw)
+        # Apply visual effects from modifiers (tinted frames are cached, not rebuilt per frame)
+        if self.modifiers:
+            image_to_draw = apply_modifier_visuals(image_to_draw, self.modifiers)
 
         # Draw the (potentially modified) image
-        surface.blit(image_to_draw, self.rect)
+        surface.blit(image_to_draw, rect)
         # Draw health bar on top
-        self.draw_health_bar(surface)
-
-    def update(self, dt):
-        # Update modifiers and remove expired ones
-        # Iterate over a copy of the list because remove_modifier modifies it
-        for mod in self.modifiers[:]:
-            mod.update(dt)
-
-        self._animate()
-        reached_end = self.move(dt)
-        return reached_end
+        self.draw_health_bar(surface, rect)
 
 # --- Cannon Tower Class ---
 class CannonTower(BaseTower):
@@ -583,50 +510,37 @@ class CannonTower(BaseTower):
     def shoot(self, projectiles):
         if self.target:
             # "Cannon" tower uses "Cannon" projectile
-            projectile = CannonProjectile(self.rect.center, self.target, type_key="Cannon", asset_manager=self.asset_manager, data_manager=self.data_manager)
-            projectiles.add(projectile)
-            # Get sound filename from data
-            tower_data = self.data_manager.get_tower_data(self.type_key)
-            if tower_data and tower_data.get("shoot_sound"):
-                 shoot_sound_file = tower_data["shoot_sound"]
-                 sound = self.asset_manager.load_sound(shoot_sound_file)
-                 self.asset_manager.play_sound(sound)
+            self.spawn_projectile(projectiles, "Cannon")
+            self.asset_manager.play_sound(self.shoot_sound)
 
 
 # --- Cannon Projectile Class ---
 class CannonProjectile(BaseProjectile):
 
-    def __init__(self, start_pos, target_enemy, type_key="Cannon", asset_manager=None, data_manager=None):
-        super().__init__(start_pos, target_enemy, type_key, asset_manager, data_manager)
+    def __init__(self, start_pos, target_enemy, type_key="Cannon", asset_manager=None, data_manager=None, image=None):
+        super().__init__(start_pos, target_enemy, type_key, asset_manager, data_manager, image=image)
 
-    def on_hit(self, target_enemy, enemies_group, effects_group):
+    def on_hit(self, target_enemy, enemies_group, effects_group, splash_batch=None):
         impact_pos = self.rect.center
-        proj_data = self.data_manager.get_projectile_data(self.type_key)
 
         # Play hit sound
-        if proj_data and proj_data.get("hit_sound"):
-             hit_sound = self.asset_manager.load_sound(proj_data["hit_sound"])
-             self.asset_manager.play_sound(hit_sound)
+        self.asset_manager.play_sound(self.hit_sound)
 
         # Apply direct damage
         if target_enemy.alive():
             target_enemy.take_damage(self.damage)
 
-        # Apply splash damage
+        # Queue splash damage (primary target excluded to avoid double damage)
         if self.splash_radius > 0:
-            for enemy in enemies_group.sprites():
-                # Check if alive AND not the primary target (to avoid double damage from splash)
-                if enemy.alive() and enemy is not target_enemy:
-                    dist = math.hypot(impact_pos[0] - enemy.rect.centerx, impact_pos[1] - enemy.rect.centery)
-                    if dist <= self.splash_radius:
-                        enemy.take_damage(self.damage) # Apply splash damage
+            batch = splash_batch if splash_batch is not None else SplashBatch()
+            batch.queue_damage(impact_pos, self.splash_radius, self.damage, target_enemy)
+            if splash_batch is None:
+                batch.resolve(enemies_group)
 
         # Create visual splash effect
-        if proj_data and proj_data.get("splash_image"):
-            splash_image_path = proj_data["splash_image"]
-            target_diameter = int(self.splash_radius * 2)
-            effect_size = (target_diameter, target_diameter)
-            effect = Effect(impact_pos, splash_image_path, 200, self.asset_manager, self.data_manager, target_size=effect_size)
+        if self.record.splash_image:
+            effect = Effect(impact_pos, self.record.splash_image_path, 200, self.asset_manager, self.data_manager,
+                            image=self.record.splash_image)
             effects_group.add(effect)
 
         # Cannon projectile is always destroyed, return reward 0
@@ -640,46 +554,36 @@ class IceTower(BaseTower):
 
     def shoot(self, projectiles):
         if self.target:
-            projectile = IceProjectile(self.rect.center, self.target, type_key="Ice", asset_manager=self.asset_manager, data_manager=self.data_manager)
-            projectiles.add(projectile)
-            # Play sound (fetched from data in base class or specific sound here)
-            tower_data = self.data_manager.get_tower_data(self.type_key)
-            if tower_data and tower_data.get("shoot_sound"):
-                 shoot_sound_file = tower_data["shoot_sound"]
-                 sound = self.asset_manager.load_sound(shoot_sound_file)
-                 self.asset_manager.play_sound(sound)
+            self.spawn_projectile(projectiles, "Ice")
+            self.asset_manager.play_sound(self.shoot_sound)
 
 
 # --- Ice Projectile Class ---
 class IceProjectile(BaseProjectile):
-    def __init__(self, start_pos, target_enemy, type_key="Ice", asset_manager=None, data_manager=None):
-        super().__init__(start_pos, target_enemy, type_key, asset_manager, data_manager)
-        data = self.data_manager.get_projectile_data(type_key)
-        self.slow_factor = data.get("slow_factor", 1.0)
-        self.slow_duration = data.get("slow_duration", 0)
-        # BaseProjectile loads splash_radius, accessible as self.splash_radius
-
-    def on_hit(self, target_enemy, enemies_group, effects_group):
+    def __init__(self, start_pos, target_enemy, type_key="Ice", asset_manager=None, data_manager=None, image=None):
+        super().__init__(start_pos, target_enemy, type_key, asset_manager, data_manager, image=image)
+
+    def apply_record(self):
+        super().apply_record()
+        self.slow_factor = self.record.slow_factor
+        self.slow_duration = self.record.slow_duration
+
+    def on_hit(self, target_enemy, enemies_group, effects_group, splash_batch=None):
         impact_pos = self.rect.center
-        proj_data = self.data_manager.get_projectile_data(self.type_key)
 
         # Play hit sound
-        if proj_data and proj_data.get("hit_sound"):
-             hit_sound = self.asset_manager.load_sound(proj_data["hit_sound"])
-             self.asset_manager.play_sound(hit_sound)
+        self.asset_manager.play_sound(self.hit_sound)
 
         # Apply direct damage
         if target_enemy.alive():
             target_enemy.take_damage(self.damage)
 
-        # Apply splash slow effect
+        # Queue splash slow effect (slow applies even to primary target again)
         if self.splash_radius > 0:
-            for enemy in enemies_group.sprites():
-                if enemy.alive(): # Slow applies even to primary target again
-                    dist = math.hypot(impact_pos[0] - enemy.rect.centerx, impact_pos[1] - enemy.rect.centery)
-                    if dist <= self.splash_radius:
-                        slow_mod = SlowModifier(self.slow_factor, self.slow_duration)
-                        enemy.add_modifier(slow_mod)
+            batch = splash_batch if splash_batch is not None else SplashBatch()
+            batch.queue_slow(impact_pos, self.splash_radius, self.slow_factor, self.slow_duration)
+            if splash_batch is None:
+                batch.resolve(enemies_group)
 
         # Ice projectile is always destroyed, no reward from projectile
         return True, 0
@@ -688,37 +592,32 @@ class IceProjectile(BaseProjectile):
 # --- Visual Effect Class ---
 class Effect(pygame.sprite.Sprite):
     """A sprite for temporary visual effects like explosions."""
-    def __init__(self, pos, image_path, duration_ms, asset_manager, data_manager, target_size=None):
+    def __init__(self, pos, image_path, duration_ms, asset_manager, data_manager, target_size=None, image=None):
         super().__init__()
         self.asset_manager = asset_manager
         self.data_manager = data_manager
-        # Unpack the tuple from load_image
-        image_surface, _ = asset_manager.load_image(image_path)
-        self.image = image_surface # Assign the surface to self.image
+        # Scaled effects come from the AssetManager cache (one smoothscale per size)
+        if image is not None:
+            self.image = image # Already scaled (e.g. a projectile record's splash image)
+        elif target_size:
+            self.image = asset_manager.get_scaled_image(image_path, target_size)
+        else:
+            self.image, _ = asset_manager.load_image(image_path)
 
         if not self.image:
             print(f"Warning: Failed to load effect image {image_path}. Effect won't display.")
             self.kill()
             return
 
-        # Get initial rect from loaded surface before potential scaling
         self.rect = self.image.get_rect()
 
-        if target_size:
-            try:
-                # Scale the surface stored in self.image
-                self.image = pygame.transform.smoothscale(self.image.copy(), target_size)
-                self.rect = self.image.get_rect() # Update rect after scaling
-            except ValueError as e:
-                print(f"Error scaling effect image {image_path} to {target_size}: {e}")
-
         self.rect.center = pos
-        self.spawn_time = pygame.time.get_ticks()
+        self.spawn_time = sim_clock.get_ticks()
         self.duration = duration_ms
 
     def update(self, dt):
         # Remove the effect after its duration expires
-        if pygame.time.get_ticks() - self.spawn_time > self.duration:
+        if sim_clock.get_ticks() - self.spawn_time > self.duration:
             self.kill() 
 
 class GoldMine(BaseTower):
@@ -747,27 +646,22 @@ class BountyHunterTower(BaseTower):
 
     def shoot(self, projectiles):
         if self.target:
-            projectile = CoinShotProjectile(self.rect.center, self.target, type_key="CoinShot", asset_manager=self.asset_manager, data_manager=self.data_manager)
-            projectiles.add(projectile)
-            tower_data = self.data_manager.get_tower_data(self.type_key)
-            if tower_data and tower_data.get("shoot_sound"):
-                 sound = self.asset_manager.load_sound(tower_data["shoot_sound"])
-                 self.asset_manager.play_sound(sound)
+            self.spawn_projectile(projectiles, "CoinShot")
+            self.asset_manager.play_sound(self.shoot_sound)
 
 
 # --- Coin Shot Projectile Class ---
 class CoinShotProjectile(BaseProjectile):
-    def __init__(self, start_pos, target_enemy, type_key="CoinShot", asset_manager=None, data_manager=None):
-        super().__init__(start_pos, target_enemy, type_key, asset_manager, data_manager)
-        proj_data = self.data_manager.get_projectile_data(type_key)
-        self.awards_bounty = proj_data.get("awards_bounty_on_kill", False)
+    def __init__(self, start_pos, target_enemy, type_key="CoinShot", asset_manager=None, data_manager=None, image=None):
+        super().__init__(start_pos, target_enemy, type_key, asset_manager, data_manager, image=image)
+
+    def apply_record(self):
+        super().apply_record()
+        self.awards_bounty = self.record.awards_bounty
 
-    def on_hit(self, target_enemy, enemies_group, effects_group):
+    def on_hit(self, target_enemy, enemies_group, effects_group, splash_batch=None):
         # Play hit sound
-        proj_data = self.data_manager.get_projectile_data(self.type_key)
-        if proj_data and proj_data.get("hit_sound"):
-             sound = self.asset_manager.load_sound(proj_data["hit_sound"])
-             self.asset_manager.play_sound(sound)
+        self.asset_manager.play_sound(self.hit_sound)
 
         gold_reward = 0
         killed_enemy = False
@@ -0,0 +1,152 @@
+# frame_profiler.py
+import csv
+import json
+import os
+import time
+from collections import deque
+import pygame
+import config
+
+# Display order; indented phases are part of the one above them
+PHASE_LAYOUT = [
+    ("frame", 0),
+    ("events", 1),
+    ("simulate", 1),
+    ("update_waves", 2), ("update_enemies", 2), ("update_towers", 2), ("update_projectiles", 2),
+    ("update_effects", 2), ("collisions", 2),
+    ("draw", 1),
+    ("draw_map", 2), ("draw_towers", 2), ("draw_enemies", 2), ("draw_projectiles", 2), ("draw_effects", 2),
+    ("draw_ui", 2), ("draw_items", 2), ("draw_dirty", 2),
+    ("overlay", 1),
+    ("present", 1),
+    ("wait", 0), # Sleeping in clock.tick to hold the frame rate
+]
+COUNTS = ["steps", "enemies", "towers", "projectiles", "effects"]
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class FrameProfiler:
+    """Per-phase timings of every frame, kept for the last `window` frames.
+
+    Timing a phase is one perf_counter() call and a dict add, chained so
+    the end of one phase is the start of the next:
+
+        start = time.perf_counter()
+        ...
+        start = profiler.add("update_towers", start)
+
+    Phases that run several times a frame (every simulation step) add up.
+    end_frame() closes the frame with its entity counts.
+    """
+    def __init__(self, window=config.PROFILER_WINDOW_FRAMES):
+        self.current = {} # phase -> ms so far this frame
+        self.frames = deque(maxlen=window) # (phases dict, counts dict) per finished frame
+        self.frame_number = 0
+
+    def add(self, phase, start):
+        """Adds the time since start to a phase of this frame. Returns now, to start the next phase."""
+        now = time.perf_counter()
+        self.current[phase] = self.current.get(phase, 0.0) + (now - start) * 1000.0
+        return now
+
+    def end_frame(self, counts):
+        self.frames.append((self.current, counts))
+        self.current = {}
+        self.frame_number += 1
+
+    def phases(self):
+        """Every phase seen in the window, in display order."""
+        seen = set()
+        for phases, _ in self.frames:
+            seen.update(phases)
+        ordered = [name for name, _ in PHASE_LAYOUT if name in seen]
+        return ordered + sorted(seen - set(ordered))
+
+    def stats(self):
+        """{phase: (mean, p95, p99)} in ms over the window, a frame that skipped a phase counting as 0."""
+        result = {}
+        count = len(self.frames)
+        for phase in self.phases():
+            ordered = sorted(phases.get(phase, 0.0) for phases, _ in self.frames)
+            result[phase] = (sum(ordered) / count, percentile(ordered, 0.95), percentile(ordered, 0.99))
+        return result
+
+    # --- Export ---
+    def rows(self):
+        """One dict per frame in the window: frame_number, every phase's ms, entity counts."""
+        phases = self.phases()
+        first = self.frame_number - len(self.frames)
+        return [{"frame_number": first + i, **{phase: round(frame.get(phase, 0.0), 4) for phase in phases}, **counts}
+                for i, (frame, counts) in enumerate(self.frames)]
+
+    def export_csv(self, filepath):
+        rows = self.rows()
+        with open(filepath, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["frame_number"] + self.phases() + COUNTS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def export_json(self, filepath):
+        with open(filepath, "w") as f:
+            json.dump({"phases": self.phases(), "counts": COUNTS, "frames": self.rows()}, f)
+
+    def export(self, directory=config.PROFILER_EXPORT_DIR):
+        """Writes the window as timestamped CSV and JSON files. Returns their paths."""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, time.strftime("frame_profile_%Y%m%d_%H%M%S"))
+        self.export_csv(base + ".csv")
+        self.export_json(base + ".json")
+        return base + ".csv", base + ".json"
+
+
+class ProfilerOverlay:
+    """Draws a FrameProfiler's rolling mean/p95/p99 per phase and the entity counts.
+
+    The text is re-rendered every config.PROFILER_OVERLAY_REFRESH_MS and
+    blitted as one surface in between, so the overlay costs little itself.
+    """
+    LINE_HEIGHT = 14
+    PADDING = 6
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.visible = False
+        self.font = None # Created on first draw (needs pygame.font)
+        self.surface = None
+        self.last_refresh = 0.0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.surface = None
+
+    def _render(self):
+        if self.font is None:
+            self.font = pygame.font.SysFont("monospace", 12)
+        indent_of = dict(PHASE_LAYOUT)
+        lines = [f"{'phase':<22}{'mean':>7}{'p95':>7}{'p99':>7}"]
+        for phase, (mean, p95, p99) in self.profiler.stats().items():
+            label = "  " * indent_of.get(phase, 1) + phase
+            lines.append(f"{label:<22}{mean:>7.2f}{p95:>7.2f}{p99:>7.2f}")
+        if self.profiler.frames:
+            counts = self.profiler.frames[-1][1]
+            lines.append(" ".join(f"{name} {counts.get(name, 0)}" for name in COUNTS))
+        lines.append(f"{len(self.profiler.frames)} frames, ms  [F3 hide, F4 export]")
+
+        width = max(self.font.size(line)[0] for line in lines) + self.PADDING * 2
+        height = len(lines) * self.LINE_HEIGHT + self.PADDING * 2
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 190))
+        for i, line in enumerate(lines):
+            surface.blit(self.font.render(line, True, config.WHITE), (self.PADDING, self.PADDING + i * self.LINE_HEIGHT))
+        self.surface = surface
+
+    def draw(self, screen):
+        """Draws the overlay (when visible and there is data)."""
+        if not self.visible or not self.profiler.frames:
+            return
+        now = time.perf_counter()
+        if self.surface is None or (now - self.last_refresh) * 1000.0 >= config.PROFILER_OVERLAY_REFRESH_MS:
+            self._render()
+            self.last_refresh = now
+        screen.blit(self.surface, (4, 44)) # Just below the status bar
@@ -1,15 +1,32 @@
 # data_manager.py (formerly game_data_manager.py)
+import copy
 import json
 import os
+import time
+import config
+from data_records import TowerRecord, ProjectileRecord, EnemyRecord, WaveRecord
+
+# Data kind -> (file, record class, records attribute); waves are compiled separately
+DATA_FILES = {
+    "towers": ("towers.json", TowerRecord, "tower_records"),
+    "projectiles": ("projectiles.json", ProjectileRecord, "projectile_records"),
+    "enemies": ("enemies.json", EnemyRecord, "enemy_records"),
+    "waves": ("waves.json", WaveRecord, "wave_records"),
+}
 
 class DataManager:
     def __init__(self, data_dir="data"):
+        self.data_dir = data_dir
         self.towers = {}
         self.projectiles = {}
         self.enemies = {}
         self.waves = []
+        # Stat'ed before reading, so an edit made during the load is picked up by the next poll
+        self.mtimes = {kind: self._mtime(kind) for kind in DATA_FILES}
+        self.last_poll = time.perf_counter()
         self._load_all_data(data_dir)
         self._define_class_maps()
+        self._compile_records()
 
     def _load_all_data(self, data_dir):
         """Loads all JSON data files from the specified directory."""
@@ -66,6 +83,100 @@ class DataManager:
         }
         print("DataManager: Class maps defined.")
 
+    def _compile_records(self):
+        """Validates the loaded data into typed records (raises ValueError on bad data)."""
+        self.tower_records = {key: TowerRecord(key, data) for key, data in self.towers.items()}
+        self.projectile_records = {key: ProjectileRecord(key, data) for key, data in self.projectiles.items()}
+        self.enemy_records = {key: EnemyRecord(key, data) for key, data in self.enemies.items()}
+        self.wave_records = [WaveRecord(data, self.enemy_classes) for data in self.waves]
+        print("DataManager: Records compiled.")
+
+    def resolve_assets(self, asset_manager):
+        """Attaches scaled images and sound handles to every record (needs the display mode set)."""
+        for records in (self.tower_records, self.projectile_records, self.enemy_records):
+            for record in records.values():
+                record.resolve(asset_manager)
+
+    # --- Hot Reload ---
+    def _mtime(self, kind):
+        try:
+            return os.stat(os.path.join(self.data_dir, DATA_FILES[kind][0])).st_mtime_ns
+        except OSError:
+            return None # Missing, or being replaced by an editor right now
+
+    def poll_changes(self, asset_manager):
+        """Re-reads the data files modified since they were last read.
+
+        Cheap enough to call every frame: the files are only stat'ed every
+        config.DATA_RELOAD_POLL_MS. A file that fails to parse or validate is
+        reported and the previous data kept.
+
+        Returns:
+            dict: {kind: {type_key: copy of the record before the change}} for
+                each changed towers/projectiles/enemies file (only the types
+                whose data differs), and "waves": True if waves.json changed.
+                Empty when nothing changed.
+        """
+        now = time.perf_counter()
+        if (now - self.last_poll) * 1000.0 < config.DATA_RELOAD_POLL_MS:
+            return {}
+        self.last_poll = now
+        changes = {}
+        for kind in DATA_FILES:
+            mtime = self._mtime(kind)
+            if mtime is None or mtime == self.mtimes[kind]:
+                continue
+            self.mtimes[kind] = mtime
+            try:
+                changed = self.reload(kind, asset_manager)
+            except (OSError, json.JSONDecodeError, ValueError) as e:
+                print(f"DataManager: Keeping the previous {DATA_FILES[kind][0]} ({e})")
+                continue
+            if changed:
+                changes[kind] = changed
+        return changes
+
+    def reload(self, kind, asset_manager):
+        """Re-reads one data file and updates its records in place. Returns what changed (see poll_changes)."""
+        filename, RecordClass, records_attr = DATA_FILES[kind]
+        filepath = os.path.join(self.data_dir, filename)
+        if kind == "waves":
+            data = self._load_json(filepath, sort_key='wave')
+            # Compiled in full before anything is replaced, so a bad file changes nothing
+            self.wave_records = [WaveRecord(wave, self.enemy_classes) for wave in data]
+            self.waves = data
+            return True
+
+        data = self._load_json(filepath)
+        compiled = {key: RecordClass(key, entry) for key, entry in data.items()}
+        old_data = getattr(self, kind)
+        records = getattr(self, records_attr)
+        changed = {}
+        stale_images = set()
+        for key, record in compiled.items():
+            current = records.get(key)
+            if current is None:
+                records[key] = record.resolve(asset_manager)
+                changed[key] = None
+            elif data[key] != old_data.get(key):
+                changed[key] = copy.copy(current)
+                old_images = current.scaled_images()
+                if current.update_from(record):
+                    stale_images.update(old_images)
+                    current.resolve(asset_manager)
+        for key in set(records) - set(compiled):
+            print(f"DataManager: '{key}' removed from {filename}, entities already in play keep it")
+            changed[key] = records.pop(key)
+        setattr(self, kind, data)
+
+        # Drop only the scaled surfaces nothing uses any more (e.g. the old size after a scale_ratio change)
+        if stale_images:
+            in_use = {image for attr in ("tower_records", "projectile_records", "enemy_records")
+                      for record in getattr(self, attr).values() for image in record.scaled_images()}
+            asset_manager.discard_scaled_images(stale_images - in_use)
+        print(f"DataManager: Reloaded {filename} ({len(changed)} changed: {', '.join(sorted(changed)) or 'none'})")
+        return changed
+
     # --- Getter methods ---
     def get_tower_data(self, type_key):
         return self.towers.get(type_key)
@@ -82,6 +193,19 @@ class DataManager:
     def get_wave_definitions(self):
         return self.waves
 
+    # --- Record getters ---
+    def get_tower_record(self, type_key):
+        return self.tower_records.get(type_key)
+
+    def get_projectile_record(self, type_key):
+        return self.projectile_records.get(type_key)
+
+    def get_enemy_record(self, type_key):
+        return self.enemy_records.get(type_key)
+
+    def get_wave_records(self):
+        return self.wave_records
+
     # --- Class Map Getters ---
     def get_enemy_class(self, type_key):
         return self.enemy_classes.get(type_key)
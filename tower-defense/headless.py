@@ -0,0 +1,191 @@
+# headless.py
+"""Runs the tower defense simulation with no window, audio or real-time clock.
+
+The SimClock advances one fixed step per tick with no real-time pacing,
+so whole games run as fast as the CPU allows. Towers are placed
+through a small scripted API instead of the mouse.
+
+Example:
+    sim = HeadlessSimulation(starting_wave=1)
+    sim.place_tower("Cannon", 3, 4)
+    sim.schedule(600, "place_tower", "Ice", 5, 4) # 10 seconds in
+    print(sim.run(max_waves=5))
+
+Or from the command line:
+    python headless.py --start-wave 1 --waves 5 --tower Cannon:3:4 --tower Ice:5:4
+
+Pass seed= (--seed) to fix the map paths, and record() (--record) to
+save the run for replay.py.
+"""
+import argparse
+import contextlib
+import time
+from main import Game
+from snapshot import take_snapshot, restore_snapshot
+
+class _NullWriter:
+    """Swallows the game's print() chatter during quiet runs."""
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+class HeadlessSimulation:
+    """A Game built with headless=True plus a stepping loop and scripted actions."""
+    def __init__(self, starting_wave=None, quiet=True, seed=None):
+        self.quiet = quiet
+        self._null_writer = _NullWriter()
+        with self._output():
+            self.game = Game(headless=True, seed=seed)
+        self.dt = self.game.sim_clock.step_dt # Fixed simulation step in seconds
+        self.state = self.game.get_current_state()
+        if starting_wave is not None:
+            # No wave has started yet - the first one begins after the initial delay
+            self.game.wave_manager.current_wave_number = starting_wave - 1
+        self.ticks = 0
+        self.waves_cleared = 0
+        self.scheduled_actions = [] # (tick, action_name, args), kept sorted by tick
+
+    def _output(self):
+        if self.quiet:
+            return contextlib.redirect_stdout(self._null_writer)
+        return contextlib.nullcontext()
+
+    # --- Scripted Actions ---
+    def place_tower(self, tower_key, grid_x, grid_y):
+        """Places a tower (costs money as usual). Returns the tower or None."""
+        with self._output():
+            return self.state.place_tower(tower_key, grid_x, grid_y)
+
+    def sell_tower(self, grid_x, grid_y):
+        with self._output():
+            return self.state.sell_tower(grid_x, grid_y)
+
+    def move_tower(self, grid_x, grid_y, new_grid_x, new_grid_y):
+        """Moves the tower on (grid_x, grid_y), respecting its move cooldown."""
+        tower = self.state.get_tower_at(grid_x, grid_y)
+        if not tower or not tower.can_move():
+            return False
+        with self._output():
+            return self.state.move_tower(tower, new_grid_x, new_grid_y)
+
+    def click_tower(self, grid_x, grid_y):
+        """Clicks the tower on a cell (collects gold from a Gold Mine)."""
+        tower = self.state.get_tower_at(grid_x, grid_y)
+        if not tower:
+            return False
+        with self._output():
+            return self.state.click_tower(tower)
+
+    def schedule(self, tick, action_name, *args):
+        """Queues one of the actions above to run at the start of a given tick."""
+        self.scheduled_actions.append((tick, action_name, args))
+        self.scheduled_actions.sort(key=lambda item: item[0])
+
+    def _run_due_actions(self):
+        while self.scheduled_actions and self.scheduled_actions[0][0] <= self.ticks:
+            _, action_name, args = self.scheduled_actions.pop(0)
+            getattr(self, action_name)(*args)
+
+    # --- Recording ---
+    def record(self, target):
+        """Records every action from here on to a file path or binary file (see recorder.py).
+        Call before the first step; close the returned recorder when done."""
+        return self.game.start_recording(target)
+
+    # --- Snapshots ---
+    def snapshot(self):
+        """The simulation state as bytes (see snapshot.py). Scheduled actions are not included."""
+        return take_snapshot(self.game, {"ticks": self.ticks, "waves_cleared": self.waves_cleared})
+
+    def restore(self, data):
+        """Rewinds or forks to a snapshot taken by snapshot()."""
+        with self._output():
+            counters = restore_snapshot(self.game, data)
+        self.ticks = int(counters.get("ticks", 0))
+        self.waves_cleared = int(counters.get("waves_cleared", 0))
+
+    # --- Stepping ---
+    def step(self):
+        """Advances the simulation by one fixed step."""
+        self._run_due_actions()
+        wave_manager = self.game.wave_manager
+        was_active = wave_manager.is_wave_active()
+        step_dt = self.game.sim_clock.step()
+        with self._output():
+            self.state.update(step_dt)
+        self.ticks += 1
+        if was_active and not wave_manager.is_wave_active() and self.game.player_health > 0:
+            self.waves_cleared += 1
+
+    def is_finished(self):
+        """True on defeat, or once every defined wave has been played."""
+        wave_manager = self.game.wave_manager
+        if not self.game.running:
+            return True
+        return not wave_manager.is_wave_active() and not wave_manager.waiting_for_next_wave
+
+    def run(self, max_waves=None, max_ticks=None):
+        """Steps until the game ends, max_waves waves are cleared or max_ticks pass.
+
+        Returns:
+            dict: Summary of the run (outcome, ticks, simulated and wall time, player state).
+        """
+        start = time.perf_counter()
+        outcome = None
+        while outcome is None:
+            if self.is_finished():
+                outcome = "defeat" if self.game.player_health <= 0 else "victory"
+            elif max_waves is not None and self.waves_cleared >= max_waves:
+                outcome = "max_waves"
+            elif max_ticks is not None and self.ticks >= max_ticks:
+                outcome = "max_ticks"
+            else:
+                self.step()
+        return self.summary(outcome, wall_ms=(time.perf_counter() - start) * 1000.0)
+
+    def summary(self, outcome=None, wall_ms=None):
+        return {
+            "outcome": outcome,
+            "seed": self.game.seed,
+            "ticks": self.ticks,
+            "sim_seconds": round(self.ticks * self.dt, 3),
+            "wall_ms": round(wall_ms, 1) if wall_ms is not None else None,
+            "waves_cleared": self.waves_cleared,
+            "wave": self.game.wave_manager.current_wave_number,
+            "player_health": self.game.player_health,
+            "player_money": self.game.player_money,
+            "towers": len(self.game.towers),
+            "enemies": len(self.game.enemies),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the tower defense simulation headless.")
+    parser.add_argument("--start-wave", type=int, default=None, help="First wave to play (default: config.DEBUG_STARTING_WAVE)")
+    parser.add_argument("--waves", type=int, default=None, help="Stop after clearing this many waves")
+    parser.add_argument("--max-ticks", type=int, default=None, help="Stop after this many simulation steps")
+    parser.add_argument("--money", type=int, default=None, help="Override starting money")
+    parser.add_argument("--tower", action="append", default=[], metavar="TYPE:X:Y",
+                        help="Place a tower before the first wave, e.g. Cannon:3:4 (repeatable)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the game's random streams")
+    parser.add_argument("--record", metavar="PATH", help="Record the run's actions to PATH (replay with replay.py)")
+    parser.add_argument("--verbose", action="store_true", help="Show the game's own log output")
+    args = parser.parse_args()
+
+    sim = HeadlessSimulation(starting_wave=args.start_wave, quiet=not args.verbose, seed=args.seed)
+    if args.money is not None:
+        sim.game.player_money = args.money
+    recorder = sim.record(args.record) if args.record else None
+    for spec in args.tower:
+        tower_key, grid_x, grid_y = spec.split(":")
+        if not sim.place_tower(tower_key, int(grid_x), int(grid_y)):
+            print(f"Could not place {tower_key} at ({grid_x}, {grid_y})")
+    print(sim.run(max_waves=args.waves, max_ticks=args.max_ticks))
+    if recorder:
+        recorder.close()
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,7 @@
+import argparse
 import pygame
 import sys
+import time
 import config
 from map import GameMap
 from entities import Projectile, CannonProjectile, IceProjectile, CoinShotProjectile
@@ -10,23 +12,49 @@ import os
 # Import DataManager class
 from game_data_manager import DataManager
 from wave_manager import WaveManager
-from modifiers import SlowModifier
+from modifiers import SlowModifier, status_effects
 from asset_manager import AssetManager
 from states import GameState, PlayingState # Import states
+from enemy_store import EnemyGroup
+from enemy_prototypes import EnemyPrototypes
+from projectile_pool import ProjectilePool, ProjectileGroup
+import sim_clock
+import rng
+from recorder import ActionRecorder
+from frame_profiler import FrameProfiler, ProfilerOverlay
+from wave_profiler import WaveProfiler, parse_wave_range
 
 # --- Game Class Definition ---
 class Game:
-    def __init__(self):
-        """Initialize Pygame, load data, create screen and game objects."""
+    def __init__(self, headless=False, seed=None):
+        """Initialize Pygame, load data, create screen and game objects.
+
+        With headless=True no window, audio or fonts are created; the caller
+        steps the simulation itself (see headless.py). seed fixes every random
+        stream (default config.RNG_SEED, or a fresh seed); see self.seed.
+        """
+        self.headless = headless
         # Initialize Pygame FIRST
-        pygame.init()
-        # Initialize Asset Manager (which initializes mixer)
-        self.asset_manager = AssetManager()
+        if headless:
+            # Dummy video driver: images still load and convert, but no window opens
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            pygame.display.init()
+        else:
+            pygame.init()
+        # Game time starts at zero and only moves in fixed simulation steps
+        self.sim_clock = sim_clock.clock
+        self.sim_clock.reset()
+        status_effects.reset() # Expiry times are game ticks, so they can't outlive the clock
+        # Seed before anything random (the map path) is generated
+        rng.streams.reset(seed if seed is not None else config.RNG_SEED)
+        self.seed = rng.streams.seed
+        # Initialize Asset Manager (which initializes mixer unless headless)
+        self.asset_manager = AssetManager(enable_sound=not headless)
 
         # --- Load Game Data via DataManager ---
         try:
             self.data_manager = DataManager() # Instantiate DataManager
-        except (FileNotFoundError, json.JSONDecodeError, SystemExit) as e:
+        except (FileNotFoundError, json.JSONDecodeError, ValueError, SystemExit) as e:
              print(f"Failed to initialize DataManager: {e}")
              sys.exit(1)
 
@@ -34,20 +62,30 @@ class Game:
         self.asset_manager.preload_assets()
 
         # --- End Load Game Data ---
-        self.screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
-        pygame.display.set_caption("Tower Defense")
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont(None, 36) # Font for UI text
-        self.small_font = pygame.font.SysFont(None, 24) # Smaller font for selection text
-        self.ui_font = pygame.font.SysFont(None, 20) # Font for UI panel text
-        self.status_font = pygame.font.SysFont(None, 28) # Font for status bar
+        if headless:
+            self.screen = pygame.display.set_mode((1, 1)) # Needed for convert_alpha only
+            self.clock = None
+        else:
+            self.screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+            pygame.display.set_caption("Tower Defense")
+            self.clock = pygame.time.Clock()
+            self.font = pygame.font.SysFont(None, 36) # Font for UI text
+            self.small_font = pygame.font.SysFont(None, 24) # Smaller font for selection text
+            self.ui_font = pygame.font.SysFont(None, 20) # Font for UI panel text
+            self.status_font = pygame.font.SysFont(None, 28) # Font for status bar
+        if config.WARM_SCALED_IMAGE_CACHE:
+            # Needs the display mode set (convert_alpha) - do it once here, not on first spawn
+            self.asset_manager.warm_scaled_cache(self.data_manager)
 
         # Game state
         # Pass AssetManager to GameMap
         self.game_map = GameMap(config.GAME_AREA_WIDTH // config.TILE_SIZE, config.GRID_HEIGHT, self.asset_manager)
-        self.enemies = pygame.sprite.Group()
+        self.enemies = EnemyGroup() # Array-backed, moved in one vectorized step and indexed by tile for targeting
         self.towers = pygame.sprite.Group()
-        self.projectiles = pygame.sprite.Group()
+        self.projectile_pool = ProjectilePool(self.asset_manager, self.data_manager)
+        self.projectiles = ProjectileGroup(self.projectile_pool) # Fired projectiles are recycled, not rebuilt
+        for projectile_type in self.data_manager.projectile_classes:
+            self.projectile_pool.prewarm(projectile_type, config.PROJECTILE_POOL_PREWARM)
         self.player_money = config.STARTING_MONEY
         self.player_health = config.STARTING_HEALTH
 
@@ -55,13 +93,25 @@ class Game:
         self.effects = pygame.sprite.Group()
         # selected_tower_type = Tower # Selection now handled by UI panel
 
+        # One prototype per enemy type: stats and scaled frames shared by every instance
+        self.enemy_prototypes = EnemyPrototypes(self.asset_manager, self.data_manager)
+
         # Create Wave Manager (pass asset_manager and enemy_class_map)
-        self.wave_manager = WaveManager(self.data_manager, self.asset_manager)
+        self.wave_manager = WaveManager(self.data_manager, self.asset_manager, enemy_prototypes=self.enemy_prototypes)
 
         # Create UI Panel (Needs DataManager and AssetManager)
-        self.ui_panel = UIPanel(self.data_manager, start_y=50, font=self.ui_font, asset_manager=self.asset_manager)
+        if headless:
+            self.ui_panel = None # Nothing to click or draw
+        else:
+            self.ui_panel = UIPanel(self.data_manager, start_y=50, font=self.ui_font, asset_manager=self.asset_manager)
         # self.tower_class_map = self.ui_panel.tower_class_map # No longer needed here
 
+        self.recorder = None # ActionRecorder while recording (see start_recording)
+        # Per-phase frame timings; F3 shows them, F4 exports them
+        self.profiler = FrameProfiler()
+        self.profiler_overlay = None if headless else ProfilerOverlay(self.profiler)
+        self.wave_profiler = None # WaveProfiler when capturing per-wave stack profiles
+        self.hot_reload = config.DATA_HOT_RELOAD # Poll data/*.json for edits (a designer tool)
         self.running = True
         self.state_stack = [] # Use a stack for states (e.g., pause menu)
         self._init_starting_state()
@@ -79,6 +129,45 @@ class Game:
         self.state_stack.append(PlayingState(self)) # Start in Playing state
         self.state_stack[-1].enter_state() # Call enter for the first state
 
+    def start_recording(self, target):
+        """Records player actions from now on to a file path or binary file (see recorder.py)."""
+        self.recorder = ActionRecorder(target, self)
+        return self.recorder
+
+    def _invalidate_screen(self):
+        """Makes the next frame a full redraw when dirty-rect rendering is on."""
+        state = self.get_current_state()
+        if getattr(state, "dirty_renderer", None):
+            state.dirty_renderer.invalidate()
+
+    def apply_data_changes(self, changes):
+        """Pushes hot-reloaded data (DataManager.poll_changes) onto everything already in play."""
+        towers = changes.get("towers")
+        if towers:
+            for tower in self.towers:
+                if tower.type_key in towers:
+                    tower.apply_record()
+            if self.ui_panel:
+                self.ui_panel.build_buttons() # Names, costs and icons
+        projectiles = changes.get("projectiles")
+        if projectiles:
+            for type_key in projectiles:
+                self.projectile_pool.refresh_type(type_key)
+            for projectile in self.projectiles:
+                if projectile.type_key in projectiles:
+                    projectile.refresh_from_record()
+        enemies = changes.get("enemies")
+        if enemies:
+            for enemy in self.enemies:
+                previous = enemies.get(enemy.type_key)
+                if previous is not None:
+                    enemy.apply_record(previous)
+        if changes.get("waves"):
+            self.wave_manager.reload_waves()
+        if self.recorder:
+            print("Warning: Game data changed while recording - the replay will not match")
+        self._invalidate_screen()
+
     def get_current_state(self):
         return self.state_stack[-1] if self.state_stack else None
 
@@ -111,8 +200,11 @@ class Game:
             self.running = False
 
     def run(self):
+        profiler = self.profiler
         while self.running:
-            dt = self.clock.tick(config.FPS) / 1000.0
+            start = time.perf_counter()
+            frame_dt = self.clock.tick(config.FPS) / 1000.0
+            frame_start = start = profiler.add("wait", start)
             current_state = self.get_current_state()
             if not current_state:
                 self.running = False # Exit if no state
@@ -124,20 +216,75 @@ class Game:
             for event in events:
                  if event.type == pygame.QUIT:
                       self.running = False
+                 elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                      self.profiler_overlay.toggle()
+                      self._invalidate_screen() # Repaint what the overlay covered
+                 elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                      csv_path, json_path = profiler.export()
+                      print(f"Frame profile written to {csv_path} and {json_path}")
             if not self.running: # Check if QUIT event set running to False
                  break
 
             current_state.handle_events(events)
-            current_state.update(dt)
-            current_state.draw(self.screen)
-            # pygame.display.flip() is now called within state.draw or after loop?
-            # Let's keep it here for now
-            pygame.display.flip()
+            if self.hot_reload:
+                changes = self.data_manager.poll_changes(self.asset_manager)
+                if changes:
+                    self.apply_data_changes(changes)
+            start = profiler.add("events", start)
+            # Fixed timestep: run however many simulation steps this frame's
+            # real time (times the game speed) covers, then render once
+            steps = 0
+            for step_dt in self.sim_clock.steps_for_frame(frame_dt):
+                current_state.update(step_dt)
+                if self.wave_profiler:
+                    # Per step: at 4x/MAX a wave can end (and the next start) mid-frame
+                    self.wave_profiler.update(self.wave_manager)
+                steps += 1
+                if not self.running:
+                    break
+            start = profiler.add("simulate", start)
+            # Draw between the last two steps so motion stays smooth
+            if self.profiler_overlay.visible:
+                self._invalidate_screen() # The translucent overlay needs a fresh frame under it
+            dirty_rects = current_state.draw(self.screen, self.sim_clock.alpha)
+            start = profiler.add("draw", start)
+            self.profiler_overlay.draw(self.screen)
+            start = profiler.add("overlay", start)
+            if dirty_rects is None:
+                pygame.display.flip()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects) # Only the areas that changed
+            profiler.add("present", start)
+            profiler.add("frame", frame_start)
+            profiler.end_frame({"steps": steps, "enemies": len(self.enemies), "towers": len(self.towers),
+                                "projectiles": len(self.projectiles), "effects": len(self.effects)})
 
+        if self.recorder:
+            self.recorder.close()
+        if self.wave_profiler:
+            self.wave_profiler.close()
         pygame.quit()
         sys.exit()
 
 # --- Main Execution ---
 if __name__ == '__main__':
-    game = Game()
+    parser = argparse.ArgumentParser(description="Tower defense.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the game's random streams (default: config.RNG_SEED, or a new one)")
+    parser.add_argument("--record", metavar="PATH", help="Record player actions to PATH (replay with replay.py)")
+    parser.add_argument("--profile-waves", metavar="N|FIRST-LAST", type=parse_wave_range,
+                        help="Sample a stack profile of each of these waves, one collapsed-stack file per wave")
+    parser.add_argument("--profile-dir", default=config.WAVE_PROFILE_DIR,
+                        help=f"Where --profile-waves writes wave_NN.collapsed (default {config.WAVE_PROFILE_DIR})")
+    parser.add_argument("--hot-reload", action="store_true",
+                        help="Reload data/*.json whenever a file is saved, without restarting")
+    args = parser.parse_args()
+    game = Game(seed=args.seed)
+    if args.hot_reload:
+        game.hot_reload = True
+    if args.record:
+        game.start_recording(args.record)
+        print(f"Recording to {args.record} (seed {game.seed})")
+    if args.profile_waves:
+        game.wave_profiler = WaveProfiler(*args.profile_waves, output_dir=args.profile_dir)
+        print(f"Profiling waves {args.profile_waves[0]}-{args.profile_waves[1]} into {args.profile_dir}")
     game.run() 
\ No newline at end of file
@@ -1,6 +1,65 @@
+import bisect
+import numpy as np
 import pygame
 import config
-import random
+import rng
+
+class PathGeometry:
+    """A waypoint path parametrized by arc length.
+
+    Cumulative lengths and unit directions are computed once per path, so an
+    enemy only needs its distance travelled: the position is a binary search
+    for the segment plus one multiply-add.
+    """
+    def __init__(self, points):
+        self.points = list(points)
+        coords = np.array(self.points, dtype=np.float64).reshape(-1, 2)
+        self.xs = coords[:, 0].copy()
+        self.ys = coords[:, 1].copy()
+        seg_dx = np.diff(self.xs)
+        seg_dy = np.diff(self.ys)
+        seg_len = np.hypot(seg_dx, seg_dy)
+        safe_len = np.where(seg_len > 0, seg_len, 1.0) # Repeated waypoints: zero direction
+        self.dir_x = seg_dx / safe_len
+        self.dir_y = seg_dy / safe_len
+        self.starts = np.zeros(len(self.xs), dtype=np.float64) # Distance at each waypoint
+        np.cumsum(seg_len, out=self.starts[1:])
+        self.length = self.starts[-1].item() if len(self.starts) else 0.0
+        self._starts_list = self.starts.tolist()
+
+    def __len__(self):
+        return len(self.points)
+
+    def segment_at(self, distance):
+        """Index of the segment `distance` falls on (the waypoint it set out from)."""
+        last = len(self._starts_list) - 2
+        if last < 0:
+            return 0
+        return min(max(bisect.bisect_right(self._starts_list, distance) - 1, 0), last)
+
+    def position_at(self, distance):
+        """(x, y) after `distance` pixels along the path, clamped to its ends."""
+        if not self.points:
+            return (0.0, 0.0)
+        if distance >= self.length:
+            return (self.xs[-1].item(), self.ys[-1].item())
+        i = self.segment_at(distance)
+        along = max(distance, 0.0) - self._starts_list[i]
+        return (self.xs[i].item() + self.dir_x[i].item() * along,
+                self.ys[i].item() + self.dir_y[i].item() * along)
+
+    def positions_at(self, distances):
+        """Vectorized position_at. Returns (xs, ys, segment indices)."""
+        distances = np.clip(distances, 0.0, self.length)
+        if len(self.xs) < 2:
+            x, y = self.position_at(0.0)
+            count = len(distances)
+            return np.full(count, x), np.full(count, y), np.zeros(count, dtype=np.int64)
+        segment = np.clip(np.searchsorted(self.starts, distances, side='right') - 1, 0, len(self.xs) - 2)
+        along = distances - self.starts[segment]
+        return (self.xs[segment] + self.dir_x[segment] * along,
+                self.ys[segment] + self.dir_y[segment] * along,
+                segment)
 
 class GameMap:
     # Accept asset_manager
@@ -12,14 +71,17 @@ class GameMap:
         self.grid = [[1] * grid_width for _ in range(grid_height)] # Start all buildable
         self.path_coords = [] # List of (x,y) grid coords
         self.pixel_path = [] # List of (x,y) pixel coords (center of tile)
+        self.path_geometry = PathGeometry([]) # Arc-length lookup for pixel_path
+
+        # Pre-rendered terrain, built on first draw and patched per changed tile
+        self.background = None
+        self.rendered_tiles = None # Tile image drawn on each background cell
+        self.background_dirty = True
 
-        # Load tile images using asset_manager, unpack the tuple
-        grass_image, _ = asset_manager.load_image(config.GRASS_TILE)
-        dirt_image, _ = asset_manager.load_image(config.DIRT_TILE)
-        
-        # Work with the loaded images (surfaces)
-        self.grass_tile = grass_image 
-        self.dirt_tile = dirt_image
+        # Load tile images scaled to TILE_SIZE (cached by the asset_manager)
+        tile_dims = (self.tile_size, self.tile_size)
+        self.grass_tile = asset_manager.get_scaled_image(config.GRASS_TILE, tile_dims)
+        self.dirt_tile = asset_manager.get_scaled_image(config.DIRT_TILE, tile_dims)
 
         if not self.grass_tile:
             print("Warning: Grass tile failed to load, using fallback color.")
@@ -30,23 +92,14 @@ class GameMap:
             self.dirt_tile = pygame.Surface([self.tile_size, self.tile_size])
             self.dirt_tile.fill(config.COLOR_MAP.get("BROWN", (165,42,42))) # Use COLOR_MAP
 
-        # Ensure tiles are scaled to TILE_SIZE if needed
-        # Scale the surfaces directly
-        try:
-            self.grass_tile = pygame.transform.smoothscale(self.grass_tile, (self.tile_size, self.tile_size))
-            self.dirt_tile = pygame.transform.smoothscale(self.dirt_tile, (self.tile_size, self.tile_size))
-        except ValueError as e:
-            print(f"Error scaling map tiles: {e}")
-            # Handle error - maybe revert to unscaled or basic fallback?
-            # For now, the fallback surfaces above are already the right size.
-
         # Generate the initial path
         self.regenerate_path()
 
     def _generate_random_path(self):
         """Generates a list of (x,y) grid coordinates for a random path."""
+        path_rng = rng.streams.stream("map") # Seeded: same seed, same paths
         # Start at a random row in the first column, avoiding row 0
-        start_y = random.randint(1, self.grid_height - 2)
+        start_y = path_rng.randint(1, self.grid_height - 2)
         current_x, current_y = 0, start_y
         path_coords = [(current_x, current_y)] # Start the path list
         visited_coords = set(path_coords) # Keep track to avoid simple loops
@@ -63,7 +116,7 @@ class GameMap:
             # --- Find a valid next step (not revisiting immediately) ---
             next_x, next_y = -1, -1
             valid_moves_found = False
-            shuffled_moves = random.sample(possible_moves, len(possible_moves))
+            shuffled_moves = path_rng.sample(possible_moves, len(possible_moves))
 
             for move in shuffled_moves:
                 temp_x, temp_y = current_x, current_y
@@ -122,8 +175,7 @@ class GameMap:
                   # Don't need to call self.sell_tower as we are resetting the grid anyway
                   tower.kill()
                   # Play sound?
-                  sell_sound = tower.asset_manager.load_sound(config.SELL_SOUND)
-                  tower.asset_manager.play_sound(sell_sound)
+                  tower.asset_manager.play_sound(tower.asset_manager.get_sound_handle(config.SELL_SOUND))
 
         # Now apply the new path to the grid
         self.path_coords = new_path_coords
@@ -144,12 +196,10 @@ class GameMap:
                             # This should ideally not happen if auto-sell worked
                             print(f"Warning: Tower {tower.type_key} at ({tower.grid_x}, {tower.grid_y}) survived auto-sell but is on path.")
 
+        self.background_dirty = True
+
         # Convert grid path to pixel path
-        self.pixel_path = []
-        for x, y in self.path_coords:
-            pixel_x = x * self.tile_size + self.tile_size // 2
-            pixel_y = y * self.tile_size + self.tile_size // 2
-            self.pixel_path.append((pixel_x, pixel_y))
+        self.pixel_path = self._pixel_path_for(self.path_coords)
 
         if not self.pixel_path:
              print("Error: Regenerated path resulted in empty pixel path! Using fallback.")
@@ -163,6 +213,24 @@ class GameMap:
                        self.path_coords.append((x, fallback_y))
                        self.pixel_path.append((x * self.tile_size + self.tile_size // 2, fallback_y * self.tile_size + self.tile_size // 2))
 
+        # Enemies spawned from now on walk this by distance travelled
+        self.path_geometry = PathGeometry(self.pixel_path)
+
+    def _pixel_path_for(self, path_coords):
+        """Pixel centers of the tiles in path_coords."""
+        half = self.tile_size // 2
+        return [(x * self.tile_size + half, y * self.tile_size + half) for x, y in path_coords]
+
+    def restore_layout(self, grid, path_coords):
+        """Puts back a saved grid and path (see snapshot.py) without generating anything."""
+        self.grid = [list(row) for row in grid]
+        self.path_coords = [tuple(coord) for coord in path_coords]
+        pixel_path = self._pixel_path_for(self.path_coords)
+        if pixel_path != self.pixel_path:
+            self.pixel_path = pixel_path
+            self.path_geometry = PathGeometry(pixel_path)
+        self.background_dirty = True
+
     def get_path(self):
         return self.pixel_path
 
@@ -173,7 +241,7 @@ class GameMap:
 
     def place_tower(self, grid_x, grid_y):
         if self.is_buildable(grid_x, grid_y):
-            self.grid[grid_y][grid_x] = 2 # Mark as tower placed
+            self.grid[grid_y][grid_x] = 2 # Mark as tower placed (grass is still drawn under it, so the background stays)
             return True
         return False
 
@@ -189,19 +257,40 @@ class GameMap:
                   print(f"Map: Attempted to sell at ({grid_x}, {grid_y}), but no tower found (value={self.grid[grid_y][grid_x]}).")
         return False
 
-    def draw(self, surface):
+    def _tile_image(self, tile_type):
+        if tile_type == 0: # Path
+            return self.dirt_tile
+        return self.grass_tile # Buildable grass (or tower placed - draw grass underneath)
+
+    def _update_background(self):
+        """Brings the pre-rendered terrain in line with the grid, redrawing only tiles whose image changed."""
+        if self.background is None:
+            self.background = pygame.Surface((self.grid_width * self.tile_size, self.grid_height * self.tile_size))
+            if pygame.display.get_surface() is not None:
+                self.background = self.background.convert()
+            self.rendered_tiles = [[None] * self.grid_width for _ in range(self.grid_height)]
+
         for y in range(self.grid_height):
+            row = self.grid[y]
+            rendered_row = self.rendered_tiles[y]
             for x in range(self.grid_width):
-                tile_type = self.grid[y][x]
-                # Determine which tile image to draw
-                if tile_type == 0: # Path
-                    tile_image = self.dirt_tile
-                else: # Buildable grass (or tower placed - draw grass underneath)
-                    tile_image = self.grass_tile
-
-                # Blit the tile image
-                surface.blit(tile_image, (x * self.tile_size, y * self.tile_size))
-
-                # Optional: Draw grid lines over the tiles
-                # rect = pygame.Rect(x * self.tile_size, y * self.tile_size, self.tile_size, self.tile_size)
-                # pygame.draw.rect(surface, config.BLACK, rect, 1) 
\ No newline at end of file
+                tile_image = self._tile_image(row[x])
+                if rendered_row[x] is not tile_image:
+                    tile_rect = pygame.Rect(x * self.tile_size, y * self.tile_size, self.tile_size, self.tile_size)
+                    self.background.fill(config.BLACK, tile_rect) # Same backdrop as the cleared screen
+                    self.background.blit(tile_image, tile_rect)
+                    rendered_row[x] = tile_image
+
+                    # Optional: Draw grid lines over the tiles
+                    # pygame.draw.rect(self.background, config.BLACK, tile_rect, 1)
+        self.background_dirty = False
+
+    def draw(self, surface, area=None):
+        """Draws the terrain with a single blit of the pre-rendered background
+        (only the part inside `area` when given)."""
+        if self.background_dirty:
+            self._update_background()
+        if area is None:
+            surface.blit(self.background, (0, 0))
+        else:
+            surface.blit(self.background, area, area)
@@ -1,76 +1,200 @@
 # modifiers.py
-import pygame # For timing
+import heapq
+import itertools
+import pygame
+from collections import OrderedDict
+import config
+import sim_clock # For timing
+
+class TintCache:
+    """Tinted copies of sprite surfaces, keyed by (source surface, visual signature).
+
+    A signature is a tuple of (color, blend_flags) fills applied in order, so
+    stacked tints from several modifiers are one entry built in one pass.
+    Each slowed animation frame is built once and reused on later frames.
+    """
+    def __init__(self, max_entries=config.TINT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.variants = OrderedDict() # Least recently used first
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, surface, signature):
+        key = (surface, signature)
+        variant = self.variants.get(key)
+        if variant is not None:
+            self.variants.move_to_end(key)
+            self.hits += 1
+            return variant
+        self.misses += 1
+        # Copy once so the original (shared, cached) frame is never touched
+        variant = surface.copy()
+        for color, blend_flags in signature:
+            variant.fill(color, special_flags=blend_flags)
+        self.variants[key] = variant
+        if len(self.variants) > self.max_entries:
+            self.variants.popitem(last=False)
+        return variant
+
+    def clear(self):
+        self.variants.clear()
+
+
+# Shared by every entity drawing modifier visuals
+tint_cache = TintCache()
+
+def apply_modifier_visuals(surface, modifiers):
+    """Returns surface with the tints of every modifier in `modifiers` stacked on it."""
+    signature = tuple(mod.visual_signature for mod in modifiers if mod.visual_signature is not None)
+    if not signature:
+        return surface
+    return tint_cache.get(surface, signature)
 
 class Modifier:
-    """Base class for status effects applied to entities."""
+    """Base class for status effects applied to entities.
+
+    Modifiers are attached, refreshed and expired by the StatusEffectEngine
+    (status_effects); they only describe the effect. Stat changes are
+    declared, not applied: the engine folds every active modifier's
+    speed_multiplier into the target's speed whenever the set changes.
+    """
+    visual_signature = None # (color, blend_flags) tint drawn over the target, or None
+    speed_multiplier = 1.0 # Factor applied to the target's base_speed while active
     def __init__(self, duration=None):
-        self.duration = duration # None for permanent, > 0 for timed
-        self.start_time = pygame.time.get_ticks() if duration else None
         self.target = None # The entity this modifier is attached to
         self.is_expired = False
+        self._set_duration(duration)
+
+    def _set_duration(self, duration):
+        self.duration = duration # None for permanent, > 0 for timed
+        self.start_time = sim_clock.get_ticks() if duration else None
+        self.expire_ms = self.start_time + duration * 1000 if duration else None
+
+    def refresh(self, duration=None):
+        """Restarts the effect in place - same result as replacing it with a new one.
+           Subclasses taking extra arguments accept them here in __init__ order.
+        """
+        self._set_duration(duration)
 
     def apply(self, target):
-        """Apply the modifier's initial effect to the target."""
+        """Attach hook. Returns False if the effect can't apply to target."""
         self.target = target
-        # Subclasses implement specific stat changes here
-
-    def update(self, dt):
-        """Update modifier state, typically checking duration."""
-        if self.duration is not None and not self.is_expired:
-            if pygame.time.get_ticks() - self.start_time >= self.duration * 1000:
-                self.is_expired = True
-                self.remove()
+        return True
 
     def remove(self):
-        """Remove the modifier's effect from the target."""
-        # Subclasses implement specific stat restoration here
-        if self.target:
-            self.target.remove_modifier(self)
-            # print(f"Removing {self.__class__.__name__} from {self.target}") # Debug
+        """Ends the effect early."""
+        status_effects.detach(self)
 
     def apply_visuals(self, surface):
-        """Optionally implemented by subclasses to modify the target's drawing surface.
-           Should return the modified surface.
+        """Returns the target's drawing surface with this modifier's tint (cached).
+           Subclasses set visual_signature rather than overriding this.
         """
-        return surface # Default: no visual change
-
-    # Optional: Methods for stacking behavior if needed
+        if self.visual_signature is None:
+            return surface # Default: no visual change
+        return tint_cache.get(surface, (self.visual_signature,))
 
 class SlowModifier(Modifier):
     """Applies a speed reduction."""
+    # Blue tint: the add blend preserves alpha and adds color
+    visual_signature = ((0, 100, 200, 100), pygame.BLEND_RGBA_ADD)
     def __init__(self, slow_factor, duration):
         super().__init__(duration)
         self.slow_factor = slow_factor
-        self.original_speed = None
+
+    @property
+    def speed_multiplier(self):
+        return self.slow_factor
+
+    def refresh(self, slow_factor, duration):
+        self.slow_factor = slow_factor
+        super().refresh(duration)
 
     def apply(self, target):
         super().apply(target)
         if hasattr(target, 'speed') and hasattr(target, 'base_speed'):
-            # Store original speed only if not already slowed by this type?
-            # For simplicity now, always store base_speed
-            self.original_speed = target.base_speed
-            target.speed = target.base_speed * self.slow_factor
-            # print(f"Applied SlowModifier: Speed -> {target.speed}") # Debug
-        else:
-            print(f"Warning: Target {target} lacks 'speed' or 'base_speed' for SlowModifier.")
-            self.is_expired = True # Cannot apply, mark as expired
+            return True
+        print(f"Warning: Target {target} lacks 'speed' or 'base_speed' for SlowModifier.")
+        return False
 
-    def remove(self):
-        if self.target and hasattr(self.target, 'speed') and hasattr(self.target, 'base_speed'):
-            # Only restore speed if no other SlowModifiers are active?
-            # More complex logic needed for stacking/multiple sources.
-            # Simplest: Restore to base speed. If another slow is added,
-            # it will recalculate from base speed.
-            self.target.speed = self.target.base_speed
-            # print(f"Removed SlowModifier: Speed -> {self.target.speed}") # Debug
-        super().remove() # Call base remove to detach from target
+# --- Status effect engine ---
+class StatusEffectEngine:
+    """Attaches, refreshes and expires modifiers for every entity.
 
-    def apply_visuals(self, surface):
-        """Applies a blue tint to the surface."""
-        # Create a copy to avoid modifying the original cached image
-        tinted_surface = surface.copy()
-        # Fill with blue, special blend flag preserves alpha and adds color
-        tinted_surface.fill((0, 100, 200, 100), special_flags=pygame.BLEND_RGBA_ADD)
-        # Alternative: Use multiplication for a different tint effect
-        # tinted_surface.fill((128, 128, 255, 0), special_flags=pygame.BLEND_RGBA_MULT)
-        return tinted_surface 
\ No newline at end of file
+    A target holds at most one modifier per class; applying the same class
+    again refreshes the existing one in place instead of building a new one.
+    Timed modifiers sit in one min-heap of expiry times, so each tick only
+    pops the modifiers that actually run out - nothing is polled. A refresh
+    just pushes a new entry; the outdated one is skipped when it surfaces.
+    Effective stats are recomputed from the whole modifier set only when
+    that set changes (or a refresh changes a modifier's strength).
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forgets every scheduled expiry (new game)."""
+        self.expiry_heap = [] # (expire_ms, seq, modifier)
+        self._seq = itertools.count()
+        self.expired = 0
+        self.refreshed = 0
+
+    def apply(self, target, modifier_class, *args):
+        """Gives target a modifier_class(*args) effect, refreshing an existing one in place."""
+        for mod in target.modifiers:
+            if type(mod) is modifier_class:
+                multiplier = mod.speed_multiplier
+                mod.refresh(*args)
+                self.refreshed += 1
+                self._schedule(mod)
+                if mod.speed_multiplier != multiplier:
+                    self._recompute(target) # Same set of effects, but this one got stronger/weaker
+                return mod
+        return self.attach(target, modifier_class(*args))
+
+    def attach(self, target, modifier):
+        """Adds an already built modifier, replacing any of the same class."""
+        for mod in target.modifiers:
+            if type(mod) is type(modifier):
+                self.detach(mod)
+                break
+        if not modifier.apply(target):
+            modifier.is_expired = True
+            return modifier
+        target.modifiers.append(modifier)
+        self._schedule(modifier)
+        self._recompute(target)
+        return modifier
+
+    def detach(self, modifier):
+        """Removes modifier from its target and restores the target's stats."""
+        modifier.is_expired = True # Any heap entries left for it are now stale
+        target = modifier.target
+        if target is not None and modifier in target.modifiers:
+            target.modifiers.remove(modifier)
+            self._recompute(target)
+
+    def update(self, now_ms):
+        """Expires every modifier whose time is up at now_ms."""
+        heap = self.expiry_heap
+        while heap and heap[0][0] <= now_ms:
+            expire_ms, _, mod = heapq.heappop(heap)
+            if mod.is_expired or mod.expire_ms != expire_ms:
+                continue # Already removed, or refreshed since this entry was pushed
+            self.detach(mod)
+            self.expired += 1
+
+    def _schedule(self, modifier):
+        if modifier.expire_ms is not None:
+            heapq.heappush(self.expiry_heap, (modifier.expire_ms, next(self._seq), modifier))
+
+    def _recompute(self, target):
+        if not hasattr(target, 'base_speed'):
+            return
+        multiplier = 1.0
+        for mod in target.modifiers:
+            multiplier *= mod.speed_multiplier
+        target.speed = target.base_speed * multiplier
+
+
+# Owns every modifier in the running game
+status_effects = StatusEffectEngine()
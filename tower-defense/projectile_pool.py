@@ -0,0 +1,130 @@
+# projectile_pool.py
+import time
+import pygame
+
+class ProjectilePool:
+    """Reuses projectile instances per type instead of building one per shot.
+
+    The first projectile of each type is built normally; its scaled image is
+    then shared by every later instance of that type, so no shot re-reads
+    data, reloads or rescales images once the pool is warm.
+    """
+    def __init__(self, asset_manager, data_manager):
+        self.asset_manager = asset_manager
+        self.data_manager = data_manager
+        self.free = {} # type_key -> list of released projectiles
+        self.images = {} # type_key -> prebuilt scaled surface
+        # Stats
+        self.acquired = 0
+        self.reused = 0
+        self.allocated = 0
+        self.prewarmed = 0 # Of allocated, built up front by prewarm()
+        self._window_start = time.perf_counter()
+        self._window_allocated = 0
+
+    def acquire(self, type_key, start_pos, target_enemy):
+        """Returns a projectile of type_key aimed at target_enemy, reusing a released one if possible."""
+        self.acquired += 1
+        free_list = self.free.get(type_key)
+        if free_list:
+            self.reused += 1
+            projectile = free_list.pop()
+            projectile.reset(start_pos, target_enemy)
+            return projectile
+
+        ProjectileClass = self.data_manager.get_projectile_class(type_key)
+        if not ProjectileClass:
+            print(f"Error: Class not found for projectile type '{type_key}'")
+            return None
+        projectile = ProjectileClass(start_pos, target_enemy, type_key=type_key,
+                                     asset_manager=self.asset_manager, data_manager=self.data_manager,
+                                     image=self.images.get(type_key))
+        if type_key not in self.images and getattr(projectile, 'image', None) is not None:
+            self.images[type_key] = projectile.image
+        self.allocated += 1
+        self._window_allocated += 1
+        return projectile
+
+    def release(self, projectile):
+        """Takes back a projectile that left play."""
+        projectile.target = None # Don't keep dead enemies alive through the pool
+        self.free.setdefault(projectile.type_key, []).append(projectile)
+
+    def refresh_type(self, type_key):
+        """Picks up a hot-reloaded projectile record: new image for later shots, new stats for spares."""
+        self.images.pop(type_key, None)
+        for projectile in self.free.get(type_key, []):
+            projectile.refresh_from_record()
+
+    def prewarm(self, type_key, count):
+        """Allocates `count` spare projectiles of a type up front."""
+        acquired, reused, window_allocated = self.acquired, self.reused, self._window_allocated
+        spares = [self.acquire(type_key, (0, 0), None) for _ in range(count)]
+        for projectile in spares:
+            if projectile:
+                self.release(projectile)
+        # Warm-up isn't real demand - keep it out of the hit rate and the allocation rate
+        self.prewarmed += self._window_allocated - window_allocated
+        self.acquired, self.reused, self._window_allocated = acquired, reused, window_allocated
+
+    def stats(self):
+        """Pool health: hit rate over the whole run, allocations/sec since the last call."""
+        now = time.perf_counter()
+        elapsed = now - self._window_start
+        allocations_per_sec = self._window_allocated / elapsed if elapsed > 0 else 0.0
+        self._window_start = now
+        self._window_allocated = 0
+        return {
+            "acquired": self.acquired,
+            "reused": self.reused,
+            "allocated": self.allocated,
+            "prewarmed": self.prewarmed,
+            "hit_rate": self.reused / self.acquired if self.acquired else 0.0,
+            "allocations_per_sec": allocations_per_sec,
+            "free": {type_key: len(free_list) for type_key, free_list in self.free.items()},
+        }
+
+
+class ProjectileGroup(pygame.sprite.Group):
+    """Sprite group backed by a ProjectilePool.
+
+    spawn() takes projectiles from the pool; anything removed from the group
+    (hit, target lost, kill()) goes straight back to it. collect_hits()
+    finds this step's hits with one check per projectile.
+    """
+    def __init__(self, pool, *sprites):
+        self.pool = pool
+        super().__init__(*sprites)
+
+    def spawn(self, type_key, start_pos, target_enemy):
+        projectile = self.pool.acquire(type_key, start_pos, target_enemy)
+        if projectile:
+            self.add(projectile)
+        return projectile
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.pool.release(sprite)
+
+    def collect_hits(self, now_ms):
+        """Returns {enemy: [projectiles hitting it]} for this step, in projectile order.
+
+        A projectile can only hit its own target: homing ones once they touch
+        it, non-homing ones at their scheduled impact time (a shot whose
+        target has gone by then misses and is removed). Unlike the old
+        groupcollide pass, a shot never hits some other enemy that happens to
+        be in the way. Enemies are never scanned, so the cost scales with the
+        projectile count alone.
+        """
+        hits = {}
+        missed = []
+        for projectile in self.sprites():
+            if not projectile.homing and now_ms < projectile.impact_ms:
+                continue # Still in flight
+            if projectile.hits_target():
+                hits.setdefault(projectile.target, []).append(projectile)
+            elif not projectile.homing:
+                missed.append(projectile)
+        for projectile in missed:
+            projectile.kill()
+        return hits
@@ -0,0 +1,142 @@
+# recorder.py
+"""Recording of player actions, for replaying a game exactly (see replay.py).
+
+A recording is the game's seed and starting state, then one small record
+per event, appended (and flushed) as it happens:
+
+    place_tower / sell_tower / move_tower / click_tower   a player action and its tick
+    wave                                                  state checksum when a wave starts
+    end                                                   state checksum when recording stops
+
+Actions are logged by the PlayingState action methods, so mouse play and
+scripted headless play record the same way. With the seed fixing every
+random stream and the SimClock fixing time, those actions are all a
+replay needs; the checksums show where it stops matching.
+"""
+import struct
+from snapshot import state_checksum
+
+MAGIC = b"TDRECD"
+VERSION = 1
+
+HEADER = struct.Struct("<6sHqidd") # magic, version, seed, wave number, money, health
+RECORD = struct.Struct("<IB") # tick, record code
+CELL = struct.Struct("<hh") # grid x, grid y
+CHECKSUM = struct.Struct("<iI") # wave number, state checksum
+
+# Record codes. Action names are the matching HeadlessSimulation methods.
+PLACE_TOWER, SELL_TOWER, MOVE_TOWER, CLICK_TOWER, WAVE, END = range(1, 7)
+RECORD_NAMES = {PLACE_TOWER: "place_tower", SELL_TOWER: "sell_tower", MOVE_TOWER: "move_tower",
+                CLICK_TOWER: "click_tower", WAVE: "wave", END: "end"}
+
+class Recording:
+    """A parsed recording: starting conditions plus (tick, name, args) records in order."""
+    def __init__(self, seed, wave, money, health, records):
+        self.seed = seed
+        self.wave = wave # Wave number when recording started (the next wave is wave + 1)
+        self.money = money
+        self.health = health
+        self.records = records
+
+    @property
+    def actions(self):
+        return [record for record in self.records if record[1] not in ("wave", "end")]
+
+    @property
+    def end_tick(self):
+        return self.records[-1][0] if self.records else 0
+
+
+class ActionRecorder:
+    """Appends a game's player actions and per-wave checksums to a recording.
+
+    target is a file path or a binary file object. Must be attached before
+    the first simulation step, since a replay starts from a new game.
+    """
+    def __init__(self, target, game):
+        if game.sim_clock.tick != 0:
+            raise ValueError("Recording has to start before the first simulation step")
+        self.game = game
+        self._owns_file = isinstance(target, str)
+        self.file = open(target, "wb") if self._owns_file else target
+        self.last_wave = game.wave_manager.current_wave_number
+        self.file.write(HEADER.pack(MAGIC, VERSION, game.seed, self.last_wave,
+                                    game.player_money, game.player_health))
+        self.file.flush()
+        self.closed = False
+
+    def _write(self, code, payload=b""):
+        self.file.write(RECORD.pack(self.game.sim_clock.tick, code) + payload)
+        self.file.flush() # A crash still leaves every record before it
+
+    # --- Player Actions ---
+    def place_tower(self, tower_key, grid_x, grid_y):
+        key = tower_key.encode("utf-8")
+        self._write(PLACE_TOWER, bytes([len(key)]) + key + CELL.pack(grid_x, grid_y))
+
+    def sell_tower(self, grid_x, grid_y):
+        self._write(SELL_TOWER, CELL.pack(grid_x, grid_y))
+
+    def move_tower(self, grid_x, grid_y, new_grid_x, new_grid_y):
+        self._write(MOVE_TOWER, CELL.pack(grid_x, grid_y) + CELL.pack(new_grid_x, new_grid_y))
+
+    def click_tower(self, grid_x, grid_y):
+        self._write(CLICK_TOWER, CELL.pack(grid_x, grid_y))
+
+    # --- Checksums ---
+    def after_step(self):
+        """Called at the end of every simulation step; writes a checksum when a wave starts."""
+        wave = self.game.wave_manager.current_wave_number
+        if wave != self.last_wave:
+            self.last_wave = wave
+            self._write(WAVE, CHECKSUM.pack(wave, state_checksum(self.game)))
+
+    def close(self):
+        """Writes the final checksum and closes the file (a file object passed in is left open)."""
+        if self.closed:
+            return
+        self.closed = True
+        self._write(END, CHECKSUM.pack(self.game.wave_manager.current_wave_number, state_checksum(self.game)))
+        if self._owns_file:
+            self.file.close()
+
+
+def _as_number(value):
+    """Money/health come back as ints when they were saved as ints."""
+    return int(value) if value.is_integer() else value
+
+def parse_recording(data):
+    """bytes -> Recording."""
+    magic, version, seed, wave, money, health = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a game recording")
+    if version != VERSION:
+        raise ValueError(f"Unsupported recording version {version} (expected {VERSION})")
+    offset = HEADER.size
+    records = []
+    while offset + RECORD.size <= len(data):
+        tick, code = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        if code == PLACE_TOWER:
+            key_len = data[offset]
+            tower_key = data[offset + 1:offset + 1 + key_len].decode("utf-8")
+            offset += 1 + key_len
+            args = (tower_key,) + CELL.unpack_from(data, offset)
+            offset += CELL.size
+        elif code == MOVE_TOWER:
+            args = CELL.unpack_from(data, offset) + CELL.unpack_from(data, offset + CELL.size)
+            offset += 2 * CELL.size
+        elif code in (SELL_TOWER, CLICK_TOWER):
+            args = CELL.unpack_from(data, offset)
+            offset += CELL.size
+        elif code in (WAVE, END):
+            args = CHECKSUM.unpack_from(data, offset)
+            offset += CHECKSUM.size
+        else:
+            raise ValueError(f"Unknown record code {code} at byte {offset - RECORD.size}")
+        records.append((tick, RECORD_NAMES[code], args))
+    return Recording(seed, wave, _as_number(money), _as_number(health), records)
+
+def load_recording(filepath):
+    with open(filepath, "rb") as f:
+        return parse_recording(f.read())
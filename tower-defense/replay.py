@@ -0,0 +1,82 @@
+# replay.py
+"""Replays a recorded game headless, as fast as possible, and checks it matches.
+
+The recording's seed and starting state set up a new HeadlessSimulation,
+its actions are scheduled at their original ticks, and the replay records
+itself as it runs. Its records (actions that succeeded, plus the state
+checksum at each wave start and at the end) must equal the original's;
+the first one that doesn't is where the two games diverged.
+
+Record a game with `python main.py --record game.tdrec` (or headless.py
+--record), then:
+    python replay.py game.tdrec
+"""
+import argparse
+import io
+import sys
+import time
+from headless import HeadlessSimulation
+from recorder import load_recording, parse_recording
+
+def replay(recording, quiet=True):
+    """Replays a Recording (or a path to one).
+
+    Returns:
+        dict: ticks, waves checked, wall time, and the first mismatching
+            (original, replayed) record pair - None when the replay matched.
+    """
+    if isinstance(recording, str):
+        recording = load_recording(recording)
+    sim = HeadlessSimulation(starting_wave=recording.wave + 1, quiet=quiet, seed=recording.seed)
+    sim.game.player_money = recording.money
+    sim.game.player_health = recording.health
+    for tick, action_name, args in recording.actions:
+        sim.schedule(tick, action_name, *args)
+    replay_file = io.BytesIO()
+    recorder = sim.record(replay_file)
+
+    start = time.perf_counter()
+    end_tick = recording.end_tick
+    while sim.ticks < end_tick and sim.game.running:
+        sim.step()
+    sim._run_due_actions() # Actions logged on the last tick, after its step
+    recorder.close()
+    wall_ms = (time.perf_counter() - start) * 1000.0
+
+    replayed = parse_recording(replay_file.getvalue()).records
+    mismatch = None
+    for original, copy in zip(recording.records, replayed):
+        if original != copy:
+            mismatch = (original, copy)
+            break
+    if mismatch is None and len(recording.records) != len(replayed):
+        index = min(len(recording.records), len(replayed))
+        mismatch = (recording.records[index] if index < len(recording.records) else None,
+                    replayed[index] if index < len(replayed) else None)
+    return {
+        "ticks": sim.ticks,
+        "actions": len(recording.actions),
+        "waves_checked": sum(1 for record in recording.records if record[1] == "wave"),
+        "wall_ms": round(wall_ms, 1),
+        "mismatch": mismatch,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded game and check it against the original.")
+    parser.add_argument("recording", help="File written by main.py/headless.py --record")
+    parser.add_argument("--verbose", action="store_true", help="Show the game's own log output")
+    args = parser.parse_args()
+
+    result = replay(args.recording, quiet=not args.verbose)
+    print(f"Replayed {result['actions']} actions over {result['ticks']} ticks "
+          f"({result['waves_checked']} waves checked) in {result['wall_ms']} ms")
+    if result["mismatch"] is None:
+        print("OK: replay matches the recording")
+        return 0
+    original, replayed = result["mismatch"]
+    print(f"MISMATCH: recorded {original}, replayed {replayed}")
+    return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,45 @@
+# rng.py
+import random
+
+class RngStreams:
+    """Named random.Random streams, one per subsystem, all derived from one master seed.
+
+    Each stream is seeded from (master seed, name), so a subsystem gets the
+    same numbers for a given seed no matter how much randomness the others
+    use, or in what order they ask for it.
+    """
+    def __init__(self, seed=0):
+        self.streams = {} # name -> random.Random
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Reseeds every stream from a master seed (None picks a fresh one)."""
+        if seed is None:
+            seed = random.SystemRandom().randrange(2 ** 31)
+        self.seed = int(seed)
+        for name, stream in self.streams.items():
+            stream.seed(self._stream_seed(name))
+
+    def _stream_seed(self, name):
+        return f"{self.seed}:{name}" # String seeds are hashed with SHA-512: stable across runs
+
+    def stream(self, name):
+        """The random.Random for a subsystem (e.g. "map"), created on first use."""
+        stream = self.streams.get(name)
+        if stream is None:
+            stream = random.Random(self._stream_seed(name))
+            self.streams[name] = stream
+        return stream
+
+    def get_state(self):
+        """{name: random.Random state} of every stream."""
+        return {name: stream.getstate() for name, stream in self.streams.items()}
+
+    def set_state(self, seed, states):
+        """Restores the master seed and the streams saved by get_state()."""
+        self.reset(seed) # Streams not in states start over from the seed
+        for name, state in states.items():
+            self.stream(name).setstate(state)
+
+# --- Global Instance ---
+streams = RngStreams()
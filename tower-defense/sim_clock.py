@@ -0,0 +1,88 @@
+# sim_clock.py
+import time
+import config
+
+class SimClock:
+    """The one source of game time every subsystem reads from.
+
+    Time only moves in fixed steps of `step_dt` seconds, so the simulation
+    gives the same result whatever the frame rate, hitches or game speed.
+    Game.run feeds real frame time in with steps_for_frame(); headless runs
+    call step() directly.
+    """
+    def __init__(self, step_dt=1.0 / config.SIM_TICK_RATE):
+        self.step_dt = step_dt
+        self.speed = 1 # Multiplier, or None for "as fast as possible"
+        self.reset()
+
+    def reset(self, start_ms=0.0):
+        """Rewinds to start_ms and clears any pending frame time."""
+        self.time_ms = float(start_ms)
+        self.tick = 0
+        self.accumulator = 0.0
+
+    def get_ticks(self):
+        """Current game time in milliseconds."""
+        return self.time_ms
+
+    def advance(self, dt):
+        """Moves game time forward by dt seconds."""
+        self.time_ms += dt * 1000.0
+
+    def step(self):
+        """Advances exactly one fixed step. Returns the step length in seconds."""
+        self.advance(self.step_dt)
+        self.tick += 1
+        return self.step_dt
+
+    # --- Game Speed ---
+    def set_speed(self, speed):
+        """Sets the speed multiplier (1, 2, 4...) or None for unbounded."""
+        self.speed = speed
+        self.accumulator = 0.0
+
+    def cycle_speed(self):
+        """Switches to the next entry in config.GAME_SPEEDS."""
+        speeds = config.GAME_SPEEDS
+        index = speeds.index(self.speed) if self.speed in speeds else -1
+        self.set_speed(speeds[(index + 1) % len(speeds)])
+
+    def speed_label(self):
+        return "MAX" if self.speed is None else f"{self.speed}x"
+
+    # --- Fixed Timestep Loop ---
+    def steps_for_frame(self, frame_dt):
+        """Yields the step length once for every fixed step due this frame.
+
+        Bounded speeds accumulate frame_dt * speed of game time (capped at
+        config.MAX_FRAME_TIME so a hitch can't snowball). Unbounded speed
+        keeps stepping until the frame's real-time budget is used up, so
+        rendering still happens once per frame.
+        """
+        if self.speed is None:
+            deadline = time.perf_counter() + config.MAX_SPEED_FRAME_BUDGET
+            while time.perf_counter() < deadline:
+                yield self.step()
+            self.accumulator = 0.0
+            return
+
+        self.accumulator += min(frame_dt, config.MAX_FRAME_TIME) * self.speed
+        while self.accumulator >= self.step_dt:
+            self.accumulator -= self.step_dt
+            yield self.step()
+
+    @property
+    def alpha(self):
+        """How far real time is between the last step and the next one (0-1),
+        used to interpolate positions when drawing."""
+        if self.speed is None:
+            return 1.0
+        return min(1.0, self.accumulator / self.step_dt)
+
+
+# Shared by every subsystem (entities, modifiers, wave manager, game loop)
+clock = SimClock()
+
+def get_ticks():
+    """Current game time in milliseconds (drop-in for pygame.time.get_ticks)."""
+    return clock.get_ticks()
@@ -0,0 +1,353 @@
+# snapshot.py
+"""Compact binary snapshots of a running Game, and restoring them.
+
+A snapshot holds numbers only: clock, money, map grid and path, wave
+cursors, and the state of every tower, enemy (with its modifiers) and
+projectile. Type keys are stored once per snapshot as small name tables.
+Surfaces, sounds and stats are re-linked on restore from the enemy
+prototypes, projectile pool and scaled-image cache. A snapshot is a few
+KB and takes well under a millisecond.
+
+Restoring keeps group order, EnemyStore slots and spatial hash buckets, so
+the game then steps on exactly as the original would have. That covers
+rewinding to a wave start, saving to disk to resume later, and restoring
+the same snapshot repeatedly to fork simulations (see
+HeadlessSimulation.snapshot).
+
+Visual effects are not saved; a restore clears them.
+"""
+import math
+import struct
+import zlib
+import numpy as np
+from enemy_store import EnemyStore
+from map import PathGeometry
+from modifiers import SlowModifier, status_effects
+import rng
+
+MAGIC = b"TDSNAP"
+VERSION = 2 # 2: per-subsystem RNG streams instead of the global random state
+
+# Saveable modifier classes -> attributes passed to the constructor ahead of duration
+MODIFIER_ARGS = {
+    SlowModifier: ("slow_factor",),
+}
+MODIFIER_TYPES = list(MODIFIER_ARGS)
+MODIFIER_COLUMNS = 4 + max(len(args) for args in MODIFIER_ARGS.values()) # enemy, type, duration, start, args...
+
+ENEMY_COLUMNS = tuple(EnemyStore.FIELDS)
+RNG_STATE_WORDS = 625 # Mersenne Twister state: 624 words + position
+
+# --- Binary container ---
+def _pack(arrays):
+    """Named arrays -> bytes: header, then (name, dtype, shape, raw data) per array."""
+    parts = [struct.pack("<6sHI", MAGIC, VERSION, len(arrays))]
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        name_bytes = name.encode("ascii")
+        dtype_bytes = array.dtype.str.encode("ascii")
+        parts.append(struct.pack(f"<B{len(name_bytes)}sB{len(dtype_bytes)}sB", len(name_bytes), name_bytes,
+                                 len(dtype_bytes), dtype_bytes, array.ndim))
+        parts.append(struct.pack(f"<{array.ndim}I", *array.shape))
+        parts.append(array.tobytes())
+    return b"".join(parts)
+
+def _unpack(data):
+    magic, version, count = struct.unpack_from("<6sHI", data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a game snapshot")
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version} (expected {VERSION})")
+    offset = struct.calcsize("<6sHI")
+    arrays = {}
+    for _ in range(count):
+        name_len = data[offset]
+        name = data[offset + 1:offset + 1 + name_len].decode("ascii")
+        offset += 1 + name_len
+        dtype_len = data[offset]
+        dtype = np.dtype(data[offset + 1:offset + 1 + dtype_len].decode("ascii"))
+        offset += 1 + dtype_len
+        ndim = data[offset]
+        shape = struct.unpack_from(f"<{ndim}I", data, offset + 1)
+        offset += 1 + 4 * ndim
+        size = dtype.itemsize * math.prod(shape)
+        arrays[name] = np.frombuffer(data, dtype=dtype, count=math.prod(shape), offset=offset).reshape(shape)
+        offset += size
+    return arrays
+
+def _put_keys(arrays, name, keys):
+    """Stores type keys as codes into a name table (both numeric)."""
+    table = list(dict.fromkeys(keys))
+    code_of = {key: code for code, key in enumerate(table)}
+    arrays[name] = np.array([code_of[key] for key in keys], dtype=np.int16)
+    arrays[name + "_keys"] = np.frombuffer("\n".join(table).encode("utf-8"), dtype=np.uint8)
+
+def _get_keys(arrays, name):
+    table = arrays[name + "_keys"].tobytes().decode("utf-8").split("\n")
+    return [table[code] for code in arrays[name].tolist()]
+
+def _optional(value):
+    return float("nan") if value is None else value
+
+def _from_optional(value):
+    return None if math.isnan(value) else value
+
+def _as_number(value):
+    """Money/health come back as ints when they were saved as ints."""
+    return int(value) if value.is_integer() else value
+
+# --- Snapshot ---
+def take_snapshot(game, counters=None):
+    """Returns the game's simulation state as bytes.
+
+    counters: Optional {name: number} stored alongside (e.g. the headless
+        tick and waves-cleared counts); handed back by restore_snapshot.
+    """
+    arrays = {}
+    clock = game.sim_clock
+    wave_manager = game.wave_manager
+    arrays["game"] = np.array([game.player_money, game.player_health,
+                               clock.time_ms, clock.tick, clock.accumulator], dtype=np.float64)
+    arrays["waves"] = np.array([wave_manager.current_wave_number, wave_manager.wave_active,
+                                wave_manager.next_spawn_index, wave_manager.wave_start_time,
+                                wave_manager.total_enemies_in_wave, wave_manager.enemies_spawned_this_wave,
+                                wave_manager.between_waves_timer, wave_manager.waiting_for_next_wave], dtype=np.float64)
+    game_map = game.game_map
+    arrays["map_grid"] = np.array(game_map.grid, dtype=np.int8)
+    arrays["map_path"] = np.array(game_map.path_coords, dtype=np.int16).reshape(-1, 2)
+
+    # --- Enemies, in group order, with their store slots ---
+    enemies = game.enemies.sprites()
+    index_of = {enemy: i for i, enemy in enumerate(enemies)}
+    store = game.enemies.store
+    slots = np.array([enemy._slot for enemy in enemies], dtype=np.int64)
+    arrays["enemy_slots"] = slots
+    arrays["enemy_free_slots"] = np.array(store.free_slots, dtype=np.int64)
+    arrays["enemy_store_size"] = np.array([store.size], dtype=np.int64)
+    for name in ENEMY_COLUMNS:
+        arrays["enemy." + name] = store.columns[name][slots]
+    arrays["enemy.prev_x"] = store.prev_x[slots]
+    arrays["enemy.prev_y"] = store.prev_y[slots]
+    _put_keys(arrays, "enemy_type", [enemy.type_key for enemy in enemies])
+
+    geometries = list({id(enemy.path_geometry): enemy.path_geometry for enemy in enemies}.values())
+    path_of = {id(geometry): i for i, geometry in enumerate(geometries)}
+    arrays["enemy_path"] = np.array([path_of[id(enemy.path_geometry)] for enemy in enemies], dtype=np.int16)
+    arrays["path_lengths"] = np.array([len(geometry.points) for geometry in geometries], dtype=np.int32)
+    arrays["path_points"] = np.array([point for geometry in geometries for point in geometry.points],
+                                     dtype=np.float64).reshape(-1, 2)
+
+    modifier_rows = []
+    for i, enemy in enumerate(enemies):
+        for mod in enemy.modifiers:
+            args = [getattr(mod, name) for name in MODIFIER_ARGS[type(mod)]]
+            row = [i, MODIFIER_TYPES.index(type(mod)), _optional(mod.duration), _optional(mod.start_time)] + args
+            modifier_rows.append(row + [0.0] * (MODIFIER_COLUMNS - len(row)))
+    arrays["modifiers"] = np.array(modifier_rows, dtype=np.float64).reshape(-1, MODIFIER_COLUMNS)
+
+    # Bucket order decides the order query() yields enemies in, so keep it exactly
+    buckets = game.enemies.spatial_hash.buckets
+    arrays["hash_cells"] = np.array(list(buckets), dtype=np.int32).reshape(-1, 2)
+    arrays["hash_counts"] = np.array([len(bucket) for bucket in buckets.values()], dtype=np.int32)
+    arrays["hash_members"] = np.array([index_of[enemy] for bucket in buckets.values() for enemy in bucket],
+                                      dtype=np.int32)
+
+    # --- Towers ---
+    towers = game.towers.sprites()
+    _put_keys(arrays, "tower_type", [tower.type_key for tower in towers])
+    arrays["towers"] = np.array([[tower.grid_x, tower.grid_y, tower.last_shot_time, tower.last_move_time,
+                                  tower.is_animating, tower.current_animation_frame_index,
+                                  tower.last_animation_update, index_of.get(tower.target, -1)]
+                                 for tower in towers], dtype=np.float64).reshape(-1, 8)
+
+    # --- Projectiles (a target that already died is saved as none: same outcome) ---
+    projectiles = game.projectiles.sprites()
+    _put_keys(arrays, "projectile_type", [projectile.type_key for projectile in projectiles])
+    arrays["projectiles"] = np.array([[projectile.x, projectile.y, projectile.prev_x, projectile.prev_y,
+                                       index_of.get(projectile.target, -1),
+                                       _optional(getattr(projectile, "aim_x", None)),
+                                       _optional(getattr(projectile, "aim_y", None)),
+                                       _optional(getattr(projectile, "impact_ms", None))]
+                                      for projectile in projectiles], dtype=np.float64).reshape(-1, 8)
+
+    rng_states = rng.streams.get_state()
+    _put_keys(arrays, "rng_stream", list(rng_states))
+    arrays["rng_seed"] = np.array([rng.streams.seed], dtype=np.int64)
+    arrays["rng"] = np.array([state[1] for state in rng_states.values()], dtype=np.uint32).reshape(-1, RNG_STATE_WORDS)
+    arrays["rng_meta"] = np.array([[state[0], _optional(state[2])] for state in rng_states.values()],
+                                  dtype=np.float64).reshape(-1, 2)
+
+    counters = counters or {}
+    _put_keys(arrays, "counter", list(counters))
+    arrays["counter_values"] = np.array(list(counters.values()), dtype=np.float64)
+    return _pack(arrays)
+
+def restore_snapshot(game, data):
+    """Replaces the game's simulation state with a snapshot from take_snapshot.
+
+    Returns:
+        dict: The counters saved with the snapshot.
+    """
+    arrays = _unpack(data)
+    asset_manager, data_manager = game.asset_manager, game.data_manager
+
+    # A game that ended (e.g. lost) plays on from the snapshot; one saved after
+    # a defeat ends again on its next update
+    game.running = True
+
+    # Clear the current world (projectiles go back to the pool)
+    game.projectiles.empty()
+    game.effects.empty()
+    game.enemies.empty()
+    game.towers.empty()
+    status_effects.reset()
+
+    money, health, time_ms, tick, accumulator = arrays["game"].tolist()
+    game.player_money = _as_number(money)
+    game.player_health = _as_number(health)
+    clock = game.sim_clock
+    clock.time_ms, clock.tick, clock.accumulator = time_ms, int(tick), accumulator
+
+    game.game_map.restore_layout(arrays["map_grid"].tolist(), arrays["map_path"].tolist())
+
+    wave_manager = game.wave_manager
+    (wave_number, wave_active, next_spawn_index, wave_start_time, total_enemies, spawned,
+     between_waves_timer, waiting) = arrays["waves"].tolist()
+    wave_manager.current_wave_number = int(wave_number)
+    wave_manager.wave_active = bool(wave_active)
+    wave_manager.wave_data = wave_manager.waves_by_number.get(int(wave_number)) if wave_active else None
+    wave_manager.timeline = wave_manager.timelines.get(int(wave_number), []) if wave_active else []
+    wave_manager.next_spawn_index = int(next_spawn_index)
+    wave_manager.wave_start_time = wave_start_time
+    wave_manager.total_enemies_in_wave = int(total_enemies)
+    wave_manager.enemies_spawned_this_wave = int(spawned)
+    wave_manager.between_waves_timer = between_waves_timer
+    wave_manager.waiting_for_next_wave = bool(waiting)
+
+    # --- Enemies ---
+    geometries = []
+    points = arrays["path_points"].tolist()
+    start = 0
+    for length in arrays["path_lengths"].tolist():
+        path = [tuple(point) for point in points[start:start + length]]
+        start += length
+        # Usually the map's current path: share its geometry
+        geometries.append(game.game_map.path_geometry if path == game.game_map.path_geometry.points else PathGeometry(path))
+
+    enemy_group = game.enemies
+    store = enemy_group.store
+    columns = {name: arrays["enemy." + name].tolist() for name in ENEMY_COLUMNS}
+    path_ids = arrays["enemy_path"].tolist()
+    slots = arrays["enemy_slots"].tolist()
+    enemies = []
+    for i, type_key in enumerate(_get_keys(arrays, "enemy_type")):
+        EnemyClass = data_manager.get_enemy_class(type_key)
+        enemy = EnemyClass(geometries[path_ids[i]], type_key=type_key, asset_manager=asset_manager,
+                           data_manager=data_manager, prototype=game.enemy_prototypes.get(type_key))
+        for name in ENEMY_COLUMNS:
+            setattr(enemy, name, columns[name][i])
+        frames = enemy.animation_frames
+        if frames:
+            enemy.image = frames[enemy.current_frame_index]
+        enemy.rect = enemy.image.get_rect()
+        enemy.rect.center = (enemy.x, enemy.y)
+        enemy_group.add_at(enemy, slots[i])
+        enemies.append(enemy)
+    if enemies:
+        # Freed slots above the highest live one still count towards the table size
+        store.size = max(store.size, int(arrays["enemy_store_size"][0]))
+        while store.size > store.capacity:
+            store._grow()
+        store.free_slots = arrays["enemy_free_slots"].tolist()
+    store.prev_x[arrays["enemy_slots"]] = arrays["enemy.prev_x"]
+    store.prev_y[arrays["enemy_slots"]] = arrays["enemy.prev_y"]
+
+    # add_at inserted the enemies in group order, which is what nearest() breaks ties by;
+    # only the buckets are rebuilt
+    spatial_hash = enemy_group.spatial_hash
+    spatial_hash.buckets.clear()
+    spatial_hash.sprite_cells.clear()
+    members = arrays["hash_members"].tolist()
+    start = 0
+    for cell, count in zip(arrays["hash_cells"].tolist(), arrays["hash_counts"].tolist()):
+        cell = tuple(cell)
+        bucket = spatial_hash.buckets[cell] = {}
+        for index in members[start:start + count]:
+            bucket[enemies[index]] = None
+            spatial_hash.sprite_cells[enemies[index]] = cell
+        start += count
+
+    for row in arrays["modifiers"].tolist():
+        ModifierClass = MODIFIER_TYPES[int(row[1])]
+        duration, start_time = _from_optional(row[2]), _from_optional(row[3])
+        args = row[4:4 + len(MODIFIER_ARGS[ModifierClass])]
+        mod = ModifierClass(*args, duration)
+        mod.start_time = start_time
+        mod.expire_ms = start_time + duration * 1000 if duration else None
+        status_effects.attach(enemies[int(row[0])], mod)
+
+    # --- Towers ---
+    for type_key, row in zip(_get_keys(arrays, "tower_type"), arrays["towers"].tolist()):
+        TowerClass = data_manager.get_tower_class(type_key)
+        tower = TowerClass(int(row[0]), int(row[1]), asset_manager=asset_manager, data_manager=data_manager)
+        tower.last_shot_time, tower.last_move_time = row[2], row[3]
+        tower.is_animating = bool(row[4])
+        tower.current_animation_frame_index = int(row[5])
+        tower.last_animation_update = row[6]
+        tower.target = enemies[int(row[7])] if row[7] >= 0 else None
+        if tower.is_animating:
+            tower.image = tower.click_animation_frames[tower.current_animation_frame_index]
+        game.towers.add(tower)
+
+    # --- Projectiles ---
+    for type_key, row in zip(_get_keys(arrays, "projectile_type"), arrays["projectiles"].tolist()):
+        x, y, prev_x, prev_y, target, aim_x, aim_y, impact_ms = row
+        target_enemy = enemies[int(target)] if target >= 0 else None
+        projectile = game.projectiles.spawn(type_key, (x, y), target_enemy)
+        if projectile is None:
+            continue
+        projectile.prev_x, projectile.prev_y = prev_x, prev_y
+        if not math.isnan(impact_ms):
+            projectile.aim_x, projectile.aim_y, projectile.impact_ms = aim_x, aim_y, impact_ms
+
+    rng_states = {}
+    for name, internal, (rng_version, rng_gauss) in zip(_get_keys(arrays, "rng_stream"), arrays["rng"].tolist(),
+                                                        arrays["rng_meta"].tolist()):
+        rng_states[name] = (int(rng_version), tuple(internal), _from_optional(rng_gauss))
+    rng.streams.set_state(int(arrays["rng_seed"][0]), rng_states)
+
+    # Nothing on screen matches any more
+    state = game.get_current_state()
+    if state is not None:
+        if getattr(state, "dirty_renderer", None):
+            state.dirty_renderer.invalidate()
+        if hasattr(state, "selected_tower_for_move"):
+            state.selected_tower_for_move = None
+
+    return dict(zip(_get_keys(arrays, "counter"), arrays["counter_values"].tolist()))
+
+def state_checksum(game):
+    """CRC32 of the simulation state, for checking that two runs match.
+
+    Leaves out the clock's frame-time accumulator, which depends on real
+    frame pacing rather than on what happened in the game.
+    """
+    arrays = _unpack(take_snapshot(game))
+    checksum = 0
+    for name, array in arrays.items():
+        if name == "game":
+            array = array.copy()
+            array[4] = 0.0 # accumulator
+        checksum = zlib.crc32(name.encode("ascii"), checksum)
+        checksum = zlib.crc32(np.ascontiguousarray(array).tobytes(), checksum)
+    return checksum
+
+def save_snapshot(game, filepath, counters=None):
+    """Writes a snapshot of the game to filepath (save/resume)."""
+    with open(filepath, "wb") as f:
+        f.write(take_snapshot(game, counters))
+
+def load_snapshot(game, filepath):
+    """Restores the game from a file written by save_snapshot. Returns its counters."""
+    with open(filepath, "rb") as f:
+        return restore_snapshot(game, f.read())
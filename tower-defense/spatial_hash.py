@@ -0,0 +1,154 @@
+# spatial_hash.py
+import itertools
+import pygame
+import config
+
+class SpatialHash:
+    """Uniform grid of buckets for fast "what is near this point" queries.
+
+    Cells are `cell_size` pixels square (one map tile by default). Each sprite
+    lives in exactly one bucket, chosen from its center point.
+
+    Every sprite also keeps the sequence number it was inserted with (moves
+    don't change it), so nearest() can break distance ties the way a linear
+    `<=` scan over a sprite group does: the sprite added last wins.
+    """
+    def __init__(self, cell_size=config.TILE_SIZE):
+        self.cell_size = cell_size
+        self.buckets = {} # (cell_x, cell_y) -> {sprite: None}, dict keeps insertion order
+        self.sprite_cells = {} # sprite -> (cell_x, cell_y)
+        self.sprite_order = {} # sprite -> insertion sequence number
+        self._order = itertools.count()
+
+    def _cell_for(self, x, y):
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def insert(self, sprite, x, y):
+        self.sprite_order[sprite] = next(self._order)
+        self._add_to_bucket(sprite, self._cell_for(x, y))
+
+    def remove(self, sprite):
+        cell = self.sprite_cells.pop(sprite, None)
+        if cell is None:
+            return
+        del self.sprite_order[sprite]
+        self._remove_from_bucket(sprite, cell)
+
+    def move(self, sprite, x, y):
+        """Updates a sprite's bucket. Cheap when it stays inside the same cell."""
+        cell = self._cell_for(x, y)
+        old_cell = self.sprite_cells.get(sprite)
+        if cell == old_cell:
+            return
+        if old_cell is None:
+            self.insert(sprite, x, y)
+            return
+        self._remove_from_bucket(sprite, old_cell)
+        self._add_to_bucket(sprite, cell)
+
+    def _add_to_bucket(self, sprite, cell):
+        self.sprite_cells[sprite] = cell
+        bucket = self.buckets.get(cell)
+        if bucket is None:
+            bucket = self.buckets[cell] = {}
+        bucket[sprite] = None
+
+    def _remove_from_bucket(self, sprite, cell):
+        bucket = self.buckets[cell]
+        del bucket[sprite]
+        if not bucket:
+            del self.buckets[cell]
+
+    def clear(self):
+        self.buckets.clear()
+        self.sprite_cells.clear()
+        self.sprite_order.clear()
+
+    def query(self, x, y, radius):
+        """Yields sprites in every bucket the circle's bounding box overlaps.
+        Callers still need to do the exact distance check, and must not add or
+        remove sprites while iterating."""
+        min_cx, min_cy = self._cell_for(x - radius, y - radius)
+        max_cx, max_cy = self._cell_for(x + radius, y + radius)
+        buckets = self.buckets
+        # Few occupied buckets (e.g. a huge range) - scanning them beats walking empty cells
+        if len(buckets) < (max_cx - min_cx + 1) * (max_cy - min_cy + 1):
+            for (cx, cy), bucket in buckets.items():
+                if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy:
+                    yield from bucket
+            return
+        for cy in range(min_cy, max_cy + 1):
+            for cx in range(min_cx, max_cx + 1):
+                bucket = buckets.get((cx, cy))
+                if bucket:
+                    yield from bucket
+
+    def nearest(self, x, y, radius):
+        """Returns the closest sprite whose center is within radius, or None.
+
+        Walks rings of cells outwards from the query point and stops as soon as
+        no unvisited ring can hold anything as close as the best match so far.
+        Ties go to the sprite inserted last, matching a linear scan that keeps
+        the last sprite with dist_sq <= the best so far (BaseTower.find_target).
+        """
+        nearest_sprite = None
+        nearest_order = -1
+        min_dist_sq = radius * radius
+        buckets = self.buckets
+        sprite_order = self.sprite_order
+        if not buckets:
+            return None
+        center_cx, center_cy = self._cell_for(x, y)
+        max_ring = int(radius // self.cell_size) + 1
+        for ring in range(max_ring + 1):
+            for cx, cy in self._ring_cells(center_cx, center_cy, ring):
+                bucket = buckets.get((cx, cy))
+                if not bucket:
+                    continue
+                for sprite in bucket:
+                    dx = x - sprite.rect.centerx
+                    dy = y - sprite.rect.centery
+                    dist_sq = dx * dx + dy * dy
+                    if dist_sq < min_dist_sq or (dist_sq == min_dist_sq and sprite_order[sprite] > nearest_order):
+                        min_dist_sq = dist_sq
+                        nearest_sprite = sprite
+                        nearest_order = sprite_order[sprite]
+            # Everything in ring+1 is at least ring * cell_size away (and could still tie at exactly that)
+            reach = ring * self.cell_size
+            if nearest_sprite is not None and min_dist_sq < reach * reach:
+                break
+        return nearest_sprite
+
+    @staticmethod
+    def _ring_cells(center_cx, center_cy, ring):
+        """Cells at Chebyshev distance `ring` from the center cell."""
+        if ring == 0:
+            yield (center_cx, center_cy)
+            return
+        top, bottom = center_cy - ring, center_cy + ring
+        for cx in range(center_cx - ring, center_cx + ring + 1):
+            yield (cx, top)
+            yield (cx, bottom)
+        left, right = center_cx - ring, center_cx + ring
+        for cy in range(top + 1, bottom):
+            yield (left, cy)
+            yield (right, cy)
+
+
+class SpatialHashGroup(pygame.sprite.Group):
+    """Sprite group that keeps every member indexed in a SpatialHash.
+
+    Membership is tracked automatically; whoever moves the sprites must call
+    spatial_hash.move afterwards (see EnemyGroup.update).
+    """
+    def __init__(self, *sprites, cell_size=config.TILE_SIZE):
+        self.spatial_hash = SpatialHash(cell_size)
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite)
+        self.spatial_hash.insert(sprite, sprite.rect.centerx, sprite.rect.centery)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.spatial_hash.remove(sprite)
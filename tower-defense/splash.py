@@ -0,0 +1,102 @@
+# splash.py
+import numpy as np
+from modifiers import SlowModifier, status_effects
+
+class SplashImpact:
+    """One queued area-of-effect impact (Cannon blast, Ice shatter, ...)."""
+    def __init__(self, pos, radius, damage=0, primary_target=None, slow_factor=None, slow_duration=0):
+        self.pos = pos
+        self.radius = radius
+        self.damage = damage # Splash damage per enemy in range
+        self.primary_target = primary_target # Excluded from splash damage (already took the direct hit)
+        self.slow_factor = slow_factor # None when the impact doesn't slow
+        self.slow_duration = slow_duration
+
+
+class SplashBatch:
+    """Collects splash impacts during collision handling and resolves them together.
+
+    All impacts are measured against every enemy center in one NumPy distance
+    matrix. Impacts are still applied in the order they were queued, so an
+    enemy killed by one blast is skipped by the next, exactly as the old
+    per-hit loops behaved.
+    """
+    def __init__(self):
+        self.impacts = []
+
+    def queue_damage(self, pos, radius, damage, primary_target):
+        """Splash damage to every enemy in radius except the primary target."""
+        self.impacts.append(SplashImpact(pos, radius, damage=damage, primary_target=primary_target))
+
+    def queue_slow(self, pos, radius, slow_factor, slow_duration):
+        """Slow every enemy in radius (the primary target included)."""
+        self.impacts.append(SplashImpact(pos, radius, slow_factor=slow_factor, slow_duration=slow_duration))
+
+    def touches(self, enemy):
+        """True if a pending damaging impact reaches this enemy.
+
+        Used to settle the batch before a direct hit lands on an enemy that a
+        queued blast would have damaged first.
+        """
+        cx, cy = enemy.rect.center
+        for impact in self.impacts:
+            if impact.damage and enemy is not impact.primary_target:
+                dx = impact.pos[0] - cx
+                dy = impact.pos[1] - cy
+                if dx * dx + dy * dy <= impact.radius * impact.radius:
+                    return True
+        return False
+
+    def resolve(self, enemies_group):
+        """Applies every queued impact to enemies_group, then clears the queue."""
+        impacts = self.impacts
+        if not impacts:
+            return
+        self.impacts = []
+        enemies = enemies_group.sprites()
+        if not enemies:
+            return
+
+        # Distance matrix: one row per impact, one column per enemy
+        centers = np.array([enemy.rect.center for enemy in enemies], dtype=np.float64)
+        impact_pos = np.array([impact.pos for impact in impacts], dtype=np.float64)
+        radii = np.array([impact.radius for impact in impacts], dtype=np.float64)
+        offsets = centers[np.newaxis, :, :] - impact_pos[:, np.newaxis, :]
+        dist_sq = np.einsum('ijk,ijk->ij', offsets, offsets)
+        in_range = dist_sq <= (radii * radii)[:, np.newaxis]
+
+        index_of = {enemy: i for i, enemy in enumerate(enemies)}
+        store = getattr(enemies_group, 'store', None)
+        if store is not None:
+            slots = np.array([enemy._slot for enemy in enemies], dtype=np.int64)
+            health = store.columns["health"][slots]
+        else:
+            health = np.array([enemy.health for enemy in enemies])
+        damages = [impact.damage for impact in impacts if impact.damage]
+        if damages:
+            health = health.astype(np.result_type(health, np.array(damages)))
+        alive = np.ones(len(enemies), dtype=bool)
+        damaged = np.zeros(len(enemies), dtype=bool)
+
+        for row, impact in enumerate(impacts):
+            hits = in_range[row] & alive
+            if impact.damage:
+                primary_index = index_of.get(impact.primary_target)
+                if primary_index is not None:
+                    hits[primary_index] = False
+                health[hits] -= impact.damage
+                damaged |= hits
+                alive &= health > 0
+            if impact.slow_factor is not None:
+                for i in np.flatnonzero(hits):
+                    status_effects.apply(enemies[i], SlowModifier, impact.slow_factor, impact.slow_duration)
+
+        # Write damage back in bulk and remove anything that died
+        damaged_rows = np.flatnonzero(damaged)
+        if store is not None:
+            store.columns["health"][slots[damaged_rows]] = health[damaged_rows]
+        else:
+            for i in damaged_rows:
+                enemies[i].health = health[i].item()
+        for i in np.flatnonzero(damaged & ~alive):
+            enemies[i].kill()
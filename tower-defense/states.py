@@ -5,7 +5,11 @@ import config
 # Need imports for entities, modifiers used in the logic moved here
 from entities import Enemy, Tower, Projectile, CannonTower, CannonProjectile, BaseProjectile, Effect, IceProjectile
 from modifiers import SlowModifier
+from splash import SplashBatch
+from dirty_rects import DirtyRectRenderer
+import sim_clock
 import math
+import time
 
 class GameState:
     """Base class for different game states (e.g., Menu, Playing, GameOver)."""
@@ -20,8 +24,12 @@ class GameState:
         """Update game logic for this state."""
         raise NotImplementedError
 
-    def draw(self, screen):
-        """Draw elements specific to this state."""
+    def draw(self, screen, alpha=1.0):
+        """Draw elements specific to this state.
+
+        alpha (0-1) is how far real time is between the last simulation step
+        and the next, for interpolating moving sprites.
+        """
         raise NotImplementedError
 
     def enter_state(self):
@@ -35,12 +43,26 @@ class GameState:
 
 class PlayingState(GameState):
     """The main state where the core tower defense gameplay happens."""
+    # Number keys pick a game speed directly (4 = as fast as possible)
+    SPEED_KEYS = {pygame.K_1: 1, pygame.K_2: 2, pygame.K_3: 4, pygame.K_4: None}
+
     def __init__(self, game):
         super().__init__(game)
         self.selected_tower_for_move = None
         self.original_drag_pos = None
         self.original_grid_pos = None
         self.drag_offset = (0, 0)
+        # Splash impacts queued during collision handling, resolved together
+        self.splash_batch = SplashBatch()
+        # UI sounds, resolved once
+        asset_manager = game.asset_manager
+        self.place_sound = asset_manager.get_sound_handle(config.TOWER_PLACE_SOUND, priority=config.SOUND_PRIORITY_HIGH)
+        self.sell_sound = asset_manager.get_sound_handle(config.SELL_SOUND, priority=config.SOUND_PRIORITY_HIGH)
+        self.error_sound = asset_manager.get_sound_handle(config.ERROR_SOUND, priority=config.SOUND_PRIORITY_HIGH)
+        # Optional partial-redraw renderer (None = redraw and flip the whole frame)
+        self.dirty_renderer = None
+        if config.DIRTY_RECT_RENDERING:
+            self.dirty_renderer = DirtyRectRenderer(pygame.Rect(0, 0, config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
 
     def enter_state(self):
         """Called when entering the playing state."""
@@ -53,9 +75,17 @@ class PlayingState(GameState):
     def handle_events(self, events):
         mouse_pos = pygame.mouse.get_pos()
         for event in events:
+            if event.type == pygame.WINDOWEXPOSED and self.dirty_renderer:
+                 self.dirty_renderer.invalidate() # Window contents may be gone
             if event.type == pygame.KEYDOWN:
                  if event.key == pygame.K_ESCAPE:
                       self.game.running = False
+                 elif event.key == pygame.K_f: # Cycle game speed
+                      self.game.sim_clock.cycle_speed()
+                      print(f"Game speed: {self.game.sim_clock.speed_label()}")
+                 elif event.key in self.SPEED_KEYS:
+                      self.game.sim_clock.set_speed(self.SPEED_KEYS[event.key])
+                      print(f"Game speed: {self.game.sim_clock.speed_label()}")
 
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1: # Left click
@@ -71,7 +101,7 @@ class PlayingState(GameState):
                             clicked_on_tower = tower
                             # Handle Gold Mine click
                             if hasattr(tower, 'on_click'):
-                                if tower.on_click(self):
+                                if self.click_tower(tower):
                                     tower_clicked_handled = True
                             # Handle initiating a move IF cooldown is ready
                             elif tower.can_move(): # Check if tower is movable
@@ -109,40 +139,14 @@ class PlayingState(GameState):
                            new_grid_x = mouse_pos[0] // config.TILE_SIZE
                            new_grid_y = mouse_pos[1] // config.TILE_SIZE
                            is_same_cell = (new_grid_x == self.original_grid_pos[0] and new_grid_y == self.original_grid_pos[1])
-                           is_valid_placement = self.game.game_map.is_buildable(new_grid_x, new_grid_y)
-
-                           # Allow dropping back in same cell or onto a buildable cell
-                           if is_same_cell or is_valid_placement:
-                                # If moved to a NEW valid cell
-                                if not is_same_cell:
-                                     # Free up old grid cell
-                                     self.game.game_map.sell_tower(self.original_grid_pos[0], self.original_grid_pos[1])
-                                     # Occupy new grid cell
-                                     self.game.game_map.place_tower(new_grid_x, new_grid_y)
-                                     # Update tower's internal grid position
-                                     tower.grid_x = new_grid_x
-                                     tower.grid_y = new_grid_y
-                                     # Snap visual position to new grid center
-                                     tower.x = new_grid_x * config.TILE_SIZE + config.TILE_SIZE // 2
-                                     tower.y = new_grid_y * config.TILE_SIZE + config.TILE_SIZE // 2
-                                     tower.rect.center = (tower.x, tower.y)
-                                     # Reset cooldown AFTER successful move
-                                     tower.reset_move_cooldown()
-                                     print(f"Moved tower {tower.type_key} to ({new_grid_x}, {new_grid_y})")
-                                     # Play move/place sound?
-                                     place_sound = self.game.asset_manager.load_sound(config.TOWER_PLACE_SOUND)
-                                     self.game.asset_manager.play_sound(place_sound)
-                                else:
-                                     # Snapped back to original position (same cell click/drop)
-                                     tower.rect.center = self.original_drag_pos
-                           else:
+
+                           if is_same_cell:
+                                # Snapped back to original position (same cell click/drop)
+                                tower.rect.center = self.original_drag_pos
+                           elif not self.move_tower(tower, new_grid_x, new_grid_y):
                                 # Invalid drop location, snap back
-                                print(f"Invalid move location ({new_grid_x}, {new_grid_y}), snapping back.")
                                 tower.rect.center = self.original_drag_pos
-                                # Play error sound?
-                                error_sound = self.game.asset_manager.load_sound(config.ERROR_SOUND)
-                                self.game.asset_manager.play_sound(error_sound)
-                           
+
                            # Clear dragging state regardless of success
                            self.selected_tower_for_move = None
                            self.original_drag_pos = None
@@ -150,95 +154,151 @@ class PlayingState(GameState):
                            self.drag_offset = (0, 0)
 
     def _handle_place_tower(self, mouse_pos):
-        """Logic for placing a tower (moved from Game class)."""
+        """Places the tower type selected in the UI at the clicked cell."""
         grid_x, grid_y = mouse_pos[0] // config.TILE_SIZE, mouse_pos[1] // config.TILE_SIZE
         selected_tower_key = self.game.ui_panel.get_selected_tower_key()
 
         if selected_tower_key:
-            selected_data = self.game.data_manager.get_tower_data(selected_tower_key)
-            if selected_data:
-                tower_cost = selected_data.get("cost", 9999)
-                if self.game.player_money >= tower_cost:
-                    if self.game.game_map.place_tower(grid_x, grid_y):
-                        TowerClass = self.game.data_manager.get_tower_class(selected_tower_key)
-                        if TowerClass:
-                            tower = TowerClass(grid_x, grid_y, asset_manager=self.game.asset_manager, data_manager=self.game.data_manager)
-                            self.game.towers.add(tower)
-                            self.game.player_money -= tower.cost
-                            place_sound = self.game.asset_manager.load_sound(config.TOWER_PLACE_SOUND)
-                            self.game.asset_manager.play_sound(place_sound)
-                        else:
-                            print(f"Error: Class not found for key '{selected_tower_key}'")
-                    else:
-                        print("Cannot place tower here.")
-                        error_sound = self.game.asset_manager.load_sound(config.ERROR_SOUND)
-                        self.game.asset_manager.play_sound(error_sound)
-                else:
-                    print("Not enough money!")
-                    error_sound = self.game.asset_manager.load_sound(config.ERROR_SOUND)
-                    self.game.asset_manager.play_sound(error_sound)
-            else:
-                print(f"Error: No data found for selected tower '{selected_tower_key}'")
+            self.place_tower(selected_tower_key, grid_x, grid_y)
         else:
             print("No tower type selected in UI.")
 
     def _handle_sell_tower(self, mouse_pos):
         """Handles selling a tower at the clicked position."""
         grid_x, grid_y = mouse_pos[0] // config.TILE_SIZE, mouse_pos[1] // config.TILE_SIZE
-        
-        tower_to_sell = None
+        self.sell_tower(grid_x, grid_y)
+
+    # --- Player Actions ---
+    # Grid-based entry points shared by mouse input and scripted (headless) play.
+    def place_tower(self, tower_key, grid_x, grid_y):
+        """Buys and places a tower. Returns the new tower, or None if it couldn't be placed."""
+        record = self.game.data_manager.get_tower_record(tower_key)
+        if not record:
+            print(f"Error: No data found for selected tower '{tower_key}'")
+            return None
+
+        if self.game.player_money < record.cost:
+            print("Not enough money!")
+            self.game.asset_manager.play_sound(self.error_sound)
+            return None
+
+        if not self.game.game_map.place_tower(grid_x, grid_y):
+            print("Cannot place tower here.")
+            self.game.asset_manager.play_sound(self.error_sound)
+            return None
+
+        TowerClass = self.game.data_manager.get_tower_class(tower_key)
+        if not TowerClass:
+            print(f"Error: Class not found for key '{tower_key}'")
+            return None
+
+        tower = TowerClass(grid_x, grid_y, asset_manager=self.game.asset_manager, data_manager=self.game.data_manager)
+        self.game.towers.add(tower)
+        self.game.player_money -= tower.cost
+        self.game.asset_manager.play_sound(self.place_sound)
+        if self.game.recorder:
+            self.game.recorder.place_tower(tower_key, grid_x, grid_y)
+        return tower
+
+    def sell_tower(self, grid_x, grid_y):
+        """Sells the tower on a cell for a partial refund. Returns True if one was sold."""
+        tower_to_sell = self.get_tower_at(grid_x, grid_y)
+        if not tower_to_sell:
+             print(f"No tower found at ({grid_x}, {grid_y}) to sell.")
+             return False
+
+        # Check if tower can be sold (e.g. Gold Mine might be unsellable later)
+        if not hasattr(tower_to_sell, 'cost'): # Check if it has a cost attribute
+             print(f"Cannot sell tower type {tower_to_sell.type_key} (no cost defined).")
+             return False
+
+        refund_amount = int(tower_to_sell.cost * config.SELL_REFUND_RATIO)
+        # Update map first to make cell buildable
+        if not self.game.game_map.sell_tower(grid_x, grid_y):
+             print(f"Error: Failed to update map for selling tower at ({grid_x}, {grid_y})")
+             return False
+
+        # Remove tower from group
+        tower_to_sell.kill()
+        # Add refund
+        self.game.player_money += refund_amount
+        print(f"Sold {tower_to_sell.type_key} for {refund_amount} gold.")
+        # Play sound
+        self.game.asset_manager.play_sound(self.sell_sound)
+        if self.game.recorder:
+            self.game.recorder.sell_tower(grid_x, grid_y)
+        return True
+
+    def move_tower(self, tower, new_grid_x, new_grid_y):
+        """Moves a tower to a new buildable cell and restarts its move cooldown.
+        Returns True if the tower moved."""
+        if not self.game.game_map.is_buildable(new_grid_x, new_grid_y):
+             print(f"Invalid move location ({new_grid_x}, {new_grid_y}), snapping back.")
+             self.game.asset_manager.play_sound(self.error_sound)
+             return False
+
+        old_grid_x, old_grid_y = tower.grid_x, tower.grid_y
+        # Free up old grid cell
+        self.game.game_map.sell_tower(old_grid_x, old_grid_y)
+        # Occupy new grid cell
+        self.game.game_map.place_tower(new_grid_x, new_grid_y)
+        # Update tower's internal grid position
+        tower.grid_x = new_grid_x
+        tower.grid_y = new_grid_y
+        # Snap visual position to new grid center
+        tower.x = new_grid_x * config.TILE_SIZE + config.TILE_SIZE // 2
+        tower.y = new_grid_y * config.TILE_SIZE + config.TILE_SIZE // 2
+        tower.rect.center = (tower.x, tower.y)
+        # Reset cooldown AFTER successful move
+        tower.reset_move_cooldown()
+        print(f"Moved tower {tower.type_key} to ({new_grid_x}, {new_grid_y})")
+        self.game.asset_manager.play_sound(self.place_sound)
+        if self.game.recorder:
+            self.game.recorder.move_tower(old_grid_x, old_grid_y, new_grid_x, new_grid_y)
+        return True
+
+    def click_tower(self, tower):
+        """Runs a tower's click action (e.g. Gold Mine collection). Returns True if handled."""
+        if hasattr(tower, 'on_click') and tower.on_click(self):
+            if self.game.recorder:
+                self.game.recorder.click_tower(tower.grid_x, tower.grid_y)
+            return True
+        return False
+
+    def get_tower_at(self, grid_x, grid_y):
         for tower in self.game.towers:
             if tower.grid_x == grid_x and tower.grid_y == grid_y:
-                tower_to_sell = tower
-                break
-        
-        if tower_to_sell:
-            # Check if tower can be sold (e.g. Gold Mine might be unsellable later)
-            if hasattr(tower_to_sell, 'cost'): # Check if it has a cost attribute
-                 refund_amount = int(tower_to_sell.cost * config.SELL_REFUND_RATIO)
-                 # Update map first to make cell buildable
-                 if self.game.game_map.sell_tower(grid_x, grid_y):
-                      # Remove tower from group
-                      tower_to_sell.kill() 
-                      # Add refund
-                      self.game.player_money += refund_amount
-                      print(f"Sold {tower_to_sell.type_key} for {refund_amount} gold.")
-                      # Play sound
-                      sell_sound = self.game.asset_manager.load_sound(config.SELL_SOUND)
-                      self.game.asset_manager.play_sound(sell_sound)
-                 else:
-                      print(f"Error: Failed to update map for selling tower at ({grid_x}, {grid_y})")
-            else:
-                 print(f"Cannot sell tower type {tower_to_sell.type_key} (no cost defined).")
-        else:
-             print(f"No tower found at ({grid_x}, {grid_y}) to sell.")
+                return tower
+        return None
 
     def update(self, dt):
         """Update game logic (moved from Game class)."""
+        profiler = self.game.profiler
+        start = time.perf_counter()
         # Update Managers
         self.game.wave_manager.update(dt, self.game.game_map, self.game.enemies)
+        start = profiler.add("update_waves", start)
 
-        # Update Entities
-        enemies_reached_end = []
-        for enemy in self.game.enemies:
-            if enemy.update(dt):
-                enemies_reached_end.append(enemy)
-                self.game.player_health -= 1
+        # Update Entities (all enemies move in one vectorized step)
+        enemies_reached_end = self.game.enemies.update(dt)
+        self.game.player_health -= len(enemies_reached_end)
 
         # Remove enemies that reached the end
         for enemy in enemies_reached_end:
-            enemy_data = self.game.data_manager.get_enemy_data(enemy.type_key)
-            if enemy_data and enemy_data.get("reach_end_sound"):
-                reach_sound = self.game.asset_manager.load_sound(enemy_data["reach_end_sound"])
-                self.game.asset_manager.play_sound(reach_sound)
+            self.game.asset_manager.play_sound(enemy.reach_end_sound)
             self.game.enemies.remove(enemy)
+        start = profiler.add("update_enemies", start)
 
         self.game.towers.update(dt, self.game.enemies, self.game.projectiles)
+        start = profiler.add("update_towers", start)
         self.game.projectiles.update(dt, self.game.enemies)
+        start = profiler.add("update_projectiles", start)
         self.game.effects.update(dt)
+        start = profiler.add("update_effects", start)
 
         # --- Projectile Collision Handling ---
         self._handle_collisions()
+        profiler.add("collisions", start)
 
         # Check Game Over state change
         if self.game.player_health <= 0:
@@ -262,17 +322,22 @@ class PlayingState(GameState):
             self.game.game_map.regenerate_path(self.game.towers, self)
             self.game.wave_manager.end_wave()
 
+        if self.game.recorder:
+            self.game.recorder.after_step() # Checksums the state when a wave starts
+
     def _handle_collisions(self):
-        """Handles collisions (moved from Game class)."""
-        enemy_hits = pygame.sprite.groupcollide(self.game.enemies, self.game.projectiles, False, False)
+        """Applies this step's projectile hits (each projectile only ever hits its own target)."""
+        enemy_hits = self.game.projectiles.collect_hits(sim_clock.get_ticks())
         projectiles_to_kill = []
+        splash_batch = self.splash_batch
         for enemy, projectiles_hit in enemy_hits.items():
+            # Settle queued splash first if it reaches this enemy, so hits land in order
+            if splash_batch.touches(enemy):
+                splash_batch.resolve(self.game.enemies)
             if not enemy.alive(): continue
             for projectile in projectiles_hit:
-                if projectile in projectiles_to_kill: continue
-
                 # Delegate hit handling and get result
-                should_kill, reward = projectile.on_hit(enemy, self.game.enemies, self.game.effects)
+                should_kill, reward = projectile.on_hit(enemy, self.game.enemies, self.game.effects, splash_batch)
 
                 # Award money immediately if returned
                 if reward > 0:
@@ -288,18 +353,41 @@ class PlayingState(GameState):
         for projectile in projectiles_to_kill:
             projectile.kill()
 
-    def draw(self, screen):
-        """Draw game elements for the playing state."""
+        # Resolve all remaining splash damage/slows in one vectorized pass
+        splash_batch.resolve(self.game.enemies)
+
+    def draw(self, screen, alpha=1.0):
+        """Draw game elements for the playing state.
+
+        Returns the changed screen rects when dirty-rect rendering is on
+        (None means the whole screen was redrawn).
+        """
+        profiler = self.game.profiler
+        start = time.perf_counter()
+        if self.dirty_renderer:
+            if self.game.game_map.background_dirty:
+                self.dirty_renderer.invalidate() # Terrain changed under everything
+            items = self._draw_items(screen, alpha)
+            start = profiler.add("draw_items", start)
+            dirty_rects = self.dirty_renderer.render(screen, items, self._restore_background)
+            profiler.add("draw_dirty", start)
+            return dirty_rects
+
         # Background / Map
         screen.fill(config.BLACK)
         self.game.game_map.draw(screen)
+        start = profiler.add("draw_map", start)
 
-        # Entities
+        # Entities (moving ones interpolated between simulation steps)
         self.game.towers.draw(screen)
-        for enemy in self.game.enemies:
-            enemy.draw(screen)
-        self.game.projectiles.draw(screen)
+        start = profiler.add("draw_towers", start)
+        self.game.enemies.draw_interpolated(screen, alpha)
+        start = profiler.add("draw_enemies", start)
+        for projectile in self.game.projectiles:
+            projectile.draw(screen, alpha)
+        start = profiler.add("draw_projectiles", start)
         self.game.effects.draw(screen)
+        start = profiler.add("draw_effects", start)
 
         # Draw UI
         self.game.ui_panel.draw(
@@ -309,5 +397,47 @@ class PlayingState(GameState):
             self.game.wave_manager.current_wave_number,
             self.game.wave_manager.is_wave_active(),
             self.game.wave_manager.waiting_for_next_wave,
-            self.game.wave_manager.between_waves_timer
-        )
\ No newline at end of file
+            self.game.wave_manager.between_waves_timer,
+            game_speed=self.game.sim_clock.speed_label()
+        )
+        profiler.add("draw_ui", start)
+
+    def _restore_background(self, screen, rect=None):
+        """Repaints the cleared screen and map under rect (everything when rect is None)."""
+        screen.fill(config.BLACK, rect)
+        self.game.game_map.draw(screen, rect)
+
+    def _draw_items(self, screen, alpha):
+        """The same frame draw() paints, as DirtyRectRenderer items in painter's order.
+
+        Each key captures everything that changes how the item looks, so an
+        unchanged key means its pixels on screen are still correct.
+        """
+        items = []
+        for tower in self.game.towers:
+            rect = tower.rect.copy()
+            items.append(((tower, tuple(rect), tower.image), (rect,), screen.blit, (tower.image, rect)))
+        for enemy, center in self.game.enemies.interpolated_centers(alpha):
+            bounds = enemy.draw_bounds(center)
+            tints = tuple(mod.visual_signature for mod in enemy.modifiers)
+            key = (enemy, tuple(bounds), enemy.image, tints, enemy.health)
+            items.append((key, (bounds,), enemy.draw, (screen, center)))
+        for projectile in self.game.projectiles:
+            rect = projectile.draw_rect(alpha).copy()
+            items.append(((projectile, tuple(rect), projectile.image), (rect,), screen.blit, (projectile.image, rect)))
+        for effect in self.game.effects:
+            rect = effect.rect.copy()
+            items.append(((effect, tuple(rect), effect.image), (rect,), screen.blit, (effect.image, rect)))
+
+        # UI last (on top), one item per independently changing region
+        ui_panel = self.game.ui_panel
+        wave_manager = self.game.wave_manager
+        health = self.game.player_health
+        items.append((("buttons", ui_panel.selected_tower_key), (ui_panel.rect,), ui_panel.draw_buttons, (screen,)))
+        status_args = (screen, health, self.game.player_money, wave_manager.current_wave_number,
+                       self.game.sim_clock.speed_label())
+        items.append((("status",) + status_args[1:], (ui_panel.status_bar_rect,), ui_panel.draw_status_bar, status_args))
+        if wave_manager.waiting_for_next_wave and health > 0:
+            timer = wave_manager.between_waves_timer
+            items.append((("wave_timer", f"{timer:.1f}"), (ui_panel.wave_timer_rect,), ui_panel.draw_wave_timer, (screen, timer)))
+        return items
@@ -0,0 +1,76 @@
+# tests/test_atlas.py
+import os
+import random
+import pytest
+import atlas
+import config
+from atlas import TextureAtlas, pack
+
+def _overlaps(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+def test_pack_places_every_rect_without_overlap():
+    rng = random.Random(1)
+    sizes = {index: (rng.randint(4, 200), rng.randint(4, 200)) for index in range(120)}
+    padding = 2
+    placements, sheet_sizes, too_big = pack(sizes, sheet_size=512, padding=padding)
+    assert not too_big
+    assert set(placements) == set(sizes)
+    assert len(sheet_sizes) > 1
+
+    by_sheet = {}
+    for key, (sheet, x, y) in placements.items():
+        width, height = sizes[key]
+        sheet_width, sheet_height = sheet_sizes[sheet]
+        assert x >= padding and y >= padding
+        assert x + width + padding <= sheet_width and y + height + padding <= sheet_height
+        # Padded rects must not overlap either, or filtering would bleed between neighbours
+        by_sheet.setdefault(sheet, []).append((x - padding, y - padding, width + padding * 2, height + padding * 2))
+    for rects in by_sheet.values():
+        for index, rect in enumerate(rects):
+            for other in rects[index + 1:]:
+                assert not _overlaps(rect, other)
+
+def test_pack_reports_rects_too_big_for_a_sheet():
+    placements, sheet_sizes, too_big = pack({"big": (300, 10), "small": (10, 10)}, sheet_size=256, padding=1)
+    assert too_big == ["big"]
+    assert set(placements) == {"small"}
+    assert sheet_sizes == [(16, 16)]
+
+def _manifest(filename):
+    return {"version": atlas.MANIFEST_VERSION, "padding": 1, "sheets": [{"file": "atlas_0.png", "size": [64, 64]}],
+            "sprites": [{"file": filename, "size": [8, 8], "sheet": 0, "rect": [1, 1, 8, 8],
+                         "source_stamp": atlas.source_stamp(filename), "source_crc32": atlas.source_checksum(filename)}]}
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "ASSET_DIR", str(tmp_path))
+    filepath = tmp_path / "tile.png"
+    filepath.write_bytes(b"original")
+    return filepath
+
+def _bump_mtime(filepath):
+    stat = os.stat(filepath)
+    os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+def test_startup_only_stats_the_sources(source, monkeypatch):
+    manifest = _manifest("tile.png")
+    def no_reads(filename):
+        raise AssertionError("read a source file at startup")
+    monkeypatch.setattr(atlas, "source_checksum", no_reads)
+    assert ("tile.png", (8, 8)) in TextureAtlas(manifest, "").entries
+
+def test_same_size_edit_is_stale(source):
+    manifest = _manifest("tile.png")
+    source.write_bytes(b"replaced") # Same length as before
+    _bump_mtime(source)
+    assert not TextureAtlas(manifest, "").entries
+    assert atlas.verify_atlas(manifest) == ["tile.png"]
+
+def test_touched_but_unchanged_source_only_costs_speed(source):
+    manifest = _manifest("tile.png")
+    _bump_mtime(source)
+    assert not TextureAtlas(manifest, "").entries # Loaded from its own file, to be safe
+    assert atlas.verify_atlas(manifest) == [] # ...though --verify can tell nothing really changed
@@ -0,0 +1,70 @@
+# tests/test_enemy_store.py
+import random
+import pytest
+from enemy_store import EnemyGroup
+from headless import HeadlessSimulation
+from map import PathGeometry
+from modifiers import SlowModifier, status_effects
+
+@pytest.fixture
+def game():
+    return HeadlessSimulation(starting_wave=1, seed=11).game
+
+def _spawn(game, geometry, type_key):
+    EnemyClass = game.data_manager.get_enemy_class(type_key)
+    return EnemyClass(geometry, type_key=type_key, asset_manager=game.asset_manager,
+                      data_manager=game.data_manager, prototype=game.enemy_prototypes.get(type_key))
+
+def test_vectorized_step_matches_per_enemy_movement(game):
+    rng = random.Random(2)
+    paths = [game.game_map.path_geometry,
+             PathGeometry([(16, 16), (16, 300), (16, 300), (400, 300), (400, 40)])] # Repeated waypoint too
+    group = EnemyGroup()
+    expected = {} # enemy -> (path, distance) walked one enemy at a time
+    dt = game.sim_clock.step_dt
+    finished = 0
+    for tick in range(2400):
+        if tick % 7 == 0 and tick < 1500: # A mixed wave trickling in, reusing freed slots
+            geometry = rng.choice(paths)
+            enemy = _spawn(game, geometry, rng.choice(["Goblin", "Ogre", "Runner", "Brute", "Dragon"]))
+            group.add(enemy)
+            expected[enemy] = [geometry, 0.0]
+            if rng.random() < 0.3:
+                status_effects.apply(enemy, SlowModifier, 0.5, 1000.0) # Outlasts the test
+        game.sim_clock.step()
+        reached = set(group.update(dt))
+
+        for enemy, walked in list(expected.items()):
+            geometry = walked[0]
+            walked[1] += enemy.speed * dt
+            x, y = geometry.position_at(walked[1])
+            assert (enemy.x, enemy.y) == (x, y)
+            assert enemy.path_index == geometry.segment_at(min(walked[1], geometry.length))
+            assert (enemy in reached) == (walked[1] >= geometry.length)
+            if enemy in reached:
+                enemy.kill()
+                del expected[enemy]
+                finished += 1
+    assert finished > 50 and group.store.count == len(expected)
+
+def test_health_is_a_float_column(game):
+    group = EnemyGroup()
+    enemy = _spawn(game, game.game_map.path_geometry, "Goblin")
+    group.add(enemy)
+    enemy.take_damage(10)
+    assert enemy.health == game.data_manager.get_enemy_record("Goblin").health - 10
+    assert isinstance(enemy.health, float)
+    enemy.kill() # Detached enemies keep the value they had in the store
+    assert isinstance(enemy.health, float)
+
+def test_step_past_a_waypoint_carries_round_the_corner(game):
+    group = EnemyGroup()
+    enemy = _spawn(game, PathGeometry([(0, 0), (100, 0), (100, 100)]), "Goblin")
+    group.add(enemy)
+    enemy.distance = 95.0
+    enemy.speed = 10.0
+    group.update(1.0)
+    # 5 px to the corner, the other 5 down the next segment - not snapped to (100, 0)
+    assert (enemy.x, enemy.y) == (100.0, 5.0)
+    assert enemy.path_index == 1
+    assert enemy.rect.center == (100, 5)
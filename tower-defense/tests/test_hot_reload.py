@@ -0,0 +1,58 @@
+# tests/test_hot_reload.py
+import json
+import os
+import shutil
+import pytest
+from headless import HeadlessSimulation
+
+@pytest.fixture
+def game(tmp_path):
+    sim = HeadlessSimulation(starting_wave=1, seed=3)
+    data_manager = sim.game.data_manager
+    shutil.copytree(data_manager.data_dir, tmp_path, dirs_exist_ok=True)
+    data_manager.data_dir = str(tmp_path)
+    data_manager.mtimes = {kind: data_manager._mtime(kind) for kind in data_manager.mtimes}
+    return sim.game
+
+def _edit(game, filename, edit):
+    filepath = os.path.join(game.data_manager.data_dir, filename)
+    with open(filepath) as f:
+        data = json.load(f)
+    edit(data)
+    with open(filepath, "w") as f:
+        json.dump(data, f)
+    _touch(filepath)
+
+def _touch(filepath):
+    stat = os.stat(filepath) # Make sure the mtime moves even on coarse-grained filesystems
+    os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+def _poll(game):
+    game.data_manager.last_poll = float("-inf")
+    return game.data_manager.poll_changes(game.asset_manager)
+
+def test_valid_edit_is_reloaded(game):
+    _edit(game, "towers.json", lambda data: data["Cannon"].__setitem__("range", 321))
+    changes = _poll(game)
+    assert list(changes) == ["towers"] and "Cannon" in changes["towers"]
+    assert game.data_manager.get_tower_record("Cannon").range == 321
+
+def test_invalid_edit_keeps_previous_data(game, capsys):
+    record = game.data_manager.get_tower_record("Cannon")
+    range_before = record.range
+    _edit(game, "towers.json", lambda data: data["Cannon"].__setitem__("range", "far"))
+    assert _poll(game) == {}
+    assert "Keeping the previous towers.json" in capsys.readouterr().out
+    assert game.data_manager.get_tower_record("Cannon") is record
+    assert record.range == range_before
+    assert _poll(game) == {} # Not retried until the file changes again
+
+def test_malformed_json_keeps_previous_waves(game, capsys):
+    wave_records = game.data_manager.wave_records
+    filepath = os.path.join(game.data_manager.data_dir, "waves.json")
+    with open(filepath, "w") as f:
+        f.write("[{")
+    _touch(filepath)
+    assert _poll(game) == {}
+    assert "Keeping the previous waves.json" in capsys.readouterr().out
+    assert game.data_manager.wave_records is wave_records
@@ -0,0 +1,16 @@
+# tests/test_map.py
+from headless import HeadlessSimulation
+
+def test_placing_and_selling_leave_the_background_clean():
+    game = HeadlessSimulation(starting_wave=1, seed=8).game
+    game_map = game.game_map
+    game_map._update_background()
+    cell = next((x, y) for y in range(game_map.grid_height) for x in range(game_map.grid_width)
+                if game_map.is_buildable(x, y))
+    assert game_map.place_tower(*cell)
+    assert not game_map.background_dirty # Grass is drawn under towers either way
+    assert game_map.sell_tower(*cell)
+    assert not game_map.background_dirty
+
+    game_map.regenerate_path(game.towers, game.get_current_state())
+    assert game_map.background_dirty
@@ -0,0 +1,56 @@
+# tests/test_modifiers.py
+import pytest
+import sim_clock
+from modifiers import SlowModifier, StatusEffectEngine
+
+class Target:
+    def __init__(self):
+        self.base_speed = 100.0
+        self.speed = 100.0
+        self.modifiers = []
+
+@pytest.fixture
+def engine():
+    sim_clock.clock.reset()
+    yield StatusEffectEngine()
+    sim_clock.clock.reset()
+
+def test_refresh_replaces_in_place_and_pushes_back_expiry(engine):
+    target = Target()
+    slow = engine.apply(target, SlowModifier, 0.5, 1.0)
+    assert target.speed == 50.0
+
+    sim_clock.clock.advance(0.8)
+    assert engine.apply(target, SlowModifier, 0.5, 1.0) is slow
+    assert engine.refreshed == 1
+    assert target.modifiers == [slow]
+
+    engine.update(1000.0) # The original expiry time - its heap entry is stale now
+    assert slow in target.modifiers and engine.expired == 0
+    engine.update(1800.0)
+    assert target.modifiers == [] and engine.expired == 1
+    assert target.speed == 100.0
+
+def test_refresh_with_new_strength_recomputes_speed(engine):
+    target = Target()
+    engine.apply(target, SlowModifier, 0.5, 1.0)
+    engine.apply(target, SlowModifier, 0.25, 1.0)
+    assert target.speed == 25.0
+
+def test_expiry_follows_expire_time(engine):
+    late, early = Target(), Target()
+    engine.apply(late, SlowModifier, 0.5, 2.0)
+    engine.apply(early, SlowModifier, 0.5, 1.0)
+    engine.update(1000.0)
+    assert early.modifiers == [] and early.speed == 100.0
+    assert len(late.modifiers) == 1 and late.speed == 50.0
+    engine.update(2000.0)
+    assert late.modifiers == [] and engine.expired == 2
+
+def test_removed_modifier_is_not_expired_again(engine):
+    target = Target()
+    slow = engine.apply(target, SlowModifier, 0.5, 1.0)
+    slow.remove()
+    engine.update(1000.0)
+    assert engine.expired == 0
+    assert target.speed == 100.0
@@ -0,0 +1,76 @@
+# tests/test_projectiles.py
+import pytest
+from headless import HeadlessSimulation
+
+@pytest.fixture
+def sim():
+    return HeadlessSimulation(starting_wave=1, seed=6)
+
+def _enemy(game, pos, health=50):
+    EnemyClass = game.data_manager.get_enemy_class("Goblin")
+    enemy = EnemyClass(game.game_map.path_geometry, type_key="Goblin", asset_manager=game.asset_manager,
+                       data_manager=game.data_manager, prototype=game.enemy_prototypes.get("Goblin"))
+    enemy.x, enemy.y = pos
+    enemy.rect.center = pos
+    enemy.health = health
+    game.enemies.add(enemy)
+    return enemy
+
+def _fire(game, start, target, homing=True):
+    """A CoinShot (100 damage, pays the bounty on a kill) from start at target."""
+    projectile = game.projectiles.spawn("CoinShot", start, target)
+    if not homing:
+        projectile.homing = False
+        projectile._schedule_impact()
+    return projectile
+
+def _step(sim):
+    """Moves the projectiles one step and resolves hits, like PlayingState.update (enemies stay put)."""
+    game = sim.game
+    dt = game.sim_clock.step()
+    game.projectiles.update(dt, game.enemies)
+    game.get_current_state()._handle_collisions()
+
+def test_homing_hit_kills_and_pays_bounty(sim):
+    game = sim.game
+    target = _enemy(game, (300, 300))
+    projectile = _fire(game, (100, 300), target)
+    money = game.player_money
+    for _ in range(120):
+        _step(sim)
+        if not target.alive():
+            break
+    assert not target.alive()
+    assert game.player_money == money + target.reward
+    assert not projectile.alive() # Returned to the pool
+    assert len(game.projectiles) == 0
+
+def test_non_homing_shot_lands_at_its_impact_time(sim):
+    game = sim.game
+    target = _enemy(game, (300, 300))
+    projectile = _fire(game, (100, 300), target, homing=False)
+    impact_ms = projectile.impact_ms
+    money = game.player_money
+    while game.sim_clock.get_ticks() + game.sim_clock.step_dt * 1000.0 < impact_ms:
+        _step(sim)
+        assert target.alive() and target.health == 50 # No hit before the scheduled impact
+    _step(sim)
+    assert game.sim_clock.get_ticks() >= impact_ms
+    assert not target.alive()
+    assert game.player_money == money + target.reward
+    assert not projectile.alive()
+
+def test_non_homing_shot_misses_a_target_that_moved(sim):
+    game = sim.game
+    target = _enemy(game, (300, 300))
+    projectile = _fire(game, (100, 300), target, homing=False)
+    target.rect.center = (300, 500) # Walked off after the shot was aimed
+    bystander = _enemy(game, (300, 300)) # Now standing on the aim point
+    money = game.player_money
+    while projectile.alive():
+        _step(sim)
+    assert game.sim_clock.get_ticks() >= projectile.impact_ms
+    # Only the projectile's own target can be hit: no damage, kill or bounty for anyone
+    assert target.alive() and target.health == 50
+    assert bystander.alive() and bystander.health == 50
+    assert game.player_money == money
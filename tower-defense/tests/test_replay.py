@@ -0,0 +1,32 @@
+# tests/test_replay.py
+import io
+from headless import HeadlessSimulation
+from recorder import parse_recording
+from replay import replay
+
+def _record(seed):
+    sim = HeadlessSimulation(starting_wave=1, seed=seed)
+    sim.game.player_money = 3000
+    recording_file = io.BytesIO()
+    recorder = sim.record(recording_file)
+    path = set(sim.game.game_map.path_coords)
+    cells = [(x, y) for x in range(2, 12) for y in range(1, 12) if (x, y) not in path]
+    for index, tower_key in enumerate(["Cannon", "Ice", "Basic", "GoldMine"]):
+        sim.schedule(index * 30, "place_tower", tower_key, *cells[index])
+    sim.schedule(1500, "click_tower", *cells[3])
+    sim.schedule(2000, "sell_tower", *cells[0])
+    sim.run(max_waves=2)
+    recorder.close()
+    return parse_recording(recording_file.getvalue())
+
+def test_replay_matches_recording():
+    recording = _record(seed=42)
+    assert any(record[1] == "wave" for record in recording.records)
+    result = replay(recording)
+    assert result["mismatch"] is None
+    assert result["actions"] == len(recording.actions)
+
+def test_replay_detects_divergence():
+    recording = _record(seed=42)
+    recording.seed += 1 # Different map paths
+    assert replay(recording)["mismatch"] is not None
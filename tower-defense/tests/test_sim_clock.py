@@ -0,0 +1,65 @@
+# tests/test_sim_clock.py
+import pytest
+import config
+import sim_clock
+from sim_clock import SimClock
+
+STEP = 0.0625 # Exactly representable, so step counts don't depend on rounding
+
+def _steps(clock, frame_dt):
+    return len(list(clock.steps_for_frame(frame_dt)))
+
+@pytest.mark.parametrize("speed, expected", [(1, 2), (2, 4), (4, 8)])
+def test_steps_scale_with_speed(speed, expected):
+    clock = SimClock(step_dt=STEP)
+    clock.set_speed(speed)
+    assert _steps(clock, 0.125) == expected
+    assert clock.tick == expected
+    assert clock.get_ticks() == expected * STEP * 1000.0
+    assert clock.accumulator == 0.0
+
+def test_remainder_carries_over_to_the_next_frame():
+    clock = SimClock(step_dt=STEP)
+    assert _steps(clock, 0.03125) == 0
+    assert clock.alpha == 0.5
+    assert _steps(clock, 0.09375) == 2 # 0.03125 carried + 0.09375
+    assert clock.accumulator == 0.0
+    assert _steps(clock, 0.09375) == 1
+    assert clock.alpha == 0.5
+    assert clock.tick == 3
+
+def test_long_frame_is_capped(monkeypatch):
+    monkeypatch.setattr(config, "MAX_FRAME_TIME", 0.125)
+    clock = SimClock(step_dt=STEP)
+    assert _steps(clock, 10.0) == 2
+    clock.set_speed(4)
+    assert _steps(clock, 10.0) == 8 # The cap is on real time, before the multiplier
+
+def test_set_speed_drops_pending_time():
+    clock = SimClock(step_dt=STEP)
+    _steps(clock, 0.05)
+    clock.set_speed(2)
+    assert clock.accumulator == 0.0
+    assert clock.alpha == 0.0
+
+def test_cycle_speed_walks_game_speeds():
+    clock = SimClock(step_dt=STEP)
+    seen = []
+    for _ in config.GAME_SPEEDS:
+        clock.cycle_speed()
+        seen.append(clock.speed)
+    assert seen == config.GAME_SPEEDS[1:] + config.GAME_SPEEDS[:1]
+
+def test_max_speed_steps_until_the_frame_budget_is_spent(monkeypatch):
+    now = [100.0]
+    def perf_counter():
+        now[0] += 0.001 # Every check costs a millisecond of real time
+        return now[0]
+    monkeypatch.setattr(sim_clock.time, "perf_counter", perf_counter)
+    monkeypatch.setattr(config, "MAX_SPEED_FRAME_BUDGET", 0.0105)
+    clock = SimClock(step_dt=STEP)
+    clock.set_speed(None)
+    assert _steps(clock, 0.0) == 10 # Deadline set at 100.001 + 0.0105; checks at .002 ... .011 pass
+    assert _steps(clock, 5.0) == 10 # Frame time itself doesn't matter
+    assert clock.alpha == 1.0
+    assert clock.accumulator == 0.0
@@ -0,0 +1,37 @@
+# tests/test_snapshot.py
+from headless import HeadlessSimulation
+from snapshot import state_checksum
+
+def _result(summary):
+    return {key: value for key, value in summary.items() if key != "wall_ms"}
+
+def test_restore_round_trip():
+    sim = HeadlessSimulation(starting_wave=2, seed=5)
+    sim.place_tower("Cannon", 3, 4)
+    sim.run(max_ticks=900)
+    snapshot = sim.snapshot()
+    checksum = state_checksum(sim.game)
+    first = sim.run(max_ticks=1800)
+    first_checksum = state_checksum(sim.game)
+
+    sim.restore(snapshot)
+    assert sim.ticks == 900
+    assert state_checksum(sim.game) == checksum
+    second = sim.run(max_ticks=1800)
+    assert _result(second) == _result(first)
+    assert state_checksum(sim.game) == first_checksum
+
+def test_restore_after_defeat_resumes_play():
+    sim = HeadlessSimulation(starting_wave=1, seed=5)
+    sim.game.player_health = 1
+    sim.run(max_ticks=300)
+    snapshot = sim.snapshot()
+    first = sim.run(max_ticks=20000)
+    assert first["outcome"] == "defeat"
+    assert not sim.game.running
+
+    sim.restore(snapshot)
+    assert sim.game.running
+    assert sim.game.player_health == 1
+    second = sim.run(max_ticks=20000)
+    assert _result(second) == _result(first)
@@ -0,0 +1,51 @@
+# tests/test_spatial_hash.py
+import random
+from types import SimpleNamespace
+import pygame
+from entities import BaseTower
+from spatial_hash import SpatialHashGroup
+
+class Dot(pygame.sprite.Sprite):
+    def __init__(self, x, y):
+        super().__init__()
+        self.rect = pygame.Rect(0, 0, 10, 10)
+        self.rect.center = (x, y)
+
+def _tower(x, y, tower_range):
+    return SimpleNamespace(x=x, y=y, range=tower_range, range_sq=tower_range * tower_range, target=None)
+
+def _lattice_point(rng):
+    # A coarse lattice puts plenty of enemies at exactly the same distance from a tower
+    return rng.randrange(0, 800, 8), rng.randrange(0, 600, 8)
+
+def test_nearest_matches_linear_scan():
+    rng = random.Random(7)
+    group = SpatialHashGroup()
+    for _ in range(300):
+        group.add(Dot(*_lattice_point(rng)))
+    for round_ in range(40):
+        # Move, remove and add enemies between rounds so hash order and group order are exercised
+        for dot in rng.sample(group.sprites(), 30):
+            dot.rect.center = _lattice_point(rng)
+            group.spatial_hash.move(dot, *dot.rect.center)
+        for dot in rng.sample(group.sprites(), 5):
+            dot.kill()
+        for _ in range(5):
+            group.add(Dot(*_lattice_point(rng)))
+
+        for _ in range(25):
+            x, y = _lattice_point(rng)
+            tower_range = rng.choice([40, 64, 100, 150, 400])
+            hashed, linear = _tower(x, y, tower_range), _tower(x, y, tower_range)
+            BaseTower.find_target(hashed, group)
+            BaseTower.find_target(linear, group.sprites()) # No spatial_hash: the linear fallback
+            assert hashed.target is linear.target, (round_, x, y, tower_range)
+
+def test_tie_goes_to_the_enemy_added_last():
+    group = SpatialHashGroup()
+    first, second = Dot(100, 132), Dot(132, 100) # Same distance from (100, 100), different cells
+    group.add(first, second)
+    assert group.spatial_hash.nearest(100, 100, 64) is second
+    second.rect.center = (100, 68) # Moving doesn't change the order
+    group.spatial_hash.move(second, *second.rect.center)
+    assert group.spatial_hash.nearest(100, 100, 64) is second
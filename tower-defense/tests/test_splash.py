@@ -0,0 +1,92 @@
+# tests/test_splash.py
+import math
+import random
+import pygame
+import pytest
+from headless import HeadlessSimulation
+from modifiers import SlowModifier
+
+def _enemy(game, type_key, pos, health):
+    EnemyClass = game.data_manager.get_enemy_class(type_key)
+    enemy = EnemyClass(game.game_map.path_geometry, type_key=type_key, asset_manager=game.asset_manager,
+                       data_manager=game.data_manager, prototype=game.enemy_prototypes.get(type_key))
+    enemy.x, enemy.y = pos
+    enemy.rect.center = pos
+    enemy.health = health
+    return enemy
+
+def _per_hit_on_hit(projectile, target, enemies):
+    """The per-enemy splash loops CannonProjectile/IceProjectile.on_hit ran before SplashBatch."""
+    impact_pos = projectile.rect.center
+    if target.alive():
+        target.take_damage(projectile.damage)
+    if projectile.type_key == "Cannon":
+        for enemy in enemies.sprites():
+            if enemy.alive() and enemy is not target:
+                if math.hypot(impact_pos[0] - enemy.rect.centerx, impact_pos[1] - enemy.rect.centery) <= projectile.splash_radius:
+                    enemy.take_damage(projectile.damage)
+    else:
+        for enemy in enemies.sprites():
+            if enemy.alive():
+                if math.hypot(impact_pos[0] - enemy.rect.centerx, impact_pos[1] - enemy.rect.centery) <= projectile.splash_radius:
+                    enemy.add_modifier(SlowModifier(projectile.slow_factor, projectile.slow_duration))
+    return True, 0
+
+@pytest.mark.parametrize("seed", range(6))
+def test_batched_splash_matches_per_hit_loops(seed, monkeypatch):
+    sim = HeadlessSimulation(starting_wave=1, seed=1)
+    game = sim.game
+    state = game.get_current_state()
+    rng = random.Random(seed)
+
+    # Two copies of one dense cluster: the game's EnemyGroup (float64 health column) and a plain
+    # Group, where health stays whatever Python number it was given, as before the store
+    enemies, reference = [], []
+    plain_group = pygame.sprite.Group()
+    for _ in range(30):
+        type_key = rng.choice(["Goblin", "Ogre", "Runner", "Brute"])
+        pos = (rng.randint(200, 420), rng.randint(200, 420))
+        health = rng.choice([rng.randint(1, 120), rng.randint(1, 240) / 2]) # Whole and fractional (hot reload rescales)
+        enemy, copy = _enemy(game, type_key, pos, health), _enemy(game, type_key, pos, health)
+        game.enemies.add(enemy)
+        plain_group.add(copy)
+        enemies.append(enemy)
+        reference.append(copy)
+
+    hits = {} # target index -> projectiles, in hit order
+    for _ in range(20):
+        index = rng.randrange(len(enemies))
+        projectile = game.projectiles.spawn(rng.choice(["Cannon", "Cannon", "Ice", "CoinShot"]),
+                                            enemies[index].rect.center, enemies[index])
+        projectile.rect.center = (enemies[index].rect.centerx + rng.randint(-6, 6),
+                                  enemies[index].rect.centery + rng.randint(-6, 6))
+        hits.setdefault(index, []).append(projectile)
+
+    # Reference: the old collision loop, every hit resolved on the spot
+    reference_money = 0
+    for index, projectiles in hits.items():
+        target = reference[index]
+        if not target.alive():
+            continue
+        for projectile in projectiles:
+            if projectile.type_key in ("Cannon", "Ice"):
+                _, reward = _per_hit_on_hit(projectile, target, plain_group)
+            else:
+                _, reward = projectile.on_hit(target, plain_group, pygame.sprite.Group())
+            reference_money += reward
+            if not target.alive():
+                break
+
+    # Batched: PlayingState._handle_collisions with SplashBatch
+    money = game.player_money
+    monkeypatch.setattr(game.projectiles, "collect_hits",
+                        lambda now_ms: {enemies[index]: projectiles for index, projectiles in hits.items()})
+    state._handle_collisions()
+
+    assert [enemy.alive() for enemy in enemies] == [copy.alive() for copy in reference]
+    assert game.player_money - money == reference_money
+    for enemy, copy in zip(enemies, reference):
+        assert enemy.health == copy.health
+        if copy.alive(): # A deferred slow skips an enemy a later direct hit killed first - it's gone either way
+            assert enemy.speed == copy.speed
+    assert any(not copy.alive() for copy in reference) # The scenario does exercise kills
@@ -0,0 +1,53 @@
+# tests/test_wave_manager.py
+import pytest
+from enemy_store import EnemyGroup
+from headless import HeadlessSimulation
+
+@pytest.fixture
+def game():
+    return HeadlessSimulation(starting_wave=1, seed=12).game
+
+def _start_busiest_wave(wave_manager):
+    """Starts the wave with the most enemy types (then spawns) right away, skipping the initial delay."""
+    wave = max(wave_manager.waves, key=lambda wave: (len({key for _, key in wave.timeline}), len(wave.timeline)))
+    wave_manager.waiting_for_next_wave = False
+    wave_manager.current_wave_number = wave.number - 1
+    assert wave_manager.start_next_wave()
+    return wave
+
+def test_one_long_step_emits_every_due_spawn_in_order(game):
+    wave_manager = game.wave_manager
+    wave = _start_busiest_wave(wave_manager)
+    timeline = wave.timeline
+    assert len(timeline) > 3
+
+    group = EnemyGroup()
+    elapsed = timeline[len(timeline) // 2][0] # Several entries come due at once
+    due = sum(1 for time, _ in timeline if time <= elapsed)
+    assert due > 1
+    game.sim_clock.advance(elapsed)
+    wave_manager.update(elapsed, game.game_map, group)
+    assert wave_manager.enemies_spawned_this_wave == due
+    assert [enemy.type_key for enemy in group] == [key for _, key in timeline[:due]]
+
+    game.sim_clock.advance(timeline[-1][0]) # Far past the end: the rest in one go, nothing twice
+    wave_manager.update(timeline[-1][0], game.game_map, group)
+    assert wave_manager.enemies_spawned_this_wave == len(timeline) == wave.total_enemies
+    assert [enemy.type_key for enemy in group] == [key for _, key in timeline]
+    assert wave_manager.is_wave_complete()
+
+def test_fast_speed_spawns_on_the_first_step_each_entry_is_due(game):
+    wave_manager = game.wave_manager
+    wave = _start_busiest_wave(wave_manager)
+    clock = game.sim_clock
+    clock.set_speed(4)
+    group = EnemyGroup()
+    spawned_at = [] # (sim seconds into the wave, type) of each spawn
+    while not wave_manager.is_wave_complete():
+        for dt in clock.steps_for_frame(0.1): # 4x speed: 24 steps per frame
+            wave_manager.update(dt, game.game_map, group)
+            elapsed = clock.get_ticks() / 1000.0 - wave_manager.wave_start_time
+            spawned_at.extend((elapsed, enemy.type_key) for enemy in group.sprites()[len(spawned_at):])
+    assert [key for _, key in spawned_at] == [key for _, key in wave.timeline]
+    for (spawn_time, _), (due, _) in zip(spawned_at, wave.timeline):
+        assert due <= spawn_time < due + clock.step_dt + 1e-9
@@ -0,0 +1,48 @@
+# tests/test_wave_profiler.py
+import os
+from collections import Counter
+import pytest
+from headless import HeadlessSimulation
+from wave_profiler import WaveProfiler, parse_wave_range
+
+def test_single_wave():
+    assert parse_wave_range("12") == (12, 12)
+
+def test_wave_range():
+    assert parse_wave_range("3-5") == (3, 5)
+
+@pytest.mark.parametrize("text", ["5-3", "abc", "3-x"])
+def test_bad_range_raises(text):
+    with pytest.raises(ValueError):
+        parse_wave_range(text)
+
+class FakeSampler:
+    def __init__(self, sim):
+        self.sim = sim
+        self.started = None
+        self.spans = [] # (first tick, last tick) sampled
+
+    def start(self):
+        self.started = self.sim.ticks
+
+    def stop(self):
+        self.spans.append((self.started, self.sim.ticks))
+        return Counter({"main;step": 1})
+
+def test_update_per_step_profiles_exactly_each_wave(tmp_path):
+    sim = HeadlessSimulation(starting_wave=1, seed=2)
+    for x, y in ((3, 4), (5, 4), (7, 4)):
+        sim.place_tower("Cannon", x, y)
+    sampler = FakeSampler(sim)
+    profiler = WaveProfiler(1, 2, output_dir=str(tmp_path), sampler=sampler)
+    wave_manager = sim.game.wave_manager
+    active = {} # wave -> (first tick, tick after the last) it was in play
+    while wave_manager.current_wave_number < 3 and sim.game.running:
+        sim.step()
+        profiler.update(wave_manager)
+        if wave_manager.is_wave_active():
+            first, _ = active.get(wave_manager.current_wave_number, (sim.ticks, None))
+            active[wave_manager.current_wave_number] = (first, sim.ticks + 1)
+    profiler.close()
+    assert sampler.spans == [active[1], active[2]]
+    assert sorted(os.listdir(tmp_path)) == ["wave_01.collapsed", "wave_02.collapsed"]
@@ -1,7 +1,40 @@
 import pygame
+from collections import OrderedDict
 import config
 from entities import Tower, CannonTower, IceTower, BountyHunterTower, GoldMine
 
+class TextCache:
+    """Rendered text surfaces keyed by (font, text, color).
+
+    Text that doesn't change between frames is rendered once; the least
+    recently used entries are dropped past max_entries.
+    """
+    def __init__(self, max_entries=config.TEXT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color):
+        """Antialiased font.render(text, True, color), cached."""
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+
+# Shared by every UI element
+text_cache = TextCache()
+
+
 class Button:
     """Represents a clickable button in the UI panel."""
     ICON_SIZE = 40 # Reduced from 48
@@ -23,61 +56,78 @@ class Button:
                                self.width,
                                self.height)
 
-        # Load icon using asset_manager, unpack the tuple
-        icon_surface, icon_rect_from_load = asset_manager.load_image(icon_path)
+        # Load the scaled icon through the asset_manager cache
+        icon_size = (self.ICON_SIZE, self.ICON_SIZE)
+        self.icon_image = asset_manager.get_scaled_image(icon_path, icon_size)
 
         # Use the loaded surface (or create fallback)
-        if icon_surface is None:
+        if self.icon_image is None:
             # Fallback: Create colored square icon
-            self.icon_image = pygame.Surface([self.ICON_SIZE, self.ICON_SIZE])
             fallback_color = config.COLOR_MAP.get(self.fallback_color_name, config.GREY)
-            self.icon_image.fill(fallback_color)
-            # Scale fallback icon (already ICON_SIZE, maybe redundant but safe)
-            self.icon_image = pygame.transform.smoothscale(self.icon_image, (self.ICON_SIZE, self.ICON_SIZE))
-        else:
-            # Scale loaded icon if needed
-            try:
-                self.icon_image = pygame.transform.smoothscale(icon_surface.copy(), (self.ICON_SIZE, self.ICON_SIZE))
-            except ValueError as e:
-                 print(f"Error scaling button icon {icon_path}: {e}")
-                 # Fallback to unscaled if scaling fails?
-                 self.icon_image = icon_surface # Use unscaled original
+            self.icon_image = asset_manager.get_fallback_image(fallback_color, self.ICON_SIZE, icon_size)
 
         # Position icon within the button rect (slightly higher)
         # Get rect from the final self.icon_image
         self.icon_rect = self.icon_image.get_rect(center=(self.rect.centerx, self.rect.top + self.ICON_SIZE // 2 + self.PADDING))
 
+        # Pre-composed faces, (font, selected) -> (surface, screen position)
+        self.faces = {}
+
     def draw(self, surface, font, selected=False):
+        face = self.faces.get((font, selected))
+        if face is None:
+            face = self._compose_face(font, selected)
+            self.faces[(font, selected)] = face
+        face_surface, face_pos = face
+        surface.blit(face_surface, face_pos)
+
+    def _compose_face(self, font, selected):
+        """Renders background, border, icon and labels once onto an opaque face surface."""
+        name_text = text_cache.render(font, f"{self.name}", config.WHITE)
+        cost_text = text_cache.render(font, f"Cost: {self.cost}", config.WHITE)
+
+        # Position text below icon, within button bounds
+        name_rect = name_text.get_rect(center=(self.rect.centerx, self.icon_rect.bottom + self.PADDING * 1.5))
+        cost_rect = cost_text.get_rect(center=(self.rect.centerx, name_rect.bottom + self.PADDING))
+
+        # The cost label can hang below the button; the face covers it too,
+        # over the black panel background it is normally drawn on
+        bounds = self.rect.union(name_rect).union(cost_rect)
+        face = pygame.Surface(bounds.size)
+        if pygame.display.get_surface() is not None:
+            face = face.convert()
+        face.fill(config.BLACK)
+        offset = (-bounds.x, -bounds.y)
+        button_rect = self.rect.move(offset)
+
         # Draw button background
-        pygame.draw.rect(surface, config.UI_BG_COLOR, self.rect)
+        pygame.draw.rect(face, config.UI_BG_COLOR, button_rect)
 
         # Draw border (highlight if selected)
         border_color = config.UI_HIGHLIGHT_COLOR if selected else config.UI_BORDER_COLOR
         border_width = 2 if selected else 1
-        pygame.draw.rect(surface, border_color, self.rect, border_width)
-
-        # Draw icon
-        surface.blit(self.icon_image, self.icon_rect)
-
-        # Draw tower name and cost text below icon
-        name_text = font.render(f"{self.name}", True, config.WHITE)
-        cost_text = font.render(f"Cost: {self.cost}", True, config.WHITE)
+        pygame.draw.rect(face, border_color, button_rect, border_width)
 
-        # Position text below icon, within button bounds
-        name_rect = name_text.get_rect(center=(self.rect.centerx, self.icon_rect.bottom + self.PADDING * 1.5))
-        cost_rect = cost_text.get_rect(center=(self.rect.centerx, name_rect.bottom + self.PADDING))
-
-        surface.blit(name_text, name_rect)
-        surface.blit(cost_text, cost_rect)
+        # Draw icon and tower name/cost text below it
+        face.blit(self.icon_image, self.icon_rect.move(offset))
+        face.blit(name_text, name_rect.move(offset))
+        face.blit(cost_text, cost_rect.move(offset))
+        return face, bounds.topleft
 
     def is_clicked(self, pos):
         return self.rect.collidepoint(pos)
 
 class UIPanel:
     """Manages all UI elements, including status bar, buttons, prompts."""
+    STATUS_ICON_SIZE = (24, 24)
+
     def __init__(self, data_manager, start_y, font, asset_manager):
         self.rect = pygame.Rect(config.GAME_AREA_WIDTH, 0,
                                config.UI_PANEL_WIDTH, config.SCREEN_HEIGHT)
+        # Screen areas each part paints (button text may run past the button rects,
+        # so the buttons own the whole panel); used for dirty-rect rendering
+        self.status_bar_rect = pygame.Rect(0, 0, config.GAME_AREA_WIDTH, 40)
+        self.wave_timer_rect = pygame.Rect(0, config.SCREEN_HEIGHT - 45, config.GAME_AREA_WIDTH, 30)
         self.font = font
         self.buttons = []
         self.selected_tower_key = None
@@ -95,40 +145,37 @@ class UIPanel:
         # --- Load Status Icons ---
         self.status_font = pygame.font.SysFont(None, 28) # Font for status bar
         self.prompt_font = pygame.font.SysFont(None, 24) # Font for prompts
-        icon_size = (24, 24)
-        self.heart_icon = self._load_scaled_icon(config.HEART_ICON, icon_size)
-        self.coin_icon = self._load_scaled_icon(config.COIN_ICON, icon_size)
-        self.next_wave_icon = self._load_scaled_icon(config.NEXT_WAVE_ICON, icon_size)
+        self.heart_icon = self._load_scaled_icon(config.HEART_ICON, self.STATUS_ICON_SIZE)
+        self.coin_icon = self._load_scaled_icon(config.COIN_ICON, self.STATUS_ICON_SIZE)
+        self.next_wave_icon = self._load_scaled_icon(config.NEXT_WAVE_ICON, self.STATUS_ICON_SIZE)
 
         # --- Define Tower Buttons from Data ---
-        button_y = start_y
-        # Get tower data using DataManager
-        tower_data = self.data_manager.get_all_tower_data()
-        for tower_key, data in tower_data.items():
+        self.buttons_y = start_y
+        self.build_buttons()
+
+    def build_buttons(self):
+        """(Re)builds one button per tower type from the DataManager's records, keeping the selection if it still exists."""
+        self.buttons = []
+        button_y = self.buttons_y
+        for tower_key, record in self.data_manager.tower_records.items():
             button = Button(button_y,
                             tower_key,
-                            data.get("icon", "default_icon.png"),
-                            data.get("name", "Unknown Tower"),
-                            data.get("cost", 9999),
-                            data.get("fallback_color", "GREY"),
-                            asset_manager # Pass asset_manager to Button
+                            record.icon,
+                            record.name,
+                            record.cost,
+                            record.fallback_color_name,
+                            self.asset_manager # Pass asset_manager to Button
                            )
             self.buttons.append(button)
             button_y += button.height + Button.PADDING
 
         # Set initial selection (key)
-        if self.buttons:
+        if self.buttons and self.selected_tower_key not in self.data_manager.tower_records:
              self.selected_tower_key = self.buttons[0].tower_key # Store key
 
     def _load_scaled_icon(self, icon_path, size):
-        """Loads and scales an icon using the AssetManager."""
-        image, _ = self.asset_manager.load_image(icon_path)
-        if image:
-            try:
-                return pygame.transform.smoothscale(image.copy(), size)
-            except ValueError as e:
-                print(f"UI Panel Error scaling icon {icon_path}: {e}")
-        return None
+        """Loads and scales an icon using the AssetManager (cached)."""
+        return self.asset_manager.get_scaled_image(icon_path, size)
 
     def handle_click(self, pos):
         # Check if click is within the panel area
@@ -148,29 +195,31 @@ class UIPanel:
         """Returns the string key of the selected tower type."""
         return self.selected_tower_key
 
-    def draw(self, surface, health, money, wave_num, is_wave_active, waiting_for_next, timer):
+    def draw(self, surface, health, money, wave_num, is_wave_active, waiting_for_next, timer, game_speed="1x"):
         # Draw Tower Selection Panel Background (Optional)
         # pygame.draw.rect(surface, config.UI_BG_COLOR, self.rect)
 
         # Draw Tower Buttons
-        for button in self.buttons:
-            is_selected = (self.selected_tower_key == button.tower_key)
-            # Pass the general UI font (self.font) to buttons
-            button.draw(surface, self.font, selected=is_selected)
+        self.draw_buttons(surface)
 
         # Draw Status Bar
-        self._draw_status_bar(surface, health, money, wave_num)
+        self.draw_status_bar(surface, health, money, wave_num, game_speed)
 
         # Draw Wave Prompt / Timer
         if waiting_for_next and health > 0:
-            self._draw_wave_timer(surface, timer)
+            self.draw_wave_timer(surface, timer)
 
-    def _draw_status_bar(self, surface, health, money, wave):
+    def draw_buttons(self, surface):
+        for button in self.buttons:
+            is_selected = (self.selected_tower_key == button.tower_key)
+            # Pass the general UI font (self.font) to buttons
+            button.draw(surface, self.font, selected=is_selected)
+
+    def draw_status_bar(self, surface, health, money, wave, game_speed="1x"):
         """Draws the top status bar with icons and text."""
-        bar_height = 40
+        bar_height = self.status_bar_rect.height
         # Draw only over the game area, not the selection panel
-        bar_rect = pygame.Rect(0, 0, config.GAME_AREA_WIDTH, bar_height)
-        pygame.draw.rect(surface, config.STATUS_BAR_BG_COLOR, bar_rect)
+        pygame.draw.rect(surface, config.STATUS_BAR_BG_COLOR, self.status_bar_rect)
 
         padding = 10
         icon_text_padding = 5
@@ -180,7 +229,7 @@ class UIPanel:
         if self.heart_icon:
             surface.blit(self.heart_icon, (current_x, (bar_height - self.heart_icon.get_height()) // 2))
             current_x += self.heart_icon.get_width() + icon_text_padding
-        health_text = self.status_font.render(f"{health}", True, config.WHITE)
+        health_text = text_cache.render(self.status_font, f"{health}", config.WHITE)
         health_rect = health_text.get_rect(midleft=(current_x, bar_height // 2))
         surface.blit(health_text, health_rect)
         current_x += health_rect.width + padding * 2
@@ -189,22 +238,28 @@ class UIPanel:
         if self.coin_icon:
             surface.blit(self.coin_icon, (current_x, (bar_height - self.coin_icon.get_height()) // 2))
             current_x += self.coin_icon.get_width() + icon_text_padding
-        money_text = self.status_font.render(f"{money}", True, config.WHITE)
+        money_text = text_cache.render(self.status_font, f"{money}", config.WHITE)
         money_rect = money_text.get_rect(midleft=(current_x, bar_height // 2))
         surface.blit(money_text, money_rect)
         current_x += money_rect.width + padding * 2
 
         # Wave
-        wave_text = self.status_font.render(f"Wave: {wave}", True, config.WHITE)
+        wave_text = text_cache.render(self.status_font, f"Wave: {wave}", config.WHITE)
         wave_rect = wave_text.get_rect(midright=(config.GAME_AREA_WIDTH - padding, bar_height // 2))
         surface.blit(wave_text, wave_rect)
 
-    def _draw_wave_timer(self, surface, timer):
+        # Game speed (only shown when fast-forwarding)
+        if game_speed != "1x":
+            speed_text = text_cache.render(self.status_font, f">> {game_speed}", config.YELLOW)
+            speed_rect = speed_text.get_rect(midright=(wave_rect.left - padding * 2, bar_height // 2))
+            surface.blit(speed_text, speed_rect)
+
+    def draw_wave_timer(self, surface, timer):
         """Draws the countdown timer between waves."""
         prompt_y = config.SCREEN_HEIGHT - 30
         # Format timer to one decimal place
         timer_text = f"{timer:.1f}s"
-        prompt_text = self.prompt_font.render(f"Next Wave In: {timer_text}", True, config.WHITE)
+        prompt_text = text_cache.render(self.prompt_font, f"Next Wave In: {timer_text}", config.WHITE)
         prompt_rect = prompt_text.get_rect(center=(config.GAME_AREA_WIDTH // 2, prompt_y))
 
         # Draw background box? (Optional)
@@ -0,0 +1,122 @@
+# wave_profiler.py
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+import config
+
+class StackSampler:
+    """Statistical profiler: counts the main thread's Python stack at a fixed interval.
+
+    Uses a CPU-time interval timer (SIGPROF) where the OS has one, so time
+    spent sleeping between frames is never sampled; elsewhere a background
+    thread reads the main thread's frame every interval.
+    """
+    def __init__(self, interval=config.WAVE_PROFILE_INTERVAL_MS / 1000.0):
+        self.interval = interval
+        self.counts = Counter() # Collapsed stack -> samples
+        self.labels = {} # code object -> "function (file.py:line)"
+        self.use_signal = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+        self._thread = None
+        self._running = False
+
+    def _label(self, code):
+        label = self.labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self.labels[code] = label
+        return label
+
+    def _sample(self, frame):
+        stack = []
+        while frame is not None:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        stack.reverse() # Root first
+        self.counts[";".join(stack)] += 1
+
+    def _on_signal(self, signum, frame):
+        self._sample(frame)
+
+    def _sample_thread(self, main_thread_id):
+        while self._running:
+            time.sleep(self.interval)
+            frame = sys._current_frames().get(main_thread_id)
+            if frame is not None:
+                self._sample(frame)
+
+    def start(self):
+        self.counts = Counter()
+        self._running = True
+        if self.use_signal:
+            signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        else:
+            self._thread = threading.Thread(target=self._sample_thread, args=(threading.get_ident(),), daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stops sampling. Returns {collapsed stack: samples}."""
+        self._running = False
+        if self.use_signal:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, signal.SIG_IGN)
+        elif self._thread:
+            self._thread.join()
+            self._thread = None
+        return self.counts
+
+
+class WaveProfiler:
+    """Samples the game while each wave in [first_wave, last_wave] is in play.
+
+    Each wave is written to output_dir/wave_NN.collapsed in collapsed-stack
+    format ("root;caller;callee samples" per line), ready for flamegraph.pl,
+    speedscope or inferno. Startup, menus and the delay between waves are
+    not sampled. Call update() after every simulation step and close() on exit.
+    """
+    def __init__(self, first_wave, last_wave, output_dir=config.WAVE_PROFILE_DIR, sampler=None):
+        self.first_wave = first_wave
+        self.last_wave = last_wave
+        self.output_dir = output_dir
+        self.sampler = sampler or StackSampler()
+        self.capturing = None # Wave number being sampled
+        self.written = [] # Paths of finished profiles
+
+    def update(self, wave_manager):
+        wave = wave_manager.current_wave_number if wave_manager.is_wave_active() else None
+        if wave == self.capturing:
+            return
+        if self.capturing is not None:
+            self._finish()
+        if wave is not None and self.first_wave <= wave <= self.last_wave:
+            self.sampler.start()
+            self.capturing = wave
+
+    def close(self):
+        """Writes the wave being sampled, if any (e.g. the game ended mid-wave)."""
+        if self.capturing is not None:
+            self._finish()
+
+    def _finish(self):
+        counts = self.sampler.stop()
+        os.makedirs(self.output_dir, exist_ok=True)
+        filepath = os.path.join(self.output_dir, f"wave_{self.capturing:02d}.collapsed")
+        with open(filepath, "w") as f:
+            for stack, samples in counts.most_common():
+                f.write(f"{stack} {samples}\n")
+        print(f"Wave {self.capturing} profile: {sum(counts.values())} samples written to {filepath}")
+        self.written.append(filepath)
+        self.capturing = None
+
+
+def parse_wave_range(text):
+    """"12" -> (12, 12), "3-5" -> (3, 5)."""
+    first, _, last = text.partition("-")
+    first = int(first)
+    last = int(last) if last else first
+    if last < first:
+        raise ValueError(f"Wave range {text!r} ends before it starts")
+    return first, last